@@ -22,18 +22,18 @@ namespace DocumentAssembler03
             var data = GenerateDataFromDataSource(dataFile);
 
             var wmlDoc = new WmlDocument(templateDoc.FullName);
-            var count = 1;
-            foreach (var customer in data.Elements("Customer"))
+
+            // The template is compiled once and the letters are assembled on all cores, in customer order.
+            foreach (var result in DA.AssembleMany(wmlDoc, data.Elements("Customer")))
             {
-                var assembledDoc = new FileInfo(Path.Combine(tempDi.FullName, string.Format("Letter-{0:0000}.docx", count++)));
+                var assembledDoc = new FileInfo(Path.Combine(tempDi.FullName, string.Format("Letter-{0:0000}.docx", result.Index + 1)));
                 Console.WriteLine(assembledDoc.Name);
-                var wmlAssembledDoc = DA.AssembleDocument(wmlDoc, customer, out var templateError);
-                if (templateError)
+                if (result.TemplateError)
                 {
                     Console.WriteLine("Errors in template.");
                     Console.WriteLine("See {0} to determine the errors in the template.", assembledDoc.Name);
                 }
-                wmlAssembledDoc.SaveAs(assembledDoc.FullName);
+                result.Document.SaveAs(assembledDoc.FullName);
             }
         }
 
@@ -0,0 +1,120 @@
+using DocumentAssembler.Core;
+using System;
+using System.IO;
+using System.Threading;
+using System.Threading.Tasks;
+using System.Xml;
+using System.Xml.Linq;
+using Xunit;
+
+namespace DocumentAssembler.Tests
+{
+    public class AssembleDocumentAsyncTests
+    {
+        private static readonly DirectoryInfo s_SourceDir = new DirectoryInfo("TestFiles/");
+
+        [Theory]
+        [InlineData("DA001-TemplateDocument.docx", "DA-Data.xml")]
+        [InlineData("DA009-InvalidXPath.docx", "DA-Data.xml")]
+        [InlineData("DA234-HeaderFooter.docx", "DA-Data.xml")]
+        public async Task AssembleDocumentAsync_MatchesAssembleDocument(string name, string data)
+        {
+            var templatePath = Path.Combine(s_SourceDir.FullName, name);
+            var dataPath = Path.Combine(s_SourceDir.FullName, data);
+            var expected = Core.DocumentAssembler.AssembleDocument(new WmlDocument(templatePath), XElement.Load(dataPath), out var expectedError, out var expectedSummary);
+
+            using (var template = File.OpenRead(templatePath))
+            using (var output = new MemoryStream())
+            {
+                var outcome = await Core.DocumentAssembler.AssembleDocumentAsync(template, XElement.Load(dataPath), output);
+                Assert.Equal(expectedError, outcome.TemplateError);
+                Assert.Equal(expectedSummary, outcome.TemplateErrorSummary);
+                TestUtil.AssertSameContentParts(expected, new WmlDocument("Assembled.docx", output.ToArray()));
+            }
+
+            using (var template = File.OpenRead(templatePath))
+            using (var dataStream = File.OpenRead(dataPath))
+            using (var output = new MemoryStream())
+            {
+                var outcome = await Core.DocumentAssembler.AssembleDocumentAsync(template, dataStream, output);
+                Assert.Equal(expectedSummary, outcome.TemplateErrorSummary);
+                TestUtil.AssertSameContentParts(expected, new WmlDocument("Assembled.docx", output.ToArray()));
+            }
+
+            using (var template = File.OpenRead(templatePath))
+            using (var dataReader = XmlReader.Create(dataPath, new XmlReaderSettings { Async = true }))
+            using (var output = new MemoryStream())
+            {
+                var outcome = await Core.DocumentAssembler.AssembleDocumentAsync(template, dataReader, output);
+                Assert.Equal(expectedSummary, outcome.TemplateErrorSummary);
+                TestUtil.AssertSameContentParts(expected, new WmlDocument("Assembled.docx", output.ToArray()));
+            }
+        }
+
+        [Fact]
+        public async Task AssembleDocumentAsync_HonorsCanceledToken()
+        {
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-Data.xml"));
+            using var template = File.OpenRead(Path.Combine(s_SourceDir.FullName, "DA001-TemplateDocument.docx"));
+            using var output = new MemoryStream();
+
+            await Assert.ThrowsAnyAsync<OperationCanceledException>(() =>
+                Core.DocumentAssembler.AssembleDocumentAsync(template, xmlData, output, null, new CancellationToken(true)));
+            Assert.Equal(0, output.Length);
+        }
+
+        [Theory]
+        [InlineData(false)]
+        [InlineData(true)]
+        public async Task AssembleDocumentAsync_StopsAssemblingWhenCanceled(bool processPartsInParallel)
+        {
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-Data.xml"));
+            using var cts = new CancellationTokenSource();
+            // the request is abandoned once the template has arrived, before any part is processed
+            using var template = new CancelAtEndStream(File.ReadAllBytes(Path.Combine(s_SourceDir.FullName, "DA234-HeaderFooter.docx")), cts);
+            using var output = new MemoryStream();
+            var options = new DocumentAssemblerOptions { ProcessPartsInParallel = processPartsInParallel };
+
+            await Assert.ThrowsAnyAsync<OperationCanceledException>(() =>
+                Core.DocumentAssembler.AssembleDocumentAsync(template, xmlData, output, options, cts.Token));
+            Assert.Equal(0, output.Length);
+        }
+
+        // A non-seekable stream that cancels the token source when it has been read to the end.
+        private sealed class CancelAtEndStream : Stream
+        {
+            private readonly MemoryStream _inner;
+            private readonly CancellationTokenSource _cts;
+
+            public CancelAtEndStream(byte[] bytes, CancellationTokenSource cts)
+            {
+                _inner = new MemoryStream(bytes, false);
+                _cts = cts;
+            }
+
+            public override bool CanRead => true;
+            public override bool CanSeek => false;
+            public override bool CanWrite => false;
+            public override long Length => throw new NotSupportedException();
+            public override long Position { get => throw new NotSupportedException(); set => throw new NotSupportedException(); }
+
+            public override int Read(byte[] buffer, int offset, int count)
+            {
+                var read = _inner.Read(buffer, offset, count);
+                if (read == 0)
+                {
+                    _cts.Cancel();
+                }
+                return read;
+            }
+
+            public override void Flush()
+            {
+            }
+
+            public override long Seek(long offset, SeekOrigin origin) => throw new NotSupportedException();
+            public override void SetLength(long value) => throw new NotSupportedException();
+            public override void Write(byte[] buffer, int offset, int count) => throw new NotSupportedException();
+        }
+    }
+}
@@ -0,0 +1,221 @@
+using DocumentAssembler.Core;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Runtime.CompilerServices;
+using System.Threading.Tasks;
+using System.Xml.Linq;
+using Xunit;
+
+namespace DocumentAssembler.Tests
+{
+    public class CompiledTemplateTests
+    {
+        private static readonly DirectoryInfo s_SourceDir = new DirectoryInfo("TestFiles/");
+
+        [Theory]
+        [InlineData("DA001-TemplateDocument.docx", "DA-Data.xml")]
+        [InlineData("DA009-InvalidXPath.docx", "DA-Data.xml")]
+        [InlineData("DA021-NestedRepeat.docx", "DA-DataNestedRepeat.xml")]
+        [InlineData("DA023-RepeatWOEndRepeat.docx", "DA-Data.xml")]
+        [InlineData("DA028-NoPrototypeRow.docx", "DA-Data.xml")]
+        [InlineData("DA234-HeaderFooter.docx", "DA-Data.xml")]
+        [InlineData("DA251-EnhancedTables.docx", "DA-Data.xml")]
+        [InlineData("DA272-NestedConditionalWithElse.docx", "DA-ElseTestPremium.xml")]
+        public void Assemble_MatchesAssembleDocument(string name, string data)
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, name));
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, data));
+
+            var expected = Core.DocumentAssembler.AssembleDocument(template, xmlData, out var expectedError, out var expectedSummary);
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+
+            // the compiled template must not be changed by assembling it
+            for (var i = 0; i < 3; i++)
+            {
+                var actual = compiled.Assemble(xmlData, out var actualError, out var actualSummary);
+                Assert.Equal(expectedError, actualError);
+                Assert.Equal(expectedSummary, actualSummary);
+                TestUtil.AssertSameContentParts(expected, actual);
+            }
+        }
+
+        [Fact]
+        public void Assemble_DifferentDataSets()
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA270-ConditionalWithElse.docx"));
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+
+            foreach (var data in new[] { "DA-ElseTestPremium.xml", "DA-ElseTestStandard.xml", "DA-ElseTestPremium.xml" })
+            {
+                var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, data));
+                var expected = Core.DocumentAssembler.AssembleDocument(template, xmlData, out var expectedError);
+                var actual = compiled.Assemble(xmlData, out var actualError);
+                Assert.Equal(expectedError, actualError);
+                TestUtil.AssertSameContentParts(expected, actual);
+            }
+        }
+
+        [Fact]
+        public void Assemble_ReportsCompileErrorsEveryTime()
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA010-InvalidXml.docx"));
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-Data.xml"));
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+
+            Assert.True(compiled.HasCompileErrors);
+            compiled.Assemble(xmlData, out var firstError);
+            compiled.Assemble(xmlData, out var secondError);
+            Assert.True(firstError);
+            Assert.True(secondError);
+        }
+
+        [Fact]
+        public void Assemble_WritesToStream()
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA234-HeaderFooter.docx"));
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-Data.xml"));
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+            var expected = compiled.Assemble(xmlData, out var expectedError, out var expectedSummary);
+
+            using var output = new MemoryStream();
+            compiled.Assemble(xmlData, output, out var actualError, out var actualSummary);
+
+            Assert.Equal(expectedError, actualError);
+            Assert.Equal(expectedSummary, actualSummary);
+            TestUtil.AssertSameContentParts(expected, new WmlDocument("Assembled.docx", output.ToArray()));
+        }
+
+        [Fact]
+        public void Assemble_IsThreadSafe()
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA251-EnhancedTables.docx"));
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-Data.xml"));
+            var expected = Core.DocumentAssembler.AssembleDocument(template, xmlData, out _);
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+
+            var results = new WmlDocument[16];
+            Parallel.For(0, results.Length, i => results[i] = compiled.Assemble(xmlData, out _));
+
+            Assert.All(results, actual => TestUtil.AssertSameContentParts(expected, actual));
+        }
+
+        [Theory]
+        [InlineData(1)]
+        [InlineData(4)]
+        public void AssembleMany_YieldsResultsInRecordOrder(int maxDegreeOfParallelism)
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA270-ConditionalWithElse.docx"));
+            var records = CreateElseRecords(10);
+
+            var results = Core.DocumentAssembler.AssembleMany(template, records, maxDegreeOfParallelism).ToList();
+
+            Assert.Equal(Enumerable.Range(0, records.Count), results.Select(r => r.Index));
+            for (var i = 0; i < records.Count; i++)
+            {
+                var expected = Core.DocumentAssembler.AssembleDocument(template, records[i], out var expectedError, out var expectedSummary);
+                Assert.Equal(expectedError, results[i].TemplateError);
+                Assert.Equal(expectedSummary, results[i].TemplateErrorSummary);
+                TestUtil.AssertSameContentParts(expected, results[i].Document);
+            }
+        }
+
+        [Fact]
+        public async Task AssembleManyAsync_YieldsResultsInRecordOrder()
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA270-ConditionalWithElse.docx"));
+            var records = CreateElseRecords(6);
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+
+            var results = new List<AssemblyResult>();
+            await foreach (var result in compiled.AssembleManyAsync(ToAsyncEnumerable(records), 3))
+            {
+                results.Add(result);
+            }
+
+            Assert.Equal(Enumerable.Range(0, records.Count), results.Select(r => r.Index));
+            for (var i = 0; i < records.Count; i++)
+            {
+                TestUtil.AssertSameContentParts(compiled.Assemble(records[i], out _), results[i].Document);
+            }
+        }
+
+        [Theory]
+        [InlineData(false)]
+        [InlineData(true)]
+        public void AssembleMany_StopsRecordsInFlightWhenEnumerationEndsEarly(bool useAsync)
+        {
+            var records = new List<WeakReference>();
+
+            var first = TakeFirstResult(records, useAsync);
+
+            Assert.Equal(0, first.Index);
+            Assert.True(records.Count > 1);
+            GC.Collect();
+            GC.WaitForPendingFinalizers();
+            GC.Collect();
+            // a record still being assembled would be kept alive by its worker
+            Assert.All(records, record => Assert.False(record.IsAlive));
+        }
+
+        [Fact]
+        public void CompileTemplate_ThrowsOnTrackedRevisions()
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA024-TrackedRevisions.docx"));
+            Assert.Throws<OpenXmlPowerToolsException>(() => Core.DocumentAssembler.CompileTemplate(template));
+        }
+
+        // The first record is small; the ones after it repeat long enough to still be assembling when the first is read.
+        // The async enumeration is waited on here rather than awaited by the test, so that nothing of it outlives this call.
+        [MethodImpl(MethodImplOptions.NoInlining)]
+        private static AssemblyResult TakeFirstResult(List<WeakReference> records, bool useAsync)
+        {
+            var compiled = Core.DocumentAssembler.CompileTemplate(TestDocumentFactory.Create("DA-AssembleManyEarlyStop.docx", builder =>
+            {
+                builder.AddBodyElement(Paragraph("<# <Repeat Select=\"Order\" /> #>"));
+                builder.AddBodyElement(Paragraph("<# <Content Select=\"Number\" /> #>"));
+                builder.AddBodyElement(Paragraph("<# <EndRepeat /> #>"));
+            }));
+            var source = Enumerable.Range(0, 8).Select(i =>
+            {
+                var record = new XElement("Orders",
+                    Enumerable.Range(1, i == 0 ? 1 : 20000).Select(n => new XElement("Order", new XElement("Number", n))));
+                records.Add(new WeakReference(record));
+                return record;
+            });
+
+            return useAsync
+                ? TakeFirstResultAsync(compiled, source).GetAwaiter().GetResult()
+                : compiled.AssembleMany(source, 4).First();
+        }
+
+        private static async Task<AssemblyResult> TakeFirstResultAsync(CompiledTemplate compiled, IEnumerable<XElement> source)
+        {
+            await foreach (var result in compiled.AssembleManyAsync(ToAsyncEnumerable(source), 4))
+            {
+                return result;
+            }
+            throw new InvalidOperationException("AssembleManyAsync yielded no result.");
+        }
+
+        private static XElement Paragraph(string text) =>
+            new XElement(W.p, new XElement(W.r, new XElement(W.t, text)));
+
+        private static List<XElement> CreateElseRecords(int count)
+        {
+            var premium = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-ElseTestPremium.xml"));
+            var standard = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-ElseTestStandard.xml"));
+            return Enumerable.Range(0, count).Select(i => new XElement(i % 3 == 0 ? premium : standard)).ToList();
+        }
+
+        private static async IAsyncEnumerable<XElement> ToAsyncEnumerable(IEnumerable<XElement> records)
+        {
+            foreach (var record in records)
+            {
+                await Task.Yield();
+                yield return record;
+            }
+        }
+    }
+}
@@ -5,6 +5,7 @@ using DocumentFormat.OpenXml.Validation;
 using System;
 using System.Collections.Generic;
 using System.IO;
+using System.IO.Compression;
 using System.Linq;
 using System.Text;
 using System.Xml;
@@ -208,6 +209,245 @@ namespace DocumentAssembler.Tests
             Assert.Equal(err, returnedTemplateError);
         }
 
+        [Fact]
+        public void AssembleDocument_WritesToEmptySeekableStream()
+        {
+            var sourceDir = new DirectoryInfo("TestFiles/");
+            var templatePath = Path.Combine(sourceDir.FullName, "DA001-TemplateDocument.docx");
+            var wmlTemplate = new WmlDocument(templatePath);
+            var xmldata = XElement.Load(Path.Combine(sourceDir.FullName, "DA-Data.xml"));
+            var expected = Core.DocumentAssembler.AssembleDocument(wmlTemplate, xmldata, out var expectedError, out var expectedSummary);
+
+            var outputFile = Path.Combine(TestUtil.TempDir.FullName, "DA001-assembled-to-file-stream.docx");
+            using (var template = new FileStream(templatePath, FileMode.Open, FileAccess.Read))
+            using (var output = new FileStream(outputFile, FileMode.Create, FileAccess.ReadWrite))
+            {
+                Core.DocumentAssembler.AssembleDocument(template, xmldata, output, out var templateError, out var templateErrorSummary);
+                Assert.Equal(expectedError, templateError);
+                Assert.Equal(expectedSummary, templateErrorSummary);
+                Assert.Equal(output.Length, output.Position);
+            }
+
+            Assert.Equal(GetDocumentText(expected), GetDocumentText(new WmlDocument(outputFile)));
+        }
+
+        [Fact]
+        public void AssembleDocument_WritesToForwardOnlyStream()
+        {
+            var sourceDir = new DirectoryInfo("TestFiles/");
+            var wmlTemplate = new WmlDocument(Path.Combine(sourceDir.FullName, "DA021-NestedRepeat.docx"));
+            var xmldata = XElement.Load(Path.Combine(sourceDir.FullName, "DA-DataNestedRepeat.xml"));
+            var expected = Core.DocumentAssembler.AssembleDocument(wmlTemplate, xmldata, out var expectedError);
+
+            // GZipStream can only be written to, like an HTTP response body
+            using var compressed = new MemoryStream();
+            using (var output = new GZipStream(compressed, CompressionMode.Compress, leaveOpen: true))
+            {
+                Core.DocumentAssembler.AssembleDocument(wmlTemplate, xmldata, output, out var templateError, out _);
+                Assert.Equal(expectedError, templateError);
+            }
+
+            compressed.Position = 0;
+            using var package = new MemoryStream();
+            using (var input = new GZipStream(compressed, CompressionMode.Decompress))
+            {
+                input.CopyTo(package);
+            }
+            Assert.Equal(GetDocumentText(expected), GetDocumentText(new WmlDocument("Assembled.docx", package.ToArray())));
+        }
+
+        // Each simple select is evaluated by walking the data tree; the equivalent written with explicit axes
+        // goes through the XPath engine. Both must produce the same text and the same error state.
+        [Theory]
+        [InlineData("Customer/Name", "child::Customer/child::Name")]
+        [InlineData("./Customer/Name", "child::Customer/child::Name")]
+        [InlineData("Customer/@Id", "child::Customer/attribute::Id")]
+        [InlineData("@Region", "attribute::Region")]
+        [InlineData(".", "self::node()")]
+        [InlineData("Customer/Phone", "child::Customer/child::Phone")]
+        [InlineData("Customer/Missing", "child::Customer/child::Missing")]
+        [InlineData("Customer/@Missing", "child::Customer/attribute::Missing")]
+        public void AssembleDocument_SimpleSelectMatchesXPathEngine(string simple, string equivalent)
+        {
+            var data = new XElement("Root",
+                new XAttribute("Region", "North"),
+                new XElement("Customer",
+                    new XAttribute("Id", "7"),
+                    new XElement("Name", "Ann"),
+                    new XElement("Phone", "1"),
+                    new XElement("Phone", "2")));
+            string Token(string select) => $"<# <Content Select=\"{select}\" Optional=\"false\" /> #>";
+
+            var expected = Core.DocumentAssembler.AssembleDocument(
+                CreateTemplateDocument("DA-EngineSelect.docx", Token(equivalent)), data, out var expectedError);
+            var actual = Core.DocumentAssembler.AssembleDocument(
+                CreateTemplateDocument("DA-SimpleSelect.docx", Token(simple)), data, out var actualError);
+
+            Assert.Equal(expectedError, actualError);
+            Assert.Equal(GetDocumentText(expected), GetDocumentText(actual));
+        }
+
+        [Fact]
+        public void AssembleDocument_SimpleRepeatSelectMatchesXPathEngine()
+        {
+            var data = new XElement("Root",
+                new XElement("Order", new XElement("Product", "A")),
+                new XElement("Order", new XElement("Product", "B")));
+            WmlDocument Template(string select) => CreateTemplateDocument("DA-RepeatSelect.docx",
+                $"<# <Repeat Select=\"{select}\" /> #>",
+                "<# <Content Select=\"Product\" /> #>",
+                "<# <EndRepeat /> #>");
+
+            var expected = Core.DocumentAssembler.AssembleDocument(Template("child::Order"), data, out var expectedError);
+            var actual = Core.DocumentAssembler.AssembleDocument(Template("./Order"), data, out var actualError);
+
+            Assert.False(actualError);
+            Assert.Equal(expectedError, actualError);
+            Assert.Equal(GetDocumentText(expected), GetDocumentText(actual));
+        }
+
+        // The messages are the ones XmlSchema validation reported when the tags were validated against XSDs.
+        [Theory]
+        [InlineData("<Content />", "The required attribute 'Select' is missing.")]
+        [InlineData("<Content Select=\"Name\" Foo=\"1\" />", "The 'Foo' attribute is not declared.")]
+        [InlineData("<Table Select=\"Orders\" Optional=\"true\" />", "The 'Optional' attribute is not declared.")]
+        [InlineData("<Repeat Select=\"Orders\" Optional=\"maybe\" />",
+            "The 'Optional' attribute is invalid - The value 'maybe' is invalid according to its datatype 'http://www.w3.org/2001/XMLSchema:boolean' - The string 'maybe' is not a valid Boolean value.")]
+        [InlineData("<Signature Id=\"s\" PageHint=\" 1  x \" />",
+            "The 'PageHint' attribute is invalid - The value ' 1  x ' is invalid according to its datatype 'http://www.w3.org/2001/XMLSchema:int' - The string '1 x' is not a valid Int32 value.")]
+        [InlineData("<Image Select=\"Logo\"><Child /></Image>",
+            "The element 'Image' cannot contain child element 'Child' because the parent element's content model is empty.")]
+        [InlineData("<Conditional Select=\"Flag\">text</Conditional>", "The element cannot contain text. Content model is empty.")]
+        [InlineData("<Unknown />", "Invalid XML: Unknown is not a valid element")]
+        public void AssembleDocument_ReportsTagValidationErrors(string tag, string message)
+        {
+            var template = CreateTemplateDocument("DA-InvalidTag.docx", $"<# {tag} #>");
+
+            var assembled = Core.DocumentAssembler.AssembleDocument(template, new XElement("Root"), out var templateError);
+
+            Assert.True(templateError);
+            Assert.Contains("Schema Validation Error: " + message, GetDocumentText(assembled), StringComparison.Ordinal);
+        }
+
+        [Theory]
+        [InlineData("<Content Select=\"Name\" Optional=\" true \" />")]
+        [InlineData("<Signature Id=\"s\" PageHint=\"+3\" Optional=\"0\" />")]
+        [InlineData("<EndRepeat Anything=\"goes\" />")]
+        [InlineData("<Content Select=\"Name\" xml:space=\"preserve\" xml:lang=\"en-US\" />")]
+        [InlineData("<Repeat Select=\"Orders\" xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\" xsi:schemaLocation=\"urn:orders orders.xsd\" xsi:nil=\"false\" />")]
+        public void AssembleDocument_AcceptsValidTags(string tag)
+        {
+            var template = CreateTemplateDocument("DA-ValidTag.docx", $"<# {tag} #>");
+
+            var assembled = Core.DocumentAssembler.AssembleDocument(template, new XElement("Root", new XElement("Name", "Ann")), out _);
+
+            Assert.DoesNotContain("Schema Validation Error", GetDocumentText(assembled), StringComparison.Ordinal);
+        }
+
+        [Fact]
+        public void AssembleDocument_LeavesPartsWithoutTagsUntouched()
+        {
+            var template = TestDocumentFactory.Create("DA-PlainFooter.docx", builder =>
+            {
+                builder.AddBodyElement(new XElement(W.p, new XElement(W.r, new XElement(W.t, "<# <Content Select=\"Name\" /> #>"))));
+                builder.AddDefaultHeader(new XElement(W.p, new XElement(W.r, new XElement(W.t, "Page <# <Content Select=\"Name\" /> #>"))));
+                builder.AddDefaultFooter(new XElement(W.p,
+                    new XElement(W.bookmarkStart, new XAttribute(W.id, "0"), new XAttribute(W.name, "_GoBack")),
+                    new XElement(W.bookmarkEnd, new XAttribute(W.id, "0")),
+                    new XElement(W.r, new XElement(W.t, "Confidential"))));
+            });
+            var data = new XElement("Data", new XElement("Name", "Ann"));
+
+            var assembled = Core.DocumentAssembler.AssembleDocument(template, data, out var templateError);
+            Assert.False(templateError);
+
+            Assert.Equal(ReadPartBytes(template, d => d.MainDocumentPart!.FooterParts.Single()),
+                ReadPartBytes(assembled, d => d.MainDocumentPart!.FooterParts.Single()));
+            Assert.NotEqual(ReadPartBytes(template, d => d.MainDocumentPart!.HeaderParts.Single()),
+                ReadPartBytes(assembled, d => d.MainDocumentPart!.HeaderParts.Single()));
+            Assert.Equal("Ann", GetDocumentText(assembled));
+            Assert.Equal("Page Ann", string.Concat(ReadHeaderText(assembled)));
+        }
+
+        [Theory]
+        [InlineData(false)]
+        [InlineData(true)]
+        public void AssembleDocument_ReportsDiagnostics(bool processPartsInParallel)
+        {
+            var template = TestDocumentFactory.Create("DA-Diagnostics.docx", builder =>
+            {
+                builder.AddBodyElement(new XElement(W.p, new XElement(W.r, new XElement(W.t, "<# <Content Select=\"Name\" /> #>"))));
+                builder.AddBodyElement(new XElement(W.p, new XElement(W.r, new XElement(W.t, "<# <Content Select=\"Name\" /> #>"))));
+                builder.AddDefaultFooter(new XElement(W.p, new XElement(W.r, new XElement(W.t, "Confidential"))));
+            });
+            var data = new XElement("Data", new XElement("Name", "Ann"));
+            var reports = new List<AssemblyDiagnostics>();
+            var options = new DocumentAssemblerOptions
+            {
+                ProcessPartsInParallel = processPartsInParallel,
+                Diagnostics = reports.Add,
+            };
+
+            Core.DocumentAssembler.AssembleDocument(template, data, options, out var templateError, out _);
+
+            Assert.False(templateError);
+            var report = Assert.Single(reports);
+            // the footer has no tags and is not processed
+            var part = Assert.Single(report.Parts);
+            Assert.Equal("/word/document.xml", part.PartUri.ToString());
+            Assert.Equal(new[]
+            {
+                "RemoveGoBackBookmarks",
+                "NormalizeContentControlsInCells",
+                "TransformToMetadata",
+                "ForceBlockLevelAsAppropriate",
+                "NormalizeTablesRepeatAndConditional",
+                "ContentReplacementTransform",
+                "PutXDocument",
+            }, part.Phases.Select(p => p.Name));
+            Assert.Equal(2, part.TagCounts["Content"]);
+            Assert.Equal(1, report.XPathCacheHits);
+            Assert.Equal(1, report.XPathCacheMisses);
+            Assert.Equal(0.5, report.XPathCacheHitRatio);
+            Assert.True(report.AllocatedBytes >= part.Phases.Sum(p => p.AllocatedBytes));
+            Assert.True(report.Elapsed >= part.Elapsed);
+        }
+
+        [Fact]
+        public void CompiledTemplate_ReportsDataBindingPhases()
+        {
+            var template = TestDocumentFactory.Create("DA-Diagnostics.docx", builder =>
+                builder.AddBodyElement(new XElement(W.p, new XElement(W.r, new XElement(W.t, "<# <Content Select=\"Name\" /> #>")))));
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+            var reports = new List<AssemblyDiagnostics>();
+
+            compiled.Assemble(new XElement("Data", new XElement("Name", "Ann")), new DocumentAssemblerOptions { Diagnostics = reports.Add }, out _, out _);
+
+            var part = Assert.Single(Assert.Single(reports).Parts);
+            Assert.Equal(new[] { "ContentReplacementTransform", "PutXDocument" }, part.Phases.Select(p => p.Name));
+            Assert.Equal(1, part.TagCounts["Content"]);
+        }
+
+        private static byte[] ReadPartBytes(WmlDocument document, Func<WordprocessingDocument, OpenXmlPart> selectPart)
+        {
+            using var ms = new MemoryStream(document.DocumentByteArray);
+            using var wDoc = WordprocessingDocument.Open(ms, false);
+            using var partStream = selectPart(wDoc).GetStream(FileMode.Open, FileAccess.Read);
+            using var bytes = new MemoryStream();
+            partStream.CopyTo(bytes);
+            return bytes.ToArray();
+        }
+
+        private static IEnumerable<string> ReadHeaderText(WmlDocument document)
+        {
+            using var ms = new MemoryStream(document.DocumentByteArray);
+            using var wDoc = WordprocessingDocument.Open(ms, false);
+            return wDoc.MainDocumentPart!.HeaderParts
+                .SelectMany(h => h.GetXDocument().Descendants(W.t))
+                .Select(t => (string)t)
+                .ToList();
+        }
+
         [Fact]
         public void AssembleDocument_ImageMetadataCreatesImageParts()
         {
@@ -216,7 +456,7 @@ namespace DocumentAssembler.Tests
                 "<# <Image Select=\"Image[2]\" /> #>");
             var data = new XElement("Images",
                 new XElement("Image", TinyPngBase64),
-                new XElement("Image", TinyPngBase64));
+                new XElement("Image", LargeSamplePngBase64));
 
             var assembled = Core.DocumentAssembler.AssembleDocument(template, data, out var templateError);
             Assert.False(templateError);
@@ -244,6 +484,52 @@ namespace DocumentAssembler.Tests
             Assert.All(blipIds, id => Assert.False(string.IsNullOrEmpty(id)));
         }
 
+        [Fact]
+        public void AssembleDocument_IdenticalImagesShareOneImagePart()
+        {
+            var template = CreateTemplateDocument("DA-RepeatedImageTemplate.docx",
+                "<# <Repeat Select=\"Row\" /> #>",
+                "<# <Image Select=\"Logo\" /> #>",
+                "<# <EndRepeat /> #>");
+            var data = new XElement("Rows",
+                Enumerable.Range(0, 5).Select(_ => new XElement("Row", new XElement("Logo", TinyPngBase64))));
+
+            var assembled = Core.DocumentAssembler.AssembleDocument(template, data, out var templateError);
+            Assert.False(templateError);
+
+            using var ms = new MemoryStream(assembled.DocumentByteArray);
+            using var wDoc = WordprocessingDocument.Open(ms, false);
+            var mainPart = wDoc.MainDocumentPart!;
+            var imagePart = Assert.Single(mainPart.ImageParts);
+            var xDoc = mainPart.GetXDocument();
+
+            Assert.Equal(new[] { 1, 2, 3, 4, 5 }, xDoc.Descendants(WP.docPr).Select(d => (int)d.Attribute("id")!));
+            var blipIds = xDoc.Descendants(A.blip).Select(b => (string?)b.Attribute(R.embed)).ToList();
+            Assert.Equal(5, blipIds.Count);
+            Assert.All(blipIds, id => Assert.Equal(mainPart.GetIdOfPart(imagePart), id));
+        }
+
+        [Fact]
+        public void AssembleDocument_HeaderReusesImagePartOfBody()
+        {
+            var token = new XElement(W.p, new XElement(W.r, new XElement(W.t, "<# <Image Select=\"Logo\" /> #>")));
+            var template = TestDocumentFactory.Create("DA-HeaderImageTemplate.docx", builder =>
+            {
+                builder.AddBodyElement(token);
+                builder.AddDefaultHeader(token);
+            });
+            var data = new XElement("Data", new XElement("Logo", TinyPngBase64));
+
+            var assembled = Core.DocumentAssembler.AssembleDocument(template, data, out var templateError);
+            Assert.False(templateError);
+
+            using var ms = new MemoryStream(assembled.DocumentByteArray);
+            using var wDoc = WordprocessingDocument.Open(ms, false);
+            var mainPart = wDoc.MainDocumentPart!;
+            var headerPart = Assert.Single(mainPart.HeaderParts);
+            Assert.Equal(Assert.Single(mainPart.ImageParts).Uri, Assert.Single(headerPart.ImageParts).Uri);
+        }
+
         [Fact]
         public void AssembleDocument_InvalidBase64RaisesTemplateError()
         {
@@ -0,0 +1,68 @@
+using DocumentAssembler.Core;
+using System.IO;
+using System.Xml.Linq;
+using Xunit;
+
+namespace DocumentAssembler.Tests
+{
+    /// <summary>
+    /// DocumentAssemblerOptions.ProcessPartsInParallel must produce the same documents and the same
+    /// error summaries as the sequential processing of content parts.
+    /// </summary>
+    public class ParallelPartsTests
+    {
+        private static readonly DirectoryInfo s_SourceDir = new DirectoryInfo("TestFiles/");
+
+        private static readonly DocumentAssemblerOptions s_Parallel = new DocumentAssemblerOptions
+        {
+            ProcessPartsInParallel = true,
+        };
+
+        [Theory]
+        [InlineData("DA001-TemplateDocument.docx", "DA-Data.xml")]
+        [InlineData("DA009-InvalidXPath.docx", "DA-Data.xml")]
+        [InlineData("DA023-RepeatWOEndRepeat.docx", "DA-Data.xml")]
+        [InlineData("DA034-HeaderFooter.docx", "DA-Data.xml")]
+        [InlineData("DA234-HeaderFooter.docx", "DA-Data.xml")]
+        [InlineData("DA236-Page-Num-in-Footer.docx", "DA-Content-List.xml")]
+        public void AssembleDocument_ParallelMatchesSequential(string name, string data)
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, name));
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, data));
+
+            var expected = Core.DocumentAssembler.AssembleDocument(template, xmlData, out var expectedError, out var expectedSummary);
+            var actual = Core.DocumentAssembler.AssembleDocument(template, xmlData, s_Parallel, out var actualError, out var actualSummary);
+
+            Assert.Equal(expectedError, actualError);
+            Assert.Equal(expectedSummary, actualSummary);
+            TestUtil.AssertSameContentParts(expected, actual);
+        }
+
+        [Theory]
+        [InlineData("DA034-HeaderFooter.docx", "DA-Data.xml")]
+        [InlineData("DA234-HeaderFooter.docx", "DA-Data.xml")]
+        public void CompiledTemplate_ParallelMatchesSequential(string name, string data)
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, name));
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, data));
+            var compiled = Core.DocumentAssembler.CompileTemplate(template);
+
+            var expected = compiled.Assemble(xmlData, out var expectedError, out var expectedSummary);
+            var actual = compiled.Assemble(xmlData, s_Parallel, out var actualError, out var actualSummary);
+
+            Assert.Equal(expectedError, actualError);
+            Assert.Equal(expectedSummary, actualSummary);
+            TestUtil.AssertSameContentParts(expected, actual);
+        }
+
+        [Fact]
+        public void AssembleDocument_ParallelStillRejectsTrackedRevisions()
+        {
+            var template = new WmlDocument(Path.Combine(s_SourceDir.FullName, "DA024-TrackedRevisions.docx"));
+            var xmlData = XElement.Load(Path.Combine(s_SourceDir.FullName, "DA-Data.xml"));
+
+            Assert.Throws<OpenXmlPowerToolsException>(() =>
+                Core.DocumentAssembler.AssembleDocument(template, xmlData, s_Parallel, out _, out _));
+        }
+    }
+}
@@ -39,6 +39,24 @@ public class RevisionAccepterTests
         Assert.True(RevisionAccepter.PartHasTrackedRevisions(wordDoc.MainDocumentPart));
     }
 
+    [Theory]
+    [InlineData("DA024-TrackedRevisions.docx", true)]
+    [InlineData("DA224-TrackedRevisions.docx", true)]
+    [InlineData("DA001-TemplateDocument.docx", false)]
+    public void PartHasTrackedRevisions_StreamedScanMatchesLoadedTree(string fileName, bool expected)
+    {
+        var source = LoadTrackedDocument(fileName);
+        using var msDoc = new OpenXmlMemoryStreamDocument(source);
+        using var wordDoc = msDoc.GetWordprocessingDocument();
+        var mainPart = wordDoc.MainDocumentPart!;
+
+        Assert.Equal(expected, RevisionAccepter.PartHasTrackedRevisions(mainPart));
+        Assert.Null(mainPart.Annotation<System.Xml.Linq.XDocument>()); // the scan does not build a tree
+
+        mainPart.GetXDocument();
+        Assert.Equal(expected, RevisionAccepter.PartHasTrackedRevisions(mainPart));
+    }
+
     private static WmlDocument LoadTrackedDocument(string fileName)
     {
         var path = Path.Combine(AppContext.BaseDirectory, "TestFiles", fileName);
@@ -0,0 +1,140 @@
+using DocumentAssembler.Core;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Threading.Tasks;
+using System.Xml;
+using System.Xml.Linq;
+using Xunit;
+
+namespace DocumentAssembler.Tests
+{
+    /// <summary>
+    /// Binding a streamed collection must produce the same document as binding the same items in a loaded data tree.
+    /// </summary>
+    public class StreamedCollectionTests
+    {
+        [Theory]
+        [InlineData(0)]
+        [InlineData(1)]
+        [InlineData(250)]
+        public void AssembleDocument_StreamedTableMatchesLoadedData(int orderCount)
+        {
+            var template = CreateTableTemplate();
+            var data = CreateData(orderCount);
+            var expected = Core.DocumentAssembler.AssembleDocument(template, data, out var expectedError, out var expectedSummary);
+
+            using var reader = XmlReader.Create(new StringReader(data.ToString()));
+            var collection = StreamedCollection.FromXmlReader("Orders/Order", reader, "Order");
+            var actual = AssembleStreamed(template, CreateEnvelope(), collection, out var outcome);
+
+            Assert.Equal(expectedError, outcome.TemplateError);
+            Assert.Equal(expectedSummary, outcome.TemplateErrorSummary);
+            TestUtil.AssertSameContentParts(expected, actual);
+        }
+
+        [Fact]
+        public void AssembleDocument_CompiledRowsEscapeValuesAndReportMissingFields()
+        {
+            var template = CreateTableTemplate();
+            var data = CreateData(3);
+            var orders = data.Descendants("Order").ToList();
+            orders[0].Element("Amount")!.Value = "1 < 2 & \"3\" > 0";
+            orders[1].Element("Amount")!.Remove();
+            var expected = Core.DocumentAssembler.AssembleDocument(template, data, out var expectedError, out var expectedSummary);
+
+            var collection = new StreamedCollection("Orders/Order", orders.Select(o => new XElement(o)));
+            var actual = AssembleStreamed(template, CreateEnvelope(), collection, out var outcome);
+
+            Assert.True(expectedError);
+            Assert.Equal(expectedError, outcome.TemplateError);
+            Assert.Equal(expectedSummary, outcome.TemplateErrorSummary);
+            TestUtil.AssertSameContentParts(expected, actual);
+        }
+
+        [Fact]
+        public async Task AssembleDocumentAsync_StreamedRepeatMatchesLoadedData()
+        {
+            var template = TestDocumentFactory.Create("DA-StreamedRepeat.docx", builder =>
+            {
+                builder.AddBodyElement(Paragraph("<# <Content Select=\"Title\" /> #>"));
+                builder.AddBodyElement(Paragraph("<# <Repeat Select=\"Orders/Order\" /> #>"));
+                builder.AddBodyElement(Paragraph("<# <Content Select=\"Number\" /> #>"));
+                builder.AddBodyElement(Paragraph("<# <EndRepeat /> #>"));
+                builder.AddBodyElement(Paragraph("<# <Content Select=\"Total\" /> #>"));
+            });
+            var data = CreateData(20);
+            var expected = Core.DocumentAssembler.AssembleDocument(template, data, out var expectedError, out var expectedSummary);
+
+            var collection = new StreamedCollection("Orders/Order", ToAsyncEnumerable(data.Descendants("Order").Select(o => new XElement(o))));
+            using var templateStream = new MemoryStream(template.DocumentByteArray, false);
+            using var output = new MemoryStream();
+            var outcome = await Core.DocumentAssembler.AssembleDocumentAsync(templateStream, CreateEnvelope(), collection, output);
+
+            Assert.Equal(expectedError, outcome.TemplateError);
+            Assert.Equal(expectedSummary, outcome.TemplateErrorSummary);
+            TestUtil.AssertSameContentParts(expected, new WmlDocument("Assembled.docx", output.ToArray()));
+        }
+
+        [Fact]
+        public void AssembleDocument_ThrowsWithoutMatchingTopLevelTag()
+        {
+            var collection = new StreamedCollection("Customers/Customer", Enumerable.Empty<XElement>());
+
+            Assert.Throws<ArgumentException>(() => AssembleStreamed(CreateTableTemplate(), CreateEnvelope(), collection, out _));
+        }
+
+        private static WmlDocument AssembleStreamed(WmlDocument template, XElement data, StreamedCollection collection, out AssemblyOutcome outcome)
+        {
+            using var templateStream = new MemoryStream(template.DocumentByteArray, false);
+            using var output = new MemoryStream();
+            outcome = Core.DocumentAssembler.AssembleDocument(templateStream, data, collection, output);
+            return new WmlDocument("Assembled.docx", output.ToArray());
+        }
+
+        private static WmlDocument CreateTableTemplate() =>
+            TestDocumentFactory.Create("DA-StreamedTable.docx", builder =>
+            {
+                builder.AddBodyElement(Paragraph("<# <Content Select=\"Title\" /> #>"));
+                builder.AddBodyElement(Paragraph("<# <Table Select=\"Orders/Order\" /> #>"));
+                builder.AddBodyElement(new XElement(W.tbl,
+                    new XElement(W.tblPr),
+                    Row("No.", "Amount"),
+                    Row("Number", "Amount"),
+                    Row("Total", "<# <Content Select=\"Total\" /> #>")));
+                builder.AddBodyElement(Paragraph("End of report"));
+            });
+
+        private static XElement CreateEnvelope() =>
+            new XElement("Data",
+                new XElement("Title", "Orders"),
+                new XElement("Total", "42"));
+
+        private static XElement CreateData(int orderCount)
+        {
+            var data = CreateEnvelope();
+            data.Add(new XElement("Orders",
+                Enumerable.Range(1, orderCount).Select(i =>
+                    new XElement("Order",
+                        new XElement("Number", i),
+                        new XElement("Amount", i * 10)))));
+            return data;
+        }
+
+        private static XElement Paragraph(string text) =>
+            new XElement(W.p, new XElement(W.r, new XElement(W.t, text)));
+
+        private static XElement Row(params string[] cellTexts) =>
+            new XElement(W.tr, cellTexts.Select(text => new XElement(W.tc, Paragraph(text))));
+
+        private static async IAsyncEnumerable<XElement> ToAsyncEnumerable(IEnumerable<XElement> items)
+        {
+            foreach (var item in items)
+            {
+                await Task.Yield();
+                yield return item;
+            }
+        }
+    }
+}
@@ -1,5 +1,10 @@
-﻿using System;
+﻿using DocumentAssembler.Core;
+using DocumentFormat.OpenXml.Packaging;
+using System;
 using System.IO;
+using System.Linq;
+using System.Xml.Linq;
+using Xunit;
 
 namespace DocumentAssembler.Tests
 {
@@ -18,5 +23,27 @@ namespace DocumentAssembler.Tests
         /// Lookin into /tmp or %temp% for test output
         /// </summary>
         public static DirectoryInfo TempDir { get; private set; }
+
+        /// <summary>
+        /// Asserts that both documents have the same content parts with the same XML
+        /// </summary>
+        public static void AssertSameContentParts(WmlDocument expected, WmlDocument actual)
+        {
+            using var expectedStream = new MemoryStream(expected.DocumentByteArray);
+            using var actualStream = new MemoryStream(actual.DocumentByteArray);
+            using var expectedDoc = WordprocessingDocument.Open(expectedStream, false);
+            using var actualDoc = WordprocessingDocument.Open(actualStream, false);
+
+            var expectedParts = expectedDoc.ContentParts().Where(p => p != null).ToList();
+            var actualParts = actualDoc.ContentParts().Where(p => p != null).ToList();
+            Assert.Equal(expectedParts.Count, actualParts.Count);
+            for (var i = 0; i < expectedParts.Count; i++)
+            {
+                Assert.Equal(expectedParts[i]!.Uri, actualParts[i]!.Uri);
+                Assert.Equal(
+                    expectedParts[i]!.GetXDocument().ToString(SaveOptions.DisableFormatting),
+                    actualParts[i]!.GetXDocument().ToString(SaveOptions.DisableFormatting));
+            }
+        }
     }
 }
\ No newline at end of file
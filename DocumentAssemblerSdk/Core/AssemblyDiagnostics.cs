@@ -0,0 +1,223 @@
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.Linq;
+using System.Threading;
+using System.Xml.Linq;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// Where one assembly spent its time, reported to <see cref="DocumentAssemblerOptions.Diagnostics"/>.
+    /// </summary>
+    public sealed class AssemblyDiagnostics
+    {
+        internal AssemblyDiagnostics(TimeSpan elapsed, long allocatedBytes, long xPathCacheHits, long xPathCacheMisses, IReadOnlyList<PartDiagnostics> parts)
+        {
+            Elapsed = elapsed;
+            AllocatedBytes = allocatedBytes;
+            XPathCacheHits = xPathCacheHits;
+            XPathCacheMisses = xPathCacheMisses;
+            Parts = parts;
+        }
+
+        /// <summary>
+        /// Wall-clock time of the whole assembly, including opening and saving the package
+        /// </summary>
+        public TimeSpan Elapsed { get; }
+
+        /// <summary>
+        /// Bytes allocated by the assembly, on the calling thread and on the threads that processed parts in parallel
+        /// </summary>
+        public long AllocatedBytes { get; }
+
+        /// <summary>
+        /// Select expressions answered from the XPath evaluation cache
+        /// </summary>
+        public long XPathCacheHits { get; }
+
+        /// <summary>
+        /// Select expressions that had to be evaluated
+        /// </summary>
+        public long XPathCacheMisses { get; }
+
+        /// <summary>
+        /// Share of select expressions answered from the cache, 0 when nothing was selected
+        /// </summary>
+        public double XPathCacheHitRatio =>
+            XPathCacheHits + XPathCacheMisses == 0 ? 0 : (double)XPathCacheHits / (XPathCacheHits + XPathCacheMisses);
+
+        /// <summary>
+        /// The processed content parts, in package order. Parts without template markup are not processed and not listed.
+        /// </summary>
+        public IReadOnlyList<PartDiagnostics> Parts { get; }
+    }
+
+    /// <summary>
+    /// The processing of one content part (main document, header, footer, footnotes, endnotes).
+    /// </summary>
+    public sealed class PartDiagnostics
+    {
+        internal PartDiagnostics(Uri partUri, IReadOnlyList<PhaseDiagnostics> phases, IReadOnlyDictionary<string, int> tagCounts)
+        {
+            PartUri = partUri;
+            Phases = phases;
+            TagCounts = tagCounts;
+        }
+
+        /// <summary>
+        /// Uri of the part in the package
+        /// </summary>
+        public Uri PartUri { get; }
+
+        /// <summary>
+        /// The phases run on the part, in the order they ran. A compiled template only reports the phases
+        /// that bind data (ContentReplacementTransform and PutXDocument).
+        /// </summary>
+        public IReadOnlyList<PhaseDiagnostics> Phases { get; }
+
+        /// <summary>
+        /// Number of template tags in the part by tag name (Content, Repeat, Table, ...)
+        /// </summary>
+        public IReadOnlyDictionary<string, int> TagCounts { get; }
+
+        /// <summary>
+        /// Sum of the phase durations
+        /// </summary>
+        public TimeSpan Elapsed => Phases.Aggregate(TimeSpan.Zero, (sum, phase) => sum + phase.Elapsed);
+    }
+
+    /// <summary>
+    /// One phase of the processing of a part.
+    /// </summary>
+    public sealed class PhaseDiagnostics
+    {
+        internal PhaseDiagnostics(string name, TimeSpan elapsed, long allocatedBytes)
+        {
+            Name = name;
+            Elapsed = elapsed;
+            AllocatedBytes = allocatedBytes;
+        }
+
+        /// <summary>
+        /// Name of the phase, e.g. TransformToMetadata or ContentReplacementTransform
+        /// </summary>
+        public string Name { get; }
+
+        /// <summary>
+        /// Wall-clock time of the phase
+        /// </summary>
+        public TimeSpan Elapsed { get; }
+
+        /// <summary>
+        /// Bytes allocated by the phase
+        /// </summary>
+        public long AllocatedBytes { get; }
+    }
+
+    /// <summary>
+    /// Collects <see cref="AssemblyDiagnostics"/> for one assembly. Only created when diagnostics are requested,
+    /// the assembler passes null otherwise and does no measuring at all.
+    /// </summary>
+    internal sealed class AssemblyDiagnosticsRecorder
+    {
+        private readonly Action<AssemblyDiagnostics> _callback;
+        private readonly List<PartDiagnosticsRecorder> _parts = new List<PartDiagnosticsRecorder>();
+        private readonly long _startTimestamp;
+        private readonly long _startAllocatedBytes;
+        private readonly int _threadId;
+        private long _otherThreadsAllocatedBytes;
+        private long _xPathCacheHits;
+        private long _xPathCacheMisses;
+
+        private AssemblyDiagnosticsRecorder(Action<AssemblyDiagnostics> callback)
+        {
+            _callback = callback;
+            _threadId = Environment.CurrentManagedThreadId;
+            _startAllocatedBytes = GC.GetAllocatedBytesForCurrentThread();
+            _startTimestamp = Stopwatch.GetTimestamp();
+        }
+
+        public static AssemblyDiagnosticsRecorder? Start(DocumentAssemblerOptions? options) =>
+            options?.Diagnostics is { } callback ? new AssemblyDiagnosticsRecorder(callback) : null;
+
+        // Called on the assembling thread, in package order, before any part is processed.
+        public PartDiagnosticsRecorder ForPart(Uri partUri)
+        {
+            var part = new PartDiagnosticsRecorder(this, partUri);
+            _parts.Add(part);
+            return part;
+        }
+
+        public void SetXPathCacheCounts(long hits, long misses)
+        {
+            _xPathCacheHits = hits;
+            _xPathCacheMisses = misses;
+        }
+
+        public void Report()
+        {
+            var elapsed = Stopwatch.GetElapsedTime(_startTimestamp);
+            var allocatedBytes = GC.GetAllocatedBytesForCurrentThread() - _startAllocatedBytes + Interlocked.Read(ref _otherThreadsAllocatedBytes);
+            _callback(new AssemblyDiagnostics(
+                elapsed,
+                allocatedBytes,
+                _xPathCacheHits,
+                _xPathCacheMisses,
+                _parts.Select(p => p.ToDiagnostics()).ToList()));
+        }
+
+        // allocations on the assembling thread are already in the assembly total
+        internal void AddAllocatedBytes(int threadId, long allocatedBytes)
+        {
+            if (threadId != _threadId)
+            {
+                Interlocked.Add(ref _otherThreadsAllocatedBytes, allocatedBytes);
+            }
+        }
+    }
+
+    /// <summary>
+    /// Times the phases of one part. A part is processed by one thread at a time, so the recorder is not synchronized.
+    /// </summary>
+    internal sealed class PartDiagnosticsRecorder
+    {
+        private readonly AssemblyDiagnosticsRecorder _assembly;
+        private readonly Uri _partUri;
+        private readonly List<PhaseDiagnostics> _phases = new List<PhaseDiagnostics>();
+        private IReadOnlyDictionary<string, int> _tagCounts = new Dictionary<string, int>();
+        private long _phaseStartTimestamp;
+        private long _phaseStartAllocatedBytes;
+
+        public PartDiagnosticsRecorder(AssemblyDiagnosticsRecorder assembly, Uri partUri)
+        {
+            _assembly = assembly;
+            _partUri = partUri;
+        }
+
+        public void StartPhase()
+        {
+            _phaseStartAllocatedBytes = GC.GetAllocatedBytesForCurrentThread();
+            _phaseStartTimestamp = Stopwatch.GetTimestamp();
+        }
+
+        public void EndPhase(string name)
+        {
+            var elapsed = Stopwatch.GetElapsedTime(_phaseStartTimestamp);
+            var allocatedBytes = GC.GetAllocatedBytesForCurrentThread() - _phaseStartAllocatedBytes;
+            _phases.Add(new PhaseDiagnostics(name, elapsed, allocatedBytes));
+            _assembly.AddAllocatedBytes(Environment.CurrentManagedThreadId, allocatedBytes);
+        }
+
+        // Template tags are the elements without a namespace in a metadata tree; the document markup is all namespaced.
+        public void CountTags(XElement metadata)
+        {
+            _tagCounts = metadata.Descendants()
+                .Where(e => e.Name.Namespace == XNamespace.None)
+                .GroupBy(e => e.Name.LocalName)
+                .ToDictionary(g => g.Key, g => g.Count());
+        }
+
+        public PartDiagnostics ToDiagnostics() => new PartDiagnostics(_partUri, _phases, _tagCounts);
+    }
+}
@@ -0,0 +1,25 @@
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// The template errors of a document assembled by
+    /// <see cref="DocumentAssembler.AssembleDocumentAsync(System.IO.Stream, System.Xml.Linq.XElement, System.IO.Stream, DocumentAssemblerOptions?, System.Threading.CancellationToken)"/>.
+    /// </summary>
+    public sealed class AssemblyOutcome
+    {
+        internal AssemblyOutcome(bool templateError, string? templateErrorSummary)
+        {
+            TemplateError = templateError;
+            TemplateErrorSummary = templateErrorSummary;
+        }
+
+        /// <summary>
+        /// True if the template or the data produced errors; see <see cref="TemplateErrorSummary"/>
+        /// </summary>
+        public bool TemplateError { get; }
+
+        /// <summary>
+        /// Summary of the template errors, empty when there are none
+        /// </summary>
+        public string? TemplateErrorSummary { get; }
+    }
+}
@@ -0,0 +1,36 @@
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// One document produced by a batch assembly (see <see cref="CompiledTemplate.AssembleMany"/>).
+    /// </summary>
+    public sealed class AssemblyResult
+    {
+        internal AssemblyResult(int index, WmlDocument document, bool templateError, string? templateErrorSummary)
+        {
+            Index = index;
+            Document = document;
+            TemplateError = templateError;
+            TemplateErrorSummary = templateErrorSummary;
+        }
+
+        /// <summary>
+        /// Zero-based position of the data record in the input sequence
+        /// </summary>
+        public int Index { get; }
+
+        /// <summary>
+        /// The assembled document
+        /// </summary>
+        public WmlDocument Document { get; }
+
+        /// <summary>
+        /// True if the template or the record produced errors; see <see cref="TemplateErrorSummary"/>
+        /// </summary>
+        public bool TemplateError { get; }
+
+        /// <summary>
+        /// Summary of the template errors, empty when there are none
+        /// </summary>
+        public string? TemplateErrorSummary { get; }
+    }
+}
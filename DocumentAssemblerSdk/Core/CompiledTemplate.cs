@@ -0,0 +1,234 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Runtime.CompilerServices;
+using System.Threading;
+using System.Threading.Tasks;
+using System.Xml;
+using System.Xml.Linq;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// A DocumentAssembler template whose parts have already been normalized into metadata.
+    /// Create instances with <see cref="DocumentAssembler.CompileTemplate(WmlDocument)"/>.
+    /// </summary>
+    /// <remarks>
+    /// Bookmark cleanup, content control normalization, tag parsing and validation, block-level
+    /// promotion and Repeat/Conditional/Table grouping run once, when the template is compiled.
+    /// Each call to <c>Assemble</c> only evaluates the data bindings and writes the package, so a
+    /// compiled template can be reused for any number of documents. <c>Assemble</c> never modifies
+    /// the compiled template and may be called from several threads at once.
+    /// </remarks>
+    public sealed class CompiledTemplate
+    {
+        internal byte[] TemplateBytes { get; }
+        internal IReadOnlyDictionary<Uri, DocumentAssembler.CompiledPart> Parts { get; }
+        internal DocumentAssembler.TemplateError CompileErrors { get; }
+
+        internal CompiledTemplate(byte[] templateBytes, IEnumerable<DocumentAssembler.CompiledPart> parts, DocumentAssembler.TemplateError compileErrors)
+        {
+            TemplateBytes = templateBytes;
+            var partsByUri = new Dictionary<Uri, DocumentAssembler.CompiledPart>();
+            foreach (var part in parts)
+            {
+                partsByUri[part.Uri] = part;
+            }
+            Parts = partsByUri;
+            CompileErrors = compileErrors;
+        }
+
+        /// <summary>
+        /// True if compiling the template already produced errors (malformed tags, unmatched
+        /// Repeat/Conditional blocks, ...). Every assembled document then reports a template error.
+        /// </summary>
+        public bool HasCompileErrors => CompileErrors.HasError;
+
+        public WmlDocument Assemble(XmlDocument data, out bool templateError) =>
+            Assemble(data, out templateError, out _);
+
+        public WmlDocument Assemble(XmlDocument data, out bool templateError, out string? templateErrorSummary)
+        {
+            var xDoc = data.GetXDocument();
+            if (xDoc.Root == null)
+            {
+                throw new ArgumentException("Data document does not have a root element.", nameof(data));
+            }
+            return Assemble(xDoc.Root, out templateError, out templateErrorSummary);
+        }
+
+        public WmlDocument Assemble(XElement data, out bool templateError) =>
+            Assemble(data, out templateError, out _);
+
+        public WmlDocument Assemble(XElement data, out bool templateError, out string? templateErrorSummary) =>
+            Assemble(data, (DocumentAssemblerOptions?)null, out templateError, out templateErrorSummary);
+
+        /// <summary>
+        /// Assembles a document with the given <paramref name="options"/>.
+        /// </summary>
+        public WmlDocument Assemble(XElement data, DocumentAssemblerOptions? options, out bool templateError, out string? templateErrorSummary)
+        {
+            var assembledDocument = DocumentAssembler.AssembleCompiled(this, data, options, out var templateErrorDetails);
+            templateError = templateErrorDetails.HasError;
+            templateErrorSummary = templateErrorDetails.GetErrorSummary();
+            return assembledDocument;
+        }
+
+        /// <summary>
+        /// Assembles a document and writes the package to <paramref name="output"/>; see
+        /// <see cref="DocumentAssembler.AssembleDocument(Stream, XElement, Stream, out bool, out string)"/>.
+        /// </summary>
+        public void Assemble(XElement data, Stream output, out bool templateError, out string? templateErrorSummary) =>
+            Assemble(data, output, null, out templateError, out templateErrorSummary);
+
+        /// <summary>
+        /// Assembles a document with the given <paramref name="options"/> and writes the package to <paramref name="output"/>.
+        /// </summary>
+        public void Assemble(XElement data, Stream output, DocumentAssemblerOptions? options, out bool templateError, out string? templateErrorSummary)
+        {
+            if (output == null)
+            {
+                throw new ArgumentNullException(nameof(output));
+            }
+
+            var templateErrorDetails = DocumentAssembler.AssembleCompiled(this, data, output, options);
+            templateError = templateErrorDetails.HasError;
+            templateErrorSummary = templateErrorDetails.GetErrorSummary();
+        }
+
+        /// <summary>
+        /// Assembles one document per data record, e.g. the letters of a mail merge.
+        /// </summary>
+        /// <param name="records">The data records; enumerated lazily, one record ahead of each free worker.</param>
+        /// <param name="maxDegreeOfParallelism">Records assembled concurrently; 0 or less uses <see cref="Environment.ProcessorCount"/>.</param>
+        /// <returns>The results in record order, yielded as soon as each one and all records before it are done.</returns>
+        /// <remarks>
+        /// At most <paramref name="maxDegreeOfParallelism"/> documents are in flight, so memory stays bounded however
+        /// many records there are. An exception thrown while assembling a record is rethrown when its result is reached.
+        /// When the enumeration ends early, the documents still in flight are canceled and awaited before it returns.
+        /// </remarks>
+        public IEnumerable<AssemblyResult> AssembleMany(IEnumerable<XElement> records, int maxDegreeOfParallelism = 0)
+        {
+            if (records == null)
+            {
+                throw new ArgumentNullException(nameof(records));
+            }
+
+            return AssembleManyIterator(records, GetDegreeOfParallelism(maxDegreeOfParallelism));
+        }
+
+        /// <summary>
+        /// Asynchronous variant of <see cref="AssembleMany"/> for record sources that are themselves asynchronous.
+        /// </summary>
+        public IAsyncEnumerable<AssemblyResult> AssembleManyAsync(IAsyncEnumerable<XElement> records, int maxDegreeOfParallelism = 0, CancellationToken cancellationToken = default)
+        {
+            if (records == null)
+            {
+                throw new ArgumentNullException(nameof(records));
+            }
+
+            return AssembleManyAsyncIterator(records, GetDegreeOfParallelism(maxDegreeOfParallelism), cancellationToken);
+        }
+
+        private static int GetDegreeOfParallelism(int maxDegreeOfParallelism) =>
+            maxDegreeOfParallelism > 0 ? maxDegreeOfParallelism : Environment.ProcessorCount;
+
+        private AssemblyResult AssembleRecord(int index, XElement record, CancellationToken cancellationToken = default)
+        {
+            var document = DocumentAssembler.AssembleCompiled(this, record, null, cancellationToken, out var templateErrorDetails);
+            return new AssemblyResult(index, document, templateErrorDetails.HasError, templateErrorDetails.GetErrorSummary());
+        }
+
+        private IEnumerable<AssemblyResult> AssembleManyIterator(IEnumerable<XElement> records, int degreeOfParallelism)
+        {
+            var index = 0;
+            if (degreeOfParallelism == 1)
+            {
+                foreach (var record in records)
+                {
+                    yield return AssembleRecord(index++, record);
+                }
+                yield break;
+            }
+
+            // Sliding window: the oldest record is yielded first, which keeps the output in input order
+            var inFlight = new Queue<Task<AssemblyResult>>(degreeOfParallelism);
+            using var cts = new CancellationTokenSource();
+            try
+            {
+                foreach (var record in records)
+                {
+                    if (inFlight.Count == degreeOfParallelism)
+                    {
+                        yield return inFlight.Dequeue().GetAwaiter().GetResult();
+                    }
+
+                    var recordIndex = index++;
+                    inFlight.Enqueue(Task.Run(() => AssembleRecord(recordIndex, record, cts.Token), cts.Token));
+                }
+
+                while (inFlight.Count > 0)
+                {
+                    yield return inFlight.Dequeue().GetAwaiter().GetResult();
+                }
+            }
+            finally
+            {
+                // The consumer stopped early or a record failed: no assembly may outlive the enumeration
+                if (inFlight.Count > 0)
+                {
+                    cts.Cancel();
+                    try
+                    {
+                        Task.WaitAll(inFlight.ToArray());
+                    }
+                    catch (AggregateException)
+                    {
+                        // nobody reads these results, so their failures and cancellations are dropped
+                    }
+                }
+            }
+        }
+
+        private async IAsyncEnumerable<AssemblyResult> AssembleManyAsyncIterator(IAsyncEnumerable<XElement> records, int degreeOfParallelism, [EnumeratorCancellation] CancellationToken cancellationToken)
+        {
+            var index = 0;
+            var inFlight = new Queue<Task<AssemblyResult>>(degreeOfParallelism);
+            using var cts = CancellationTokenSource.CreateLinkedTokenSource(cancellationToken);
+            try
+            {
+                await foreach (var record in records.WithCancellation(cancellationToken).ConfigureAwait(false))
+                {
+                    if (inFlight.Count == degreeOfParallelism)
+                    {
+                        yield return await inFlight.Dequeue().ConfigureAwait(false);
+                    }
+
+                    var recordIndex = index++;
+                    inFlight.Enqueue(Task.Run(() => AssembleRecord(recordIndex, record, cts.Token), cts.Token));
+                }
+
+                while (inFlight.Count > 0)
+                {
+                    yield return await inFlight.Dequeue().ConfigureAwait(false);
+                }
+            }
+            finally
+            {
+                // see AssembleManyIterator
+                if (inFlight.Count > 0)
+                {
+                    cts.Cancel();
+                    try
+                    {
+                        await Task.WhenAll(inFlight).ConfigureAwait(false);
+                    }
+                    catch (Exception)
+                    {
+                        // awaiting WhenAll observes the exception of every remaining task
+                    }
+                }
+            }
+        }
+    }
+}
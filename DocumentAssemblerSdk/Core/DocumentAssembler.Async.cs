@@ -0,0 +1,89 @@
+using System;
+using System.IO;
+using System.Threading;
+using System.Threading.Tasks;
+using System.Xml;
+using System.Xml.Linq;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// DocumentAssembler partial class - Asynchronous assembly over streams
+    /// </summary>
+    public partial class DocumentAssembler
+    {
+        /// <summary>
+        /// Assembles a document from a template stream and writes the package to <paramref name="output"/>. Reading the
+        /// template and writing the output are asynchronous; the assembly itself runs on the calling thread, against an
+        /// in-memory copy of the package.
+        /// </summary>
+        /// <param name="template">Readable template package; it is only read, from its current position.</param>
+        /// <param name="data">The data.</param>
+        /// <param name="output">Receives the assembled package once it is complete. Nothing is written when the assembly fails or is canceled.</param>
+        /// <param name="options">Optional assembly settings.</param>
+        /// <param name="cancellationToken">Checked while copying, between content parts and between the items of a Repeat or Table.</param>
+        /// <exception cref="OperationCanceledException"><paramref name="cancellationToken"/> was canceled.</exception>
+        /// <exception cref="OpenXmlPowerToolsException">The template contains tracked revisions.</exception>
+        public static async Task<AssemblyOutcome> AssembleDocumentAsync(Stream template, XElement data, Stream output, DocumentAssemblerOptions? options = null, CancellationToken cancellationToken = default)
+        {
+            if (template == null)
+            {
+                throw new ArgumentNullException(nameof(template));
+            }
+            if (data == null)
+            {
+                throw new ArgumentNullException(nameof(data));
+            }
+            if (output == null)
+            {
+                throw new ArgumentNullException(nameof(output));
+            }
+
+            using var work = await CopyToWorkStreamAsync(template, cancellationToken).ConfigureAwait(false);
+            var te = new TemplateError();
+            AssemblePackage(work, data, te, options, cancellationToken);
+
+            work.Position = 0;
+            await work.CopyToAsync(output, cancellationToken).ConfigureAwait(false);
+            return new AssemblyOutcome(te.HasError, te.GetErrorSummary());
+        }
+
+        /// <inheritdoc cref="AssembleDocumentAsync(Stream, XElement, Stream, DocumentAssemblerOptions?, CancellationToken)"/>
+        /// <param name="data">Stream holding the data XML; it is read asynchronously up to the end of the root element.</param>
+        public static async Task<AssemblyOutcome> AssembleDocumentAsync(Stream template, Stream data, Stream output, DocumentAssemblerOptions? options = null, CancellationToken cancellationToken = default)
+        {
+            if (data == null)
+            {
+                throw new ArgumentNullException(nameof(data));
+            }
+
+            var dataRoot = await XElement.LoadAsync(data, LoadOptions.None, cancellationToken).ConfigureAwait(false);
+            return await AssembleDocumentAsync(template, dataRoot, output, options, cancellationToken).ConfigureAwait(false);
+        }
+
+        /// <inheritdoc cref="AssembleDocumentAsync(Stream, XElement, Stream, DocumentAssemblerOptions?, CancellationToken)"/>
+        /// <param name="data">Reader positioned on (or before) the data root element. It must have been created with
+        /// <see cref="XmlReaderSettings.Async"/> set.</param>
+        public static async Task<AssemblyOutcome> AssembleDocumentAsync(Stream template, XmlReader data, Stream output, DocumentAssemblerOptions? options = null, CancellationToken cancellationToken = default)
+        {
+            if (data == null)
+            {
+                throw new ArgumentNullException(nameof(data));
+            }
+
+            var dataRoot = await XElement.LoadAsync(data, LoadOptions.None, cancellationToken).ConfigureAwait(false);
+            return await AssembleDocumentAsync(template, dataRoot, output, options, cancellationToken).ConfigureAwait(false);
+        }
+
+        // The asynchronous counterpart of the working stream of WritePackage; the output is always written from it at the end.
+        private static async Task<MemoryStream> CopyToWorkStreamAsync(Stream template, CancellationToken cancellationToken)
+        {
+            var work = template.CanSeek
+                ? new MemoryStream(checked((int)(template.Length - template.Position)))
+                : new MemoryStream();
+            await template.CopyToAsync(work, cancellationToken).ConfigureAwait(false);
+            work.Position = 0;
+            return work;
+        }
+    }
+}
@@ -0,0 +1,189 @@
+using DocumentFormat.OpenXml.Packaging;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Threading;
+using System.Xml.Linq;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// DocumentAssembler partial class - Template compilation functionality
+    /// </summary>
+    public partial class DocumentAssembler
+    {
+        /// <summary>
+        /// Normalizes a template once so that it can be assembled with many data sets.
+        /// </summary>
+        /// <param name="templateDoc">The template document.</param>
+        /// <returns>A compiled template whose <see cref="CompiledTemplate.Assemble(XElement, out bool)"/> only binds data.</returns>
+        /// <exception cref="OpenXmlPowerToolsException">The template contains tracked revisions.</exception>
+        public static CompiledTemplate CompileTemplate(WmlDocument templateDoc)
+        {
+            if (templateDoc == null)
+            {
+                throw new ArgumentNullException(nameof(templateDoc));
+            }
+
+            var byteArray = templateDoc.DocumentByteArray;
+            var te = new TemplateError();
+            var parts = new List<CompiledPart>();
+            using (var mem = new MemoryStream(byteArray, false))
+            using (var wordDoc = WordprocessingDocument.Open(mem, false))
+            {
+                // parts without markup are not compiled and stay untouched in every assembled document
+                foreach (var part in LoadTemplateParts(wordDoc))
+                {
+                    // LoadTemplateParts has already parsed the part, GetXDocument returns the cached tree
+                    var xDoc = part.GetXDocument();
+                    if (xDoc.Root == null)
+                    {
+                        continue;
+                    }
+
+                    var maxDocPrId = xDoc.Descendants(WP.docPr)
+                        .Select(dp => (int?)dp.Attribute("id") ?? 0)
+                        .DefaultIfEmpty(0)
+                        .Max();
+                    var compiledRoot = CompileTemplatePart(xDoc.Root, te);
+                    var compiledDoc = new XDocument(
+                        xDoc.Declaration != null ? new XDeclaration(xDoc.Declaration) : null,
+                        xDoc.Nodes().Select(n => n == xDoc.Root ? compiledRoot : n));
+                    parts.Add(new CompiledPart(part.Uri, compiledDoc, maxDocPrId));
+                }
+            }
+
+            return new CompiledTemplate(byteArray, parts, te);
+        }
+
+        /// <summary>
+        /// Assembles one document per data record against a single template, compiling the template once.
+        /// </summary>
+        /// <seealso cref="CompiledTemplate.AssembleMany"/>
+        public static IEnumerable<AssemblyResult> AssembleMany(WmlDocument templateDoc, IEnumerable<XElement> records, int maxDegreeOfParallelism = 0) =>
+            CompileTemplate(templateDoc).AssembleMany(records, maxDegreeOfParallelism);
+
+        /// <summary>
+        /// Asynchronous variant of <see cref="AssembleMany(WmlDocument, IEnumerable{XElement}, int)"/>.
+        /// </summary>
+        /// <seealso cref="CompiledTemplate.AssembleManyAsync"/>
+        public static IAsyncEnumerable<AssemblyResult> AssembleManyAsync(WmlDocument templateDoc, IAsyncEnumerable<XElement> records, int maxDegreeOfParallelism = 0, CancellationToken cancellationToken = default) =>
+            CompileTemplate(templateDoc).AssembleManyAsync(records, maxDegreeOfParallelism, cancellationToken);
+
+        internal static WmlDocument AssembleCompiled(CompiledTemplate template, XElement data, DocumentAssemblerOptions? options, out TemplateError templateErrorDetails) =>
+            AssembleCompiled(template, data, options, default, out templateErrorDetails);
+
+        internal static WmlDocument AssembleCompiled(CompiledTemplate template, XElement data, DocumentAssemblerOptions? options, CancellationToken cancellationToken,
+            out TemplateError templateErrorDetails)
+        {
+            var byteArray = template.TemplateBytes;
+            // sized for the template up front, the stream usually never has to grow while the package is rewritten
+            using var mem = new MemoryStream(byteArray.Length);
+            mem.Write(byteArray, 0, byteArray.Length);
+            templateErrorDetails = AssembleCompiledPackage(template, mem, data, options, cancellationToken);
+            return new WmlDocument("TempFileName.docx", mem.ToArray());
+        }
+
+        internal static TemplateError AssembleCompiled(CompiledTemplate template, XElement data, Stream output, DocumentAssemblerOptions? options)
+        {
+            TemplateError? te = null;
+            using (var source = new MemoryStream(template.TemplateBytes, false))
+            {
+                WritePackage(source, output, work => te = AssembleCompiledPackage(template, work, data, options));
+            }
+            return te!;
+        }
+
+        private static TemplateError AssembleCompiledPackage(CompiledTemplate template, Stream package, XElement data, DocumentAssemblerOptions? options,
+            CancellationToken cancellationToken = default)
+        {
+            var te = template.CompileErrors.Clone();
+            var diagnostics = AssemblyDiagnosticsRecorder.Start(options);
+            using (var wordDoc = WordprocessingDocument.Open(package, true))
+            {
+                var parts = new List<(OpenXmlPart Part, CompiledPart Compiled)>();
+                foreach (var part in wordDoc.ContentParts())
+                {
+                    if (part != null && template.Parts.TryGetValue(part.Uri, out var compiledPart))
+                    {
+                        // docPr ids were collected at compile time, so the original part never needs to be parsed
+                        part.AddAnnotation(new ImageIdTracker { NextId = compiledPart.MaxDocPrId + 1 });
+                        parts.Add((part, compiledPart));
+                    }
+                }
+
+                var recorders = parts.Select(p => diagnostics?.ForPart(p.Part.Uri)).ToArray();
+                for (var i = 0; i < parts.Count; i++)
+                {
+                    // the compiled tree still holds the template tags
+                    recorders[i]?.CountTags(parts[i].Compiled.Document.Root!);
+                }
+
+                var parallel = options?.ProcessPartsInParallel == true;
+                var evaluationContext = new XPathEvaluationContext(concurrent: parallel, cancellationToken);
+                if (parallel)
+                {
+                    var results = TransformPartsInParallel(parts.Count, options!, evaluationContext.CancellationToken, (i, partErrors) =>
+                        TransformCompiledPart(parts[i].Compiled, data, partErrors, parts[i].Part, evaluationContext, recorders[i]));
+                    for (var i = 0; i < parts.Count; i++)
+                    {
+                        te.MergeFrom(results[i].Errors);
+                        PutCompiledPart(parts[i].Part, parts[i].Compiled, results[i].Root, recorders[i]);
+                    }
+                }
+                else
+                {
+                    for (var i = 0; i < parts.Count; i++)
+                    {
+                        cancellationToken.ThrowIfCancellationRequested();
+                        var (part, compiledPart) = parts[i];
+                        var newRoot = TransformCompiledPart(compiledPart, data, te, part, evaluationContext, recorders[i]);
+                        PutCompiledPart(part, compiledPart, newRoot, recorders[i]);
+                    }
+                }
+                diagnostics?.SetXPathCacheCounts(evaluationContext.Hits, evaluationContext.Misses);
+            }
+            diagnostics?.Report();
+            return te;
+        }
+
+        private static XElement? TransformCompiledPart(CompiledPart compiledPart, XElement data, TemplateError te, OpenXmlPart part,
+            XPathEvaluationContext evaluationContext, PartDiagnosticsRecorder? diagnostics)
+        {
+            diagnostics?.StartPhase();
+            var newRoot = ContentReplacementTransform(compiledPart.Document.Root!, data, te, part, evaluationContext) as XElement;
+            diagnostics?.EndPhase(nameof(ContentReplacementTransform));
+            return newRoot;
+        }
+
+        private static void PutCompiledPart(OpenXmlPart part, CompiledPart compiledPart, XElement? newRoot, PartDiagnosticsRecorder? diagnostics)
+        {
+            diagnostics?.StartPhase();
+            var compiledDoc = compiledPart.Document;
+            var newDoc = new XDocument(
+                compiledDoc.Declaration != null ? new XDeclaration(compiledDoc.Declaration) : null,
+                compiledDoc.Nodes().Select(n => n == compiledDoc.Root ? newRoot : n));
+            part.PutXDocument(newDoc);
+            diagnostics?.EndPhase(nameof(PtOpenXmlExtensions.PutXDocument));
+        }
+
+        /// <summary>
+        /// A content part after <see cref="CompileTemplatePart"/>. The document is shared by every assembly
+        /// of the template and must only be read.
+        /// </summary>
+        internal sealed class CompiledPart
+        {
+            public Uri Uri { get; }
+            public XDocument Document { get; }
+            public int MaxDocPrId { get; }
+
+            public CompiledPart(Uri uri, XDocument document, int maxDocPrId)
+            {
+                Uri = uri;
+                Document = document;
+                MaxDocPrId = maxDocPrId;
+            }
+        }
+    }
+}
@@ -2,8 +2,11 @@ using DocumentFormat.OpenXml.Packaging;
 using DocumentFormat.OpenXml.Wordprocessing;
 using SkiaSharp;
 using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
 using System.Globalization;
 using System.IO;
+using System.Security.Cryptography;
 using System.Xml.Linq;
 
 namespace DocumentAssembler.Core
@@ -26,6 +29,48 @@ namespace DocumentAssembler.Core
             };
         }
 
+        // Identical images (by SHA-256 of the decoded bytes) are stored once per package: the first occurrence adds an
+        // ImagePart, later ones in any content part reference it through a relationship of their own part. A logo in
+        // every row of a Repeat therefore ends up as a single image in the output.
+        private static string GetOrAddImageRelationship(OpenXmlPart owningPart, byte[] imageBytes, string imageHash)
+        {
+            var package = owningPart.OpenXmlPackage;
+            var embeddedImages = package.Annotation<EmbeddedImageParts>();
+            if (embeddedImages == null)
+            {
+                embeddedImages = new EmbeddedImageParts();
+                package.AddAnnotation(embeddedImages);
+            }
+
+            if (embeddedImages.Parts.TryGetValue(imageHash, out var imagePart))
+            {
+                foreach (var idPart in owningPart.Parts)
+                {
+                    if (idPart.OpenXmlPart == imagePart)
+                    {
+                        return idPart.RelationshipId;
+                    }
+                }
+
+                return owningPart.CreateRelationshipToPart(imagePart);
+            }
+
+            imagePart = AddImagePart(owningPart);
+            using (var stream = new MemoryStream(imageBytes))
+            {
+                imagePart.FeedData(stream);
+            }
+            embeddedImages.Parts.Add(imageHash, imagePart);
+            return owningPart.GetIdOfPart(imagePart);
+        }
+
+        private sealed class EmbeddedImageParts
+        {
+            public Dictionary<string, ImagePart> Parts { get; } = new Dictionary<string, ImagePart>(StringComparer.Ordinal);
+        }
+
+        private static string GetImageHash(byte[] imageBytes) => Convert.ToHexString(SHA256.HashData(imageBytes));
+
         private static XElement CreateImageElement(string relationshipId, int docPrId, double widthEmu, double heightEmu, JustificationValues? justification)
         {
             var widthAttribute = widthEmu.ToString("0", CultureInfo.InvariantCulture);
@@ -230,7 +275,8 @@ namespace DocumentAssembler.Core
         }
 
         private static bool TryCalculateImageDimensions(
-            byte[] imageBytes,
+            int pixelWidth,
+            int pixelHeight,
             string? widthAttr,
             string? heightAttr,
             string? maxWidthAttr,
@@ -243,11 +289,6 @@ namespace DocumentAssembler.Core
             heightEmu = 0;
             errorMessage = string.Empty;
 
-            if (!TryGetPixelSize(imageBytes, out var pixelWidth, out var pixelHeight, out errorMessage))
-            {
-                return false;
-            }
-
             var actualWidthEmu = pixelWidth * EmusPerPixel;
             var actualHeightEmu = pixelHeight * EmusPerPixel;
 
@@ -313,6 +354,35 @@ namespace DocumentAssembler.Core
             return true;
         }
 
+        // Decoded sizes by image hash, shared by all assemblies so that an image used in every document is decoded
+        // once. Bounded by starting over when full; the entries are cheap to recompute.
+        private const int MaxCachedImageSizes = 1024;
+        private static readonly ConcurrentDictionary<string, (int Width, int Height)> s_ImageSizeCache =
+            new ConcurrentDictionary<string, (int Width, int Height)>(StringComparer.Ordinal);
+
+        private static bool TryGetPixelSize(byte[] imageBytes, string imageHash, out int width, out int height, out string errorMessage)
+        {
+            if (s_ImageSizeCache.TryGetValue(imageHash, out var size))
+            {
+                width = size.Width;
+                height = size.Height;
+                errorMessage = string.Empty;
+                return true;
+            }
+
+            if (!TryGetPixelSize(imageBytes, out width, out height, out errorMessage))
+            {
+                return false;
+            }
+
+            if (s_ImageSizeCache.Count >= MaxCachedImageSizes)
+            {
+                s_ImageSizeCache.Clear();
+            }
+            s_ImageSizeCache[imageHash] = (width, height);
+            return true;
+        }
+
         private static bool TryGetPixelSize(byte[] imageBytes, out int width, out int height, out string errorMessage)
         {
             width = 0;
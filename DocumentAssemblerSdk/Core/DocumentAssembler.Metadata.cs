@@ -1,11 +1,10 @@
 using System;
 using System.Collections.Generic;
-using System.IO;
+using System.Globalization;
 using System.Linq;
 using System.Text.RegularExpressions;
 using System.Xml;
 using System.Xml.Linq;
-using System.Xml.Schema;
 
 namespace DocumentAssembler.Core
 {
@@ -26,7 +25,7 @@ namespace DocumentAssembler.Core
             "Signature",
         };
 
-        private static object TransformToMetadata(XNode node, XElement data, TemplateError te)
+        private static object TransformToMetadata(XNode node, TemplateError te)
         {
             if (node is XElement element)
             {
@@ -75,11 +74,11 @@ namespace DocumentAssembler.Core
                         }
                         return new XElement(element.Name,
                             element.Attributes(),
-                            element.Nodes().Select(n => TransformToMetadata(n, data, te)));
+                            element.Nodes().Select(n => TransformToMetadata(n, te)));
                     }
                     return new XElement(element.Name,
                         element.Attributes(),
-                        element.Nodes().Select(n => TransformToMetadata(n, data, te)));
+                        element.Nodes().Select(n => TransformToMetadata(n, te)));
                 }
                 if (element.Name == W.p)
                 {
@@ -184,7 +183,7 @@ namespace DocumentAssembler.Core
 
                 return new XElement(element.Name,
                     element.Attributes(),
-                    element.Nodes().Select(n => TransformToMetadata(n, data, te)));
+                    element.Nodes().Select(n => TransformToMetadata(n, te)));
             }
             return node;
         }
@@ -218,174 +217,200 @@ namespace DocumentAssembler.Core
 
         private static string? ValidatePerSchema(XElement element)
         {
-            if (s_PASchemaSets == null)
+            if (!s_TagContracts.TryGetValue(element.Name, out var contract))
             {
-                var schemaSets = new Dictionary<XName, PASchemaSet>()
+                return string.Format("Invalid XML: {0} is not a valid element", element.Name.LocalName);
+            }
+
+            return contract.Validate(element);
+        }
+
+        // The attribute contract of every tag. Messages are worded exactly as XmlSchema validation of the equivalent
+        // XSD (an empty complexType with unqualified attributes; tags without attributes are declared with no type)
+        // used to word them, so existing templates report the same errors.
+        private static readonly Dictionary<XName, TagContract> s_TagContracts = new Dictionary<XName, TagContract>()
+        {
+            {
+                PA.Content,
+                new TagContract(
+                    new TagAttribute("Select", TagAttributeType.String, true),
+                    new TagAttribute("Optional", TagAttributeType.Boolean))
+            },
+            {
+                PA.Image,
+                new TagContract(
+                    new TagAttribute("Select", TagAttributeType.String, true),
+                    new TagAttribute("Optional", TagAttributeType.Boolean),
+                    new TagAttribute("Align", TagAttributeType.String),
+                    new TagAttribute("Width", TagAttributeType.String),
+                    new TagAttribute("Height", TagAttributeType.String),
+                    new TagAttribute("MaxWidth", TagAttributeType.String),
+                    new TagAttribute("MaxHeight", TagAttributeType.String))
+            },
+            {
+                PA.Table,
+                new TagContract(
+                    new TagAttribute("Select", TagAttributeType.String, true))
+            },
+            {
+                PA.Repeat,
+                new TagContract(
+                    new TagAttribute("Select", TagAttributeType.String, true),
+                    new TagAttribute("Optional", TagAttributeType.Boolean))
+            },
+            { PA.EndRepeat, TagContract.Unrestricted },
+            {
+                PA.Conditional,
+                new TagContract(
+                    new TagAttribute("Select", TagAttributeType.String, true),
+                    new TagAttribute("Match", TagAttributeType.String),
+                    new TagAttribute("NotMatch", TagAttributeType.String))
+            },
+            { PA.Else, TagContract.Unrestricted },
+            { PA.EndConditional, TagContract.Unrestricted },
+            {
+                PA.Signature,
+                new TagContract(
+                    new TagAttribute("Id", TagAttributeType.String, true),
+                    new TagAttribute("Label", TagAttributeType.String),
+                    new TagAttribute("Width", TagAttributeType.String),
+                    new TagAttribute("Height", TagAttributeType.String),
+                    new TagAttribute("PageHint", TagAttributeType.Int),
+                    new TagAttribute("Optional", TagAttributeType.Boolean))
+            },
+        };
+
+        private enum TagAttributeType
+        {
+            String,
+            Boolean,
+            Int,
+        }
+
+        private sealed class TagAttribute
+        {
+            public XName Name { get; }
+            public TagAttributeType Type { get; }
+            public bool Required { get; }
+
+            public TagAttribute(string name, TagAttributeType type, bool required = false)
+            {
+                Name = name;
+                Type = type;
+                Required = required;
+            }
+        }
+
+        private sealed class TagContract
+        {
+            private static readonly XNamespace s_Xsi = "http://www.w3.org/2001/XMLSchema-instance";
+
+            // A tag declared without a type (EndRepeat, Else, EndConditional) accepts any attributes and content.
+            public static readonly TagContract Unrestricted = new TagContract(null);
+
+            private readonly Dictionary<XName, TagAttribute>? _attributes;
+            private readonly TagAttribute[] _required;
+
+            public TagContract(params TagAttribute[]? attributes)
+            {
+                _attributes = attributes?.ToDictionary(a => a.Name);
+                _required = attributes?.Where(a => a.Required).ToArray() ?? Array.Empty<TagAttribute>();
+            }
+
+            // Returns the first violation in the order a schema validator finds them: attributes in document order,
+            // then missing required attributes, then content.
+            public string? Validate(XElement element)
+            {
+                if (_attributes == null)
                 {
+                    return null;
+                }
+
+                foreach (var attribute in element.Attributes())
+                {
+                    // schema validation accepted the instance (xsi) and xml attributes on every tag
+                    if (attribute.IsNamespaceDeclaration || attribute.Name.Namespace == s_Xsi || attribute.Name.Namespace == XNamespace.Xml)
                     {
-                        PA.Content,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='Content'>
-                                    <xs:complexType>
-                                      <xs:attribute name='Select' type='xs:string' use='required' />
-                                      <xs:attribute name='Optional' type='xs:boolean' use='optional' />
-                                    </xs:complexType>
-                                  </xs:element>
-                                </xs:schema>",
-                        }
-                    },
-                    {
-                        PA.Image,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='Image'>
-                                    <xs:complexType>
-                                      <xs:attribute name='Select' type='xs:string' use='required' />
-                                      <xs:attribute name='Optional' type='xs:boolean' use='optional' />
-                                      <xs:attribute name='Align' type='xs:string' use='optional' />
-                                      <xs:attribute name='Width' type='xs:string' use='optional' />
-                                      <xs:attribute name='Height' type='xs:string' use='optional' />
-                                      <xs:attribute name='MaxWidth' type='xs:string' use='optional' />
-                                      <xs:attribute name='MaxHeight' type='xs:string' use='optional' />
-                                    </xs:complexType>
-                                  </xs:element>
-                                </xs:schema>",
-                        }
-                    },
-                    {
-                        PA.Table,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='Table'>
-                                    <xs:complexType>
-                                      <xs:attribute name='Select' type='xs:string' use='required' />
-                                    </xs:complexType>
-                                  </xs:element>
-                                </xs:schema>",
-                        }
-                    },
-                    {
-                        PA.Repeat,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='Repeat'>
-                                    <xs:complexType>
-                                      <xs:attribute name='Select' type='xs:string' use='required' />
-                                      <xs:attribute name='Optional' type='xs:boolean' use='optional' />
-                                    </xs:complexType>
-                                  </xs:element>
-                                </xs:schema>",
-                        }
-                    },
+                        continue;
+                    }
+                    if (!_attributes.TryGetValue(attribute.Name, out var declared))
                     {
-                        PA.EndRepeat,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='EndRepeat' />
-                                </xs:schema>",
-                        }
-                    },
+                        return string.Format("The '{0}' attribute is not declared.", QualifiedName(attribute.Name));
+                    }
+
+                    var valueError = ValidateValue(declared, attribute.Value);
+                    if (valueError != null)
                     {
-                        PA.Conditional,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='Conditional'>
-                                    <xs:complexType>
-                                      <xs:attribute name='Select' type='xs:string' use='required' />
-                                      <xs:attribute name='Match' type='xs:string' use='optional' />
-                                      <xs:attribute name='NotMatch' type='xs:string' use='optional' />
-                                    </xs:complexType>
-                                  </xs:element>
-                                </xs:schema>",
-                        }
-                    },
+                        return valueError;
+                    }
+                }
+
+                foreach (var required in _required)
+                {
+                    if (element.Attribute(required.Name) == null)
                     {
-                        PA.Else,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='Else' />
-                                </xs:schema>",
-                        }
-                    },
+                        return string.Format("The required attribute '{0}' is missing.", required.Name.LocalName);
+                    }
+                }
+
+                foreach (var node in element.Nodes())
+                {
+                    if (node is XElement child)
                     {
-                        PA.EndConditional,
-                        new PASchemaSet() {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='EndConditional' />
-                                </xs:schema>",
-                        }
-                    },
+                        return string.Format("The element '{0}' cannot contain child element '{1}' because the parent element's content model is empty.",
+                            QualifiedName(element.Name), QualifiedName(child.Name));
+                    }
+                    if (node is XText text && (text is XCData || CollapseWhitespace(text.Value).Length != 0))
                     {
-                        PA.Signature,
-                        new PASchemaSet()
-                        {
-                            XsdMarkup =
-                              @"<xs:schema attributeFormDefault='unqualified' elementFormDefault='qualified' xmlns:xs='http://www.w3.org/2001/XMLSchema'>
-                                  <xs:element name='Signature'>
-                                    <xs:complexType>
-                                      <xs:attribute name='Id' type='xs:string' use='required' />
-                                      <xs:attribute name='Label' type='xs:string' use='optional' />
-                                      <xs:attribute name='Width' type='xs:string' use='optional' />
-                                      <xs:attribute name='Height' type='xs:string' use='optional' />
-                                      <xs:attribute name='PageHint' type='xs:int' use='optional' />
-                                      <xs:attribute name='Optional' type='xs:boolean' use='optional' />
-                                    </xs:complexType>
-                                  </xs:element>
-                                </xs:schema>",
-                        }
-                    },
-                };
-                foreach (var item in schemaSets)
-                {
-                    var itemPAss = item.Value;
-                    var schemas = new XmlSchemaSet();
-                    schemas.Add("", XmlReader.Create(new StringReader(itemPAss.XsdMarkup)));
-                    itemPAss.SchemaSet = schemas;
+                        return "The element cannot contain text. Content model is empty.";
+                    }
                 }
-                s_PASchemaSets = schemaSets;
-            }
-            if (!s_PASchemaSets.ContainsKey(element.Name))
-            {
-                return string.Format("Invalid XML: {0} is not a valid element", element.Name.LocalName);
-            }
-            var paSchemaSet = s_PASchemaSets[element.Name];
-            if (paSchemaSet.SchemaSet == null)
-            {
-                return "Internal error: Schema set not initialized";
+
+                return null;
             }
 
-            var d = new XDocument(element);
-            string? message = null;
-            d.Validate(paSchemaSet.SchemaSet, (sender, e) =>
+            private static string? ValidateValue(TagAttribute declared, string value)
             {
-                if (message == null)
+                string typeName;
+                string clrTypeName;
+                var collapsed = CollapseWhitespace(value);
+                switch (declared.Type)
                 {
-                    message = e.Message;
+                    case TagAttributeType.Boolean:
+                        if (collapsed == "true" || collapsed == "false" || collapsed == "1" || collapsed == "0")
+                        {
+                            return null;
+                        }
+                        typeName = "boolean";
+                        clrTypeName = "Boolean";
+                        break;
+                    case TagAttributeType.Int:
+                        if (int.TryParse(collapsed, NumberStyles.AllowLeadingSign, CultureInfo.InvariantCulture, out _))
+                        {
+                            return null;
+                        }
+                        typeName = "int";
+                        clrTypeName = "Int32";
+                        break;
+                    default:
+                        return null;
                 }
-            }, true);
-            if (message != null)
-            {
-                return message;
+
+                return string.Format("The '{0}' attribute is invalid - The value '{1}' is invalid according to its datatype 'http://www.w3.org/2001/XMLSchema:{2}' - The string '{3}' is not a valid {4} value.",
+                    QualifiedName(declared.Name), value, typeName, collapsed, clrTypeName);
             }
 
-            return null;
-        }
+            private static string QualifiedName(XName name) =>
+                name.NamespaceName.Length == 0 ? name.LocalName : name.NamespaceName + ":" + name.LocalName;
 
-        private static Dictionary<XName, PASchemaSet>? s_PASchemaSets;
+            // xs:boolean and xs:int collapse whitespace before parsing
+            private static string CollapseWhitespace(string value)
+            {
+                var parts = value.Split(s_XmlWhitespace, StringSplitOptions.RemoveEmptyEntries);
+                return parts.Length == 1 ? parts[0] : string.Join(" ", parts);
+            }
 
-        private class PASchemaSet
-        {
-            public string XsdMarkup = string.Empty;
-            public XmlSchemaSet? SchemaSet;
+            private static readonly char[] s_XmlWhitespace = { ' ', '\t', '\n', '\r' };
         }
     }
 }
@@ -0,0 +1,88 @@
+using DocumentFormat.OpenXml.Packaging;
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Runtime.ExceptionServices;
+using System.Threading;
+using System.Threading.Tasks;
+using System.Xml.Linq;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// DocumentAssembler partial class - Parallel processing of content parts
+    /// </summary>
+    public partial class DocumentAssembler
+    {
+        // Parts are independent apart from the package, the XPath cache and the error list. The package is only read
+        // and written on the calling thread (image parts are added under XPathEvaluationContext.PackageSync), the cache
+        // is a concurrent one, and each part collects its own errors, which are merged in part order afterwards so
+        // that the error summary reads as it does when the parts are processed one after the other. (An erroneous
+        // select shared by several parts is reported once, by whichever part evaluated it first.)
+        private static void ProcessTemplatePartsInParallel(IReadOnlyList<OpenXmlPart> parts, XElement data, TemplateError te, DocumentAssemblerOptions options,
+            XPathEvaluationContext evaluationContext, PartDiagnosticsRecorder?[] diagnostics)
+        {
+            var documents = parts.Select(part => part.GetXDocument()).ToArray();
+            var results = TransformPartsInParallel(parts.Count, options, evaluationContext.CancellationToken, (i, partErrors) =>
+            {
+                var root = documents[i].Root;
+                if (root == null)
+                {
+                    return null;
+                }
+
+                var metadata = CompileTemplatePart(root, partErrors, diagnostics[i]);
+                diagnostics[i]?.StartPhase();
+                var newRoot = ContentReplacementTransform(metadata, data, partErrors, parts[i], evaluationContext) as XElement;
+                diagnostics[i]?.EndPhase(nameof(ContentReplacementTransform));
+                return newRoot;
+            });
+
+            for (var i = 0; i < parts.Count; i++)
+            {
+                te.MergeFrom(results[i].Errors);
+                if (documents[i].Root == null)
+                {
+                    continue;
+                }
+
+                documents[i].Elements().First().ReplaceWith(results[i].Root);
+                diagnostics[i]?.StartPhase();
+                parts[i].PutXDocument();
+                diagnostics[i]?.EndPhase(nameof(PtOpenXmlExtensions.PutXDocument));
+            }
+        }
+
+        private static (XElement? Root, TemplateError Errors)[] TransformPartsInParallel(int count, DocumentAssemblerOptions options, CancellationToken cancellationToken,
+            Func<int, TemplateError, XElement?> transform)
+        {
+            var results = new (XElement? Root, TemplateError Errors)[count];
+            var parallelOptions = new ParallelOptions
+            {
+                MaxDegreeOfParallelism = options.MaxDegreeOfParallelism > 0 ? options.MaxDegreeOfParallelism : -1,
+                CancellationToken = cancellationToken,
+            };
+            try
+            {
+                Parallel.For(0, count, parallelOptions, i =>
+                {
+                    var partErrors = new TemplateError();
+                    results[i] = (transform(i, partErrors), partErrors);
+                });
+            }
+            catch (AggregateException e) when (e.InnerExceptions.Count == 1)
+            {
+                // surface the same exception as the sequential path
+                ExceptionDispatchInfo.Capture(e.InnerExceptions[0]).Throw();
+                throw;
+            }
+            catch (AggregateException e) when (cancellationToken.IsCancellationRequested && e.InnerExceptions.All(inner => inner is OperationCanceledException))
+            {
+                // several parts noticed the cancellation at once
+                cancellationToken.ThrowIfCancellationRequested();
+                throw;
+            }
+            return results;
+        }
+    }
+}
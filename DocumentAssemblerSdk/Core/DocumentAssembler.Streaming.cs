@@ -0,0 +1,393 @@
+using DocumentFormat.OpenXml.Packaging;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text;
+using System.Threading;
+using System.Threading.Tasks;
+using System.Xml;
+using System.Xml.Linq;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// DocumentAssembler partial class - Streamed data binding of one large collection
+    /// </summary>
+    public partial class DocumentAssembler
+    {
+        /// <summary>
+        /// Assembles a document in which one top-level Repeat or Table of the main document is bound to a streamed
+        /// collection. The main document part is written while the items are pulled, one generated row (or block of
+        /// Repeat content) at a time, so neither the items nor the generated markup are ever held as a whole.
+        /// </summary>
+        /// <param name="template">Readable template package; it is only read, from its current position.</param>
+        /// <param name="data">The rest of the data, used by every other tag, including the footer rows of a streamed Table.</param>
+        /// <param name="collection">The items of the Repeat or Table whose Select is <see cref="StreamedCollection.Select"/>.</param>
+        /// <param name="output">Receives the assembled package.</param>
+        /// <exception cref="ArgumentException">The main document has no top-level Repeat or Table with that Select,
+        /// or the collection only has asynchronous items.</exception>
+        /// <exception cref="OpenXmlPowerToolsException">The template contains tracked revisions.</exception>
+        public static AssemblyOutcome AssembleDocument(Stream template, XElement data, StreamedCollection collection, Stream output)
+        {
+            CheckStreamedArguments(template, data, collection, output);
+            if (collection.Items == null)
+            {
+                throw new ArgumentException("The collection has asynchronous items; use AssembleDocumentAsync.", nameof(collection));
+            }
+
+            var te = new TemplateError();
+            WritePackage(template, output, work =>
+            {
+                using var wordDoc = WordprocessingDocument.Open(work, true);
+                var templateParts = LoadTemplateParts(wordDoc);
+                var evaluationContext = new XPathEvaluationContext();
+                using (var writer = StreamedCollectionWriter.Begin(wordDoc.MainDocumentPart, data, collection.Select, te, evaluationContext))
+                {
+                    if (writer.AcceptsItems)
+                    {
+                        foreach (var item in collection.Items)
+                        {
+                            writer.WriteItem(item);
+                        }
+                    }
+                    writer.Complete();
+                }
+                ProcessOtherTemplateParts(templateParts, wordDoc.MainDocumentPart, data, te, evaluationContext);
+            });
+            return new AssemblyOutcome(te.HasError, te.GetErrorSummary());
+        }
+
+        /// <inheritdoc cref="AssembleDocument(Stream, XElement, StreamedCollection, Stream)"/>
+        /// <param name="cancellationToken">Checked while copying, between items and between content parts.</param>
+        /// <exception cref="OperationCanceledException"><paramref name="cancellationToken"/> was canceled.</exception>
+        public static async Task<AssemblyOutcome> AssembleDocumentAsync(Stream template, XElement data, StreamedCollection collection, Stream output, CancellationToken cancellationToken = default)
+        {
+            CheckStreamedArguments(template, data, collection, output);
+
+            using var work = await CopyToWorkStreamAsync(template, cancellationToken).ConfigureAwait(false);
+            var te = new TemplateError();
+            using (var wordDoc = WordprocessingDocument.Open(work, true))
+            {
+                var templateParts = LoadTemplateParts(wordDoc);
+                var evaluationContext = new XPathEvaluationContext(cancellationToken: cancellationToken);
+                using (var writer = StreamedCollectionWriter.Begin(wordDoc.MainDocumentPart, data, collection.Select, te, evaluationContext))
+                {
+                    if (writer.AcceptsItems && collection.AsyncItems != null)
+                    {
+                        await foreach (var item in collection.AsyncItems.WithCancellation(cancellationToken).ConfigureAwait(false))
+                        {
+                            writer.WriteItem(item);
+                        }
+                    }
+                    else if (writer.AcceptsItems)
+                    {
+                        foreach (var item in collection.Items!)
+                        {
+                            writer.WriteItem(item);
+                        }
+                    }
+                    writer.Complete();
+                }
+                ProcessOtherTemplateParts(templateParts, wordDoc.MainDocumentPart, data, te, evaluationContext);
+            }
+
+            work.Position = 0;
+            await work.CopyToAsync(output, cancellationToken).ConfigureAwait(false);
+            return new AssemblyOutcome(te.HasError, te.GetErrorSummary());
+        }
+
+        private static void CheckStreamedArguments(Stream template, XElement data, StreamedCollection collection, Stream output)
+        {
+            if (template == null)
+            {
+                throw new ArgumentNullException(nameof(template));
+            }
+            if (data == null)
+            {
+                throw new ArgumentNullException(nameof(data));
+            }
+            if (collection == null)
+            {
+                throw new ArgumentNullException(nameof(collection));
+            }
+            if (output == null)
+            {
+                throw new ArgumentNullException(nameof(output));
+            }
+        }
+
+        private static void ProcessOtherTemplateParts(List<OpenXmlPart> templateParts, OpenXmlPart? mainPart, XElement data, TemplateError te, XPathEvaluationContext evaluationContext)
+        {
+            foreach (var part in templateParts.Where(p => p != mainPart))
+            {
+                evaluationContext.CancellationToken.ThrowIfCancellationRequested();
+                ProcessTemplatePart(data, te, part, evaluationContext, null);
+            }
+        }
+
+        // Writes the main document part with an XmlWriter. Everything around the streamed Repeat or Table is transformed
+        // as usual and written before and after the items; each item is bound with its own evaluation context, so the
+        // XPath caches do not grow with the number of items, and its markup is written and dropped at once.
+        private sealed class StreamedCollectionWriter : IDisposable
+        {
+            // stands in for the streamed tag while the rest of the part is transformed; never written
+            private static readonly XName s_CollectionMarker = "StreamedCollection";
+
+            private readonly OpenXmlPart _part;
+            private readonly XDocument _partDocument;
+            private readonly XElement _tag;
+            private readonly TableLayout? _layout;
+            private readonly CompiledTableRow? _compiledRow;
+            private readonly object? _layoutError;
+            private readonly List<XElement> _pathToMarker;
+            private readonly TemplateError _te;
+            private readonly XPathEvaluationContext _evaluationContext;
+            private readonly Stream _partStream;
+            private readonly XmlWriter _writer;
+            private bool _hasItems;
+
+            private StreamedCollectionWriter(OpenXmlPart part, XDocument partDocument, XElement tag, TableLayout? layout, object? layoutError,
+                List<XElement> pathToMarker, TemplateError te, XPathEvaluationContext evaluationContext)
+            {
+                _part = part;
+                _partDocument = partDocument;
+                _tag = tag;
+                _layout = layout;
+                _compiledRow = layout != null ? CompiledTableRow.Create(layout, pathToMarker[0]) : null;
+                _layoutError = layoutError;
+                _pathToMarker = pathToMarker;
+                _te = te;
+                _evaluationContext = evaluationContext;
+                _partStream = part.GetStream(FileMode.Create, FileAccess.Write);
+                _writer = XmlWriter.Create(_partStream);
+            }
+
+            // False when the Table tag itself is invalid; its error is written instead of the table.
+            public bool AcceptsItems => _layoutError == null;
+
+            public static StreamedCollectionWriter Begin(OpenXmlPart? part, XElement data, string select, TemplateError te, XPathEvaluationContext evaluationContext)
+            {
+                var partDocument = part?.GetXDocument();
+                var metadata = partDocument?.Root != null ? CompileTemplatePart(partDocument.Root, te) : null;
+                var tag = metadata?.Element(W.body)?.Elements()
+                    .FirstOrDefault(e => (e.Name == PA.Repeat || e.Name == PA.Table) && (string?)e.Attribute(PA.Select) == select);
+                if (tag == null)
+                {
+                    throw new ArgumentException($"The main document has no top-level Repeat or Table with Select=\"{select}\".", "collection");
+                }
+
+                tag.ReplaceWith(new XElement(s_CollectionMarker));
+                var transformed = (XElement)ContentReplacementTransform(metadata!, data, te, part!, evaluationContext)!;
+                var pathToMarker = transformed.Descendants(s_CollectionMarker).Single().AncestorsAndSelf().Reverse().ToList();
+
+                TableLayout? layout = null;
+                object? layoutError = null;
+                if (tag.Name == PA.Table)
+                {
+                    TryCreateTableLayout(tag, data, te, part!, evaluationContext, out layout, out layoutError);
+                }
+
+                var writer = new StreamedCollectionWriter(part!, partDocument!, tag, layout, layoutError, pathToMarker, te, evaluationContext);
+                writer.WriteStart();
+                return writer;
+            }
+
+            public void WriteItem(XElement item)
+            {
+                _evaluationContext.CancellationToken.ThrowIfCancellationRequested();
+                var itemContext = new XPathEvaluationContext(cancellationToken: _evaluationContext.CancellationToken);
+                if (_layout != null)
+                {
+                    if (!_hasItems)
+                    {
+                        _writer.WriteStartElement(W.tbl.LocalName, W.tbl.NamespaceName);
+                        WriteContent(_layout.PrefixNodes);
+                        WriteContent(_layout.HeaderRow);
+                    }
+                    if (_compiledRow != null)
+                    {
+                        _compiledRow.Write(_writer, item, _te, itemContext);
+                    }
+                    else
+                    {
+                        _layout.BuildRow(item, _te, itemContext).WriteTo(_writer);
+                    }
+                }
+                else
+                {
+                    WriteContent(_tag.Elements().Select(e => ContentReplacementTransform(e, item, _te, _part, itemContext)).ToList());
+                }
+                _hasItems = true;
+            }
+
+            public void Complete()
+            {
+                if (_layoutError != null)
+                {
+                    WriteContent(_layoutError);
+                }
+                else if (_layout != null && _hasItems)
+                {
+                    WriteContent(_layout.FooterRows);
+                    _writer.WriteEndElement();
+                }
+                else if (_layout != null)
+                {
+                    WriteContent(CreateContextErrorMessage(_tag, "Table Select returned no data", _te));
+                }
+                else if (!_hasItems)
+                {
+                    // same default as the Repeat tag: optional unless Optional="false"
+                    var optionalString = (string?)_tag.Attribute(PA.Optional);
+                    var optional = optionalString == null || !bool.TryParse(optionalString, out var optionalValue) || optionalValue;
+                    if (!optional)
+                    {
+                        WriteContent(CreateContextErrorMessage(_tag, "Repeat: Select returned no data", _te));
+                    }
+                }
+
+                for (var i = _pathToMarker.Count - 2; i >= 0; i--)
+                {
+                    foreach (var node in _pathToMarker[i + 1].NodesAfterSelf())
+                    {
+                        node.WriteTo(_writer);
+                    }
+                    _writer.WriteEndElement();
+                }
+                foreach (var node in _partDocument.Root!.NodesAfterSelf())
+                {
+                    node.WriteTo(_writer);
+                }
+                _writer.WriteEndDocument();
+                _writer.Flush();
+
+                // the cached tree is the template's; a later GetXDocument reads the written part instead
+                _part.RemoveAnnotations<XDocument>();
+            }
+
+            public void Dispose()
+            {
+                _writer.Dispose();
+                _partStream.Dispose();
+            }
+
+            // Declaration, the nodes before the root, then the start tags and the content in front of the marker.
+            private void WriteStart()
+            {
+                var standalone = _partDocument.Declaration?.Standalone;
+                if (standalone == "yes" || standalone == "no")
+                {
+                    _writer.WriteStartDocument(standalone == "yes");
+                }
+                else
+                {
+                    _writer.WriteStartDocument();
+                }
+                foreach (var node in _partDocument.Root!.NodesBeforeSelf())
+                {
+                    node.WriteTo(_writer);
+                }
+
+                for (var i = 0; i < _pathToMarker.Count - 1; i++)
+                {
+                    WriteStartElement(_pathToMarker[i]);
+                    foreach (var node in _pathToMarker[i + 1].NodesBeforeSelf())
+                    {
+                        node.WriteTo(_writer);
+                    }
+                }
+            }
+
+            private void WriteStartElement(XElement element)
+            {
+                _writer.WriteStartElement(element.GetPrefixOfNamespace(element.Name.Namespace), element.Name.LocalName, element.Name.NamespaceName);
+                foreach (var attribute in element.Attributes())
+                {
+                    if (!attribute.IsNamespaceDeclaration)
+                    {
+                        _writer.WriteAttributeString(element.GetPrefixOfNamespace(attribute.Name.Namespace), attribute.Name.LocalName, attribute.Name.NamespaceName, attribute.Value);
+                    }
+                    else if (attribute.Name.Namespace == XNamespace.None)
+                    {
+                        _writer.WriteAttributeString("xmlns", attribute.Value);
+                    }
+                    else
+                    {
+                        _writer.WriteAttributeString("xmlns", attribute.Name.LocalName, XNamespace.Xmlns.NamespaceName, attribute.Value);
+                    }
+                }
+            }
+
+            // content as returned by ContentReplacementTransform: nodes, nested sequences or null
+            private void WriteContent(object? content)
+            {
+                if (content == null)
+                {
+                    return;
+                }
+
+                foreach (var node in new XElement(W.body, content).Nodes())
+                {
+                    node.WriteTo(_writer);
+                }
+            }
+        }
+
+        // The prototype row of a streamed Table, serialized once and split around the text of its cells. A row is written
+        // by copying the static segments and escaping one value per cell, without building any XElement. The segments
+        // are serialized with the namespace declarations of the part root, so their prefixes are the ones in scope.
+        private sealed class CompiledTableRow
+        {
+            private readonly string[] _segments;
+            private readonly List<TableCellTemplate> _cells;
+
+            private CompiledTableRow(string[] segments, List<TableCellTemplate> cells)
+            {
+                _segments = segments;
+                _cells = cells;
+            }
+
+            public static CompiledTableRow? Create(TableLayout layout, XElement partRoot)
+            {
+                // a cell without a paragraph reports an error for every row, which BuildRow takes care of
+                if (layout.CellTemplates.Any(ct => !ct.HasParagraph))
+                {
+                    return null;
+                }
+
+                var slot = "{" + Guid.NewGuid().ToString("N") + "}";
+                var row = CreateTableRow(layout.ProtoRow, layout.CellTemplates.Select(ct => CreateTableCell(ct, slot)));
+                var wrapper = new XElement("Row",
+                    partRoot.Attributes().Where(a => a.IsNamespaceDeclaration && a.Name.Namespace == XNamespace.Xmlns),
+                    row);
+                var xml = new StringBuilder();
+                using (var writer = XmlWriter.Create(xml, new XmlWriterSettings { OmitXmlDeclaration = true }))
+                {
+                    wrapper.WriteTo(writer);
+                }
+
+                var serialized = xml.ToString();
+                var start = serialized.IndexOf('>') + 1;
+                var end = serialized.LastIndexOf("</Row>", StringComparison.Ordinal);
+                if (start <= 0 || end < start)
+                {
+                    return null;
+                }
+
+                var segments = serialized.Substring(start, end - start).Split(slot);
+                return segments.Length == layout.CellTemplates.Count + 1 ? new CompiledTableRow(segments, layout.CellTemplates) : null;
+            }
+
+            public void Write(XmlWriter writer, XElement data, TemplateError templateError, XPathEvaluationContext evaluationContext)
+            {
+                writer.WriteRaw(_segments[0]);
+                for (var i = 0; i < _cells.Count; i++)
+                {
+                    writer.WriteString(EvaluateXPathToString(data, _cells[i].XPath, false, templateError, evaluationContext));
+                    writer.WriteRaw(_segments[i + 1]);
+                }
+            }
+        }
+    }
+}
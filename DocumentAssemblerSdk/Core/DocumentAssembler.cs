@@ -10,6 +10,7 @@ using System.IO;
 using System.Linq;
 using System.Runtime.CompilerServices;
 using System.Text.RegularExpressions;
+using System.Threading;
 using System.Xml;
 using System.Xml.Linq;
 using System.Xml.Schema;
@@ -35,66 +36,211 @@ namespace DocumentAssembler.Core
         public static WmlDocument AssembleDocument(WmlDocument templateDoc, XElement data, out bool templateError) =>
             AssembleDocument(templateDoc, data, out templateError, out _);
 
-        public static WmlDocument AssembleDocument(WmlDocument templateDoc, XElement data, out bool templateError, out string? templateErrorSummary)
+        public static WmlDocument AssembleDocument(WmlDocument templateDoc, XElement data, out bool templateError, out string? templateErrorSummary) =>
+            AssembleDocument(templateDoc, data, (DocumentAssemblerOptions?)null, out templateError, out templateErrorSummary);
+
+        /// <summary>
+        /// Assembles a document with the given <paramref name="options"/>.
+        /// </summary>
+        public static WmlDocument AssembleDocument(WmlDocument templateDoc, XElement data, DocumentAssemblerOptions? options, out bool templateError, out string? templateErrorSummary)
         {
-            var assembledDocument = AssembleDocumentInternal(templateDoc, data, out var templateErrorDetails);
+            var assembledDocument = AssembleDocumentInternal(templateDoc, data, options, out var templateErrorDetails);
             templateError = templateErrorDetails.HasError;
             templateErrorSummary = templateErrorDetails.GetErrorSummary();
             return assembledDocument;
         }
 
-        private static WmlDocument AssembleDocumentInternal(WmlDocument templateDoc, XElement data, out TemplateError templateErrorDetails)
+        /// <summary>
+        /// Assembles a document and writes the package to <paramref name="output"/> instead of returning a byte array.
+        /// </summary>
+        /// <param name="template">Readable template package; it is only read, from its current position.</param>
+        /// <param name="data">The data.</param>
+        /// <param name="output">Receives the assembled package. An empty, readable and seekable stream (e.g. a new
+        /// <see cref="FileStream"/>) is used as the working package itself, so no in-memory copy is made; any other
+        /// writable stream (HTTP response, pipe) receives the package from a single working buffer.</param>
+        /// <param name="templateError">True if the template or the data produced errors.</param>
+        public static void AssembleDocument(Stream template, XElement data, Stream output, out bool templateError) =>
+            AssembleDocument(template, data, output, out templateError, out _);
+
+        /// <inheritdoc cref="AssembleDocument(Stream, XElement, Stream, out bool)"/>
+        /// <param name="templateErrorSummary">Summary of the template errors, empty when there are none.</param>
+        public static void AssembleDocument(Stream template, XElement data, Stream output, out bool templateError, out string? templateErrorSummary) =>
+            AssembleDocument(template, data, output, null, out templateError, out templateErrorSummary);
+
+        /// <inheritdoc cref="AssembleDocument(Stream, XElement, Stream, out bool, out string)"/>
+        /// <param name="options">Optional assembly settings.</param>
+        public static void AssembleDocument(Stream template, XElement data, Stream output, DocumentAssemblerOptions? options, out bool templateError, out string? templateErrorSummary)
+        {
+            if (template == null)
+            {
+                throw new ArgumentNullException(nameof(template));
+            }
+            if (output == null)
+            {
+                throw new ArgumentNullException(nameof(output));
+            }
+
+            var te = new TemplateError();
+            WritePackage(template, output, work => AssemblePackage(work, data, te, options));
+            templateError = te.HasError;
+            templateErrorSummary = te.GetErrorSummary();
+        }
+
+        /// <inheritdoc cref="AssembleDocument(Stream, XElement, Stream, out bool, out string)"/>
+        public static void AssembleDocument(WmlDocument templateDoc, XElement data, Stream output, out bool templateError, out string? templateErrorSummary)
+        {
+            // a read-only view over the template bytes, nothing is copied here
+            using var template = new MemoryStream(templateDoc.DocumentByteArray, false);
+            AssembleDocument(template, data, output, out templateError, out templateErrorSummary);
+        }
+
+        private static WmlDocument AssembleDocumentInternal(WmlDocument templateDoc, XElement data, DocumentAssemblerOptions? options, out TemplateError templateErrorDetails)
         {
             var byteArray = templateDoc.DocumentByteArray;
             using var mem = new MemoryStream();
             mem.Write(byteArray, 0, byteArray.Length);
             var te = new TemplateError();
-            using (var wordDoc = WordprocessingDocument.Open(mem, true))
+            AssemblePackage(mem, data, te, options);
+            templateErrorDetails = te;
+            var assembledDocument = new WmlDocument("TempFileName.docx", mem.ToArray());
+            return assembledDocument;
+        }
+
+        private static void AssemblePackage(Stream package, XElement data, TemplateError te, DocumentAssemblerOptions? options, CancellationToken cancellationToken = default)
+        {
+            var diagnostics = AssemblyDiagnosticsRecorder.Start(options);
+            using (var wordDoc = WordprocessingDocument.Open(package, true))
             {
-                if (RevisionAccepter.HasTrackedRevisions(wordDoc))
+                var templateParts = LoadTemplateParts(wordDoc);
+
+                var parallel = options?.ProcessPartsInParallel == true;
+                var evaluationContext = new XPathEvaluationContext(concurrent: parallel, cancellationToken);
+                var recorders = templateParts.Select(part => diagnostics?.ForPart(part.Uri)).ToArray();
+                if (parallel)
                 {
-                    throw new OpenXmlPowerToolsException("Invalid DocumentAssembler template - contains tracked revisions");
+                    ProcessTemplatePartsInParallel(templateParts, data, te, options!, evaluationContext, recorders);
                 }
-
-                var evaluationContext = new XPathEvaluationContext();
-                foreach (var part in wordDoc.ContentParts())
+                else
                 {
-                    if (part != null)
+                    for (var i = 0; i < templateParts.Count; i++)
                     {
-                        ProcessTemplatePart(data, te, part, evaluationContext);
+                        cancellationToken.ThrowIfCancellationRequested();
+                        ProcessTemplatePart(data, te, templateParts[i], evaluationContext, recorders[i]);
                     }
                 }
+                diagnostics?.SetXPathCacheCounts(evaluationContext.Hits, evaluationContext.Misses);
             }
-            templateErrorDetails = te;
-            var assembledDocument = new WmlDocument("TempFileName.docx", mem.ToArray());
-            return assembledDocument;
+            diagnostics?.Report();
         }
 
-        private static void ProcessTemplatePart(XElement data, TemplateError te, OpenXmlPart part, XPathEvaluationContext evaluationContext)
+        // Loads the content parts that carry template markup and rejects templates with tracked revisions. Parts without
+        // markup (most footers, footnotes and endnotes) are never parsed into a tree and are left byte-for-byte as they
+        // are in the template; the revision check scans them with a reader instead. The loaded trees are the ones the
+        // revision check searches and the caller processes, so each part is parsed once per assembly.
+        private static List<OpenXmlPart> LoadTemplateParts(WordprocessingDocument wordDoc)
         {
-            var xDoc = part.GetXDocument();
-            if (xDoc.Root == null)
+            var templateParts = new List<OpenXmlPart>();
+            foreach (var part in wordDoc.ContentParts())
             {
-                return;
+                if (part != null && TryLoadTemplatePart(part))
+                {
+                    templateParts.Add(part);
+                }
             }
 
-            var xDocRoot = RemoveGoBackBookmarks(xDoc.Root);
+            if (RevisionAccepter.HasTrackedRevisions(wordDoc))
+            {
+                throw new OpenXmlPowerToolsException("Invalid DocumentAssembler template - contains tracked revisions");
+            }
+            return templateParts;
+        }
 
-            // content controls in cells can surround the W.tc element, so transform so that such content controls are within the cell content
-            xDocRoot = (XElement)NormalizeContentControlsInCells(xDocRoot);
+        private static bool TryLoadTemplatePart(OpenXmlPart part)
+        {
+            if (part.Annotation<XDocument>() != null)
+            {
+                return true;
+            }
+
+            byte[] partBytes;
+            using (var partStream = part.GetStream(FileMode.Open, FileAccess.Read))
+            {
+                if (partStream.Length == 0)
+                {
+                    return false;
+                }
 
-            xDocRoot = (XElement)TransformToMetadata(xDocRoot, data, te);
+                partBytes = new byte[partStream.Length];
+                partStream.ReadExactly(partBytes);
+            }
 
-            // Table might have been placed at run-level, when it should be at block-level, so fix this.
-            // Repeat, EndRepeat, Conditional, EndConditional are allowed at run level, but only if there is a matching pair
-            // if there is only one Repeat, EndRepeat, Conditional, EndConditional, then move to block level.
-            // if there is a matching pair, then is OK.
-            xDocRoot = (XElement)ForceBlockLevelAsAppropriate(xDocRoot, te);
+            if (!MayContainTemplateMarkup(partBytes))
+            {
+                return false;
+            }
 
-            NormalizeTablesRepeatAndConditional(xDocRoot, te);
+            // the same bytes become the part's cached tree, as GetXDocument would have loaded it
+            using (var partXmlReader = XmlReader.Create(new MemoryStream(partBytes, false)))
+            {
+                part.AddAnnotation(XDocument.Load(partXmlReader));
+            }
+            return true;
+        }
+
+        // Template markup is a content control or "<#" in paragraph text. Serialized, the text can only hold the '<'
+        // escaped (&lt; or a character reference) or inside a CDATA section. The test errs on the side of loading the
+        // part: any "sdt" (w:sdt, w:sdtPr, ...) counts, and so does any encoding other than UTF-8.
+        private static bool MayContainTemplateMarkup(ReadOnlySpan<byte> xml)
+        {
+            if (xml.Length < 2 || xml[0] == 0 || xml[1] == 0 || xml[0] == 0xFE || xml[0] == 0xFF)
+            {
+                return true;
+            }
+
+            return xml.IndexOf("sdt"u8) >= 0 ||
+                xml.IndexOf("&lt;"u8) >= 0 ||
+                xml.IndexOf("&#"u8) >= 0 ||
+                xml.IndexOf("<![CDATA["u8) >= 0;
+        }
+
+        // Copies the template into a working stream, lets assemble rewrite the package there and delivers it to output.
+        // When output can hold the package while it is edited it is the working stream, otherwise a single MemoryStream
+        // is copied to output once at the end.
+        private static void WritePackage(Stream template, Stream output, Action<Stream> assemble)
+        {
+            if (output.CanRead && output.CanSeek && output.CanWrite && output.Length == 0)
+            {
+                template.CopyTo(output);
+                output.Position = 0;
+                assemble(output);
+                output.Position = output.Length;
+                return;
+            }
+
+            using var work = template.CanSeek
+                ? new MemoryStream(checked((int)(template.Length - template.Position)))
+                : new MemoryStream();
+            template.CopyTo(work);
+            work.Position = 0;
+            assemble(work);
+            work.Position = 0;
+            work.CopyTo(output);
+        }
+
+        private static void ProcessTemplatePart(XElement data, TemplateError te, OpenXmlPart part, XPathEvaluationContext evaluationContext, PartDiagnosticsRecorder? diagnostics)
+        {
+            var xDoc = part.GetXDocument();
+            if (xDoc.Root == null)
+            {
+                return;
+            }
+
+            var xDocRoot = CompileTemplatePart(xDoc.Root, te, diagnostics);
 
             // do the actual content replacement
+            diagnostics?.StartPhase();
             xDocRoot = ContentReplacementTransform(xDocRoot, data, te, part, evaluationContext) as XElement;
+            diagnostics?.EndPhase(nameof(ContentReplacementTransform));
 
             // Note: Error collection is done during processing. Errors are indicated by:
             // 1. The templateError boolean flag (te.HasError)
@@ -105,10 +251,47 @@ namespace DocumentAssembler.Core
             // Users can access the full error list programmatically via the TemplateError object.
 
             xDoc.Elements().First().ReplaceWith(xDocRoot);
+            diagnostics?.StartPhase();
             part.PutXDocument();
+            diagnostics?.EndPhase(nameof(PtOpenXmlExtensions.PutXDocument));
             return;
         }
 
+        // Turns the markup of a template part into the metadata tree consumed by ContentReplacementTransform.
+        // The result depends only on the template, never on the data, and ContentReplacementTransform does not
+        // modify it, so a compiled tree can be shared by any number of assemblies (see CompiledTemplate).
+        // Each phase is timed when diagnostics are requested (DocumentAssemblerOptions.Diagnostics).
+        private static XElement CompileTemplatePart(XElement root, TemplateError te, PartDiagnosticsRecorder? diagnostics = null)
+        {
+            diagnostics?.StartPhase();
+            var xDocRoot = RemoveGoBackBookmarks(root);
+            diagnostics?.EndPhase(nameof(RemoveGoBackBookmarks));
+
+            // content controls in cells can surround the W.tc element, so transform so that such content controls are within the cell content
+            diagnostics?.StartPhase();
+            xDocRoot = (XElement)NormalizeContentControlsInCells(xDocRoot);
+            diagnostics?.EndPhase(nameof(NormalizeContentControlsInCells));
+
+            diagnostics?.StartPhase();
+            xDocRoot = (XElement)TransformToMetadata(xDocRoot, te);
+            diagnostics?.EndPhase(nameof(TransformToMetadata));
+
+            // Table might have been placed at run-level, when it should be at block-level, so fix this.
+            // Repeat, EndRepeat, Conditional, EndConditional are allowed at run level, but only if there is a matching pair
+            // if there is only one Repeat, EndRepeat, Conditional, EndConditional, then move to block level.
+            // if there is a matching pair, then is OK.
+            diagnostics?.StartPhase();
+            xDocRoot = (XElement)ForceBlockLevelAsAppropriate(xDocRoot, te);
+            diagnostics?.EndPhase(nameof(ForceBlockLevelAsAppropriate));
+
+            diagnostics?.StartPhase();
+            NormalizeTablesRepeatAndConditional(xDocRoot, te);
+            diagnostics?.EndPhase(nameof(NormalizeTablesRepeatAndConditional));
+
+            diagnostics?.CountTags(xDocRoot);
+            return xDocRoot;
+        }
+
         private static readonly XName[] s_MetaToForceToBlock = new XName[] {
             PA.Conditional,
             PA.Else,
@@ -242,6 +425,13 @@ namespace DocumentAssembler.Core
                 // detach w:tbl from parent, and add to Table metadata
                 followingElement.Remove();
                 table.Add(followingElement);
+                // bookmarks can't be repeated with the prototype row
+                var protoRow = followingElement.Elements(W.tr).Skip(1).FirstOrDefault();
+                if (protoRow != null)
+                {
+                    protoRow.Descendants(W.bookmarkStart).Remove();
+                    protoRow.Descendants(W.bookmarkEnd).Remove();
+                }
             }
 
             var repeatDepth = 0;
@@ -507,18 +697,18 @@ namespace DocumentAssembler.Core
                         throw new OpenXmlPowerToolsException("Image: owning part is not available.");
                     }
 
-                    if (!TryCalculateImageDimensions(imageBytes, widthAttr, heightAttr, maxWidthAttr, maxHeightAttr, out var widthEmu, out var heightEmu, out var sizeError))
+                    var imageHash = GetImageHash(imageBytes);
+                    if (!TryGetPixelSize(imageBytes, imageHash, out var pixelWidth, out var pixelHeight, out var sizeError) ||
+                        !TryCalculateImageDimensions(pixelWidth, pixelHeight, widthAttr, heightAttr, maxWidthAttr, maxHeightAttr, out var widthEmu, out var heightEmu, out sizeError))
                     {
                         return CreateContextErrorMessage(element, sizeError, templateError);
                     }
 
-                    var imagePart = AddImagePart(owningPart);
-                    using (var stream = new MemoryStream(imageBytes))
+                    string relationshipId;
+                    lock (evaluationContext.PackageSync)
                     {
-                        imagePart.FeedData(stream);
+                        relationshipId = GetOrAddImageRelationship(owningPart, imageBytes, imageHash);
                     }
-
-                    var relationshipId = owningPart.GetIdOfPart(imagePart);
                     var docPrId = GetNextDocPrId(owningPart);
                     var imageElement = CreateImageElement(relationshipId, docPrId, widthEmu, heightEmu, justification);
                     return imageElement;
@@ -555,6 +745,7 @@ namespace DocumentAssembler.Core
                     var repeatChildren = element.Elements().ToList();
                     var newContent = repeatingData.Select(d =>
                         {
+                            evaluationContext.CancellationToken.ThrowIfCancellationRequested();
                             var content = repeatChildren
                                 .Select(e => ContentReplacementTransform(e, d, templateError, owningPart, evaluationContext))
                                 .ToList();
@@ -585,39 +776,20 @@ namespace DocumentAssembler.Core
                         return CreateContextErrorMessage(element, "Table Select returned no data", templateError);
                     }
 
-                    var table = element.Element(W.tbl);
-                    if (table == null)
+                    if (!TryCreateTableLayout(element, data, templateError, owningPart, evaluationContext, out var layout, out var layoutError))
                     {
-                        return CreateContextErrorMessage(element, "Table: Unable to find table element", templateError);
+                        return layoutError;
                     }
 
-                    var protoRow = table.Elements(W.tr).Skip(1).FirstOrDefault();
-                    var footerRowsBeforeTransform = table
-                        .Elements(W.tr)
-                        .Skip(2)
-                        .ToList();
-                    var footerRows = footerRowsBeforeTransform
-                        .Select(x => ContentReplacementTransform(x, data, templateError, owningPart, evaluationContext))
-                        .ToList();
-                    if (protoRow == null)
-                    {
-                        return CreateContextErrorMessage(element, string.Format("Table does not contain a prototype row"), templateError);
-                    }
-
-                    protoRow.Descendants(W.bookmarkStart).Remove();
-                    protoRow.Descendants(W.bookmarkEnd).Remove();
-                    var tablePrefixNodes = table.Elements().Where(e => e.Name != W.tr).ToList();
-                    var cellTemplates = protoRow.Elements(W.tc)
-                        .Select(tc => CreateTableCellTemplate(tc, templateError))
-                        .ToList();
                     var newTable = new XElement(W.tbl,
-                        tablePrefixNodes,
-                        table.Elements(W.tr).FirstOrDefault(),
+                        layout!.PrefixNodes,
+                        layout.HeaderRow,
                         tableData.Select(d =>
-                            new XElement(W.tr,
-                                protoRow.Elements().Where(r => r.Name != W.tc),
-                                cellTemplates.Select(ct => BuildTableCell(ct, d, templateError, evaluationContext)))),
-                        footerRows
+                        {
+                            evaluationContext.CancellationToken.ThrowIfCancellationRequested();
+                            return layout.BuildRow(d, templateError, evaluationContext);
+                        }),
+                        layout.FooterRows
                     );
                     return newTable;
                 }
@@ -720,6 +892,96 @@ namespace DocumentAssembler.Core
         private static readonly ConcurrentDictionary<string, XPathExpression> s_XPathExpressionCache = new();
         private static readonly ConditionalWeakTable<XElement, ParagraphRunTemplate> s_ParagraphTemplateCache = new();
 
+        private static readonly ConcurrentDictionary<string, SimpleXPath?> s_SimpleXPathCache = new();
+
+        private static SimpleXPath? GetSimpleXPath(string xPath) =>
+            s_SimpleXPathCache.GetOrAdd(xPath, key => SimpleXPath.TryParse(key));
+
+        // A location path made only of child element steps, optionally ending with an attribute step: "a/b/c",
+        // "./a", "a/@b", "@b", ".". Nearly every Select in real templates has this shape; such paths are evaluated
+        // by walking the XElement tree directly, which selects exactly the nodes XPath would, in document order,
+        // without creating a navigator. Anything else (predicates, axes, functions, prefixes, "..", "//", absolute
+        // paths) goes through the XPath engine.
+        private sealed class SimpleXPath
+        {
+            public XName[] Steps { get; }
+            public XName? Attribute { get; }
+
+            private SimpleXPath(XName[] steps, XName? attribute)
+            {
+                Steps = steps;
+                Attribute = attribute;
+            }
+
+            public static SimpleXPath? TryParse(string xPath)
+            {
+                var segments = xPath.Trim().Split('/');
+                var steps = new List<XName>(segments.Length);
+                XName? attribute = null;
+                for (var i = 0; i < segments.Length; i++)
+                {
+                    var segment = segments[i];
+                    if (segment == "." && i == 0)
+                    {
+                        continue;
+                    }
+                    if (segment.Length > 1 && segment[0] == '@' && i == segments.Length - 1)
+                    {
+                        var attributeName = segment.Substring(1);
+                        if (!IsNCName(attributeName) || attributeName.StartsWith("xmlns", StringComparison.Ordinal))
+                        {
+                            return null;
+                        }
+                        attribute = XName.Get(attributeName);
+                        continue;
+                    }
+                    if (!IsNCName(segment))
+                    {
+                        return null;
+                    }
+                    steps.Add(XName.Get(segment));
+                }
+                return new SimpleXPath(steps.ToArray(), attribute);
+            }
+
+            private static bool IsNCName(string name)
+            {
+                if (name.Length == 0 || !XmlConvert.IsStartNCNameChar(name[0]))
+                {
+                    return false;
+                }
+                for (var i = 1; i < name.Length; i++)
+                {
+                    if (!XmlConvert.IsNCNameChar(name[i]))
+                    {
+                        return false;
+                    }
+                }
+                return true;
+            }
+
+            public IEnumerable<XElement> SelectElements(XElement context)
+            {
+                IEnumerable<XElement> current = new[] { context };
+                foreach (var step in Steps)
+                {
+                    current = current.Elements(step);
+                }
+                return current;
+            }
+
+            public IEnumerable<XObject> Select(XElement context)
+            {
+                var elements = SelectElements(context);
+                if (Attribute == null)
+                {
+                    return elements;
+                }
+                var attributeName = Attribute;
+                return elements.Select(e => e.Attribute(attributeName)).Where(a => a != null).Select(a => (XObject)a!);
+            }
+        }
+
         private readonly struct EvaluationCacheKey : IEquatable<EvaluationCacheKey>
         {
             public XElement Data { get; }
@@ -746,18 +1008,53 @@ namespace DocumentAssembler.Core
 
         private sealed class XPathEvaluationContext
         {
-            private readonly Dictionary<EvaluationCacheKey, string> _cache = new();
-            private readonly Dictionary<(XElement Data, string XPath), XElement[]> _elementCache = new();
+            private readonly IDictionary<EvaluationCacheKey, string> _cache;
+            private readonly IDictionary<(XElement Data, string XPath), XElement[]> _elementCache;
 
-            public bool TryGet(EvaluationCacheKey key, out string value) => _cache.TryGetValue(key, out value);
+            // concurrent: the context is shared by parts processed in parallel (DocumentAssemblerOptions.ProcessPartsInParallel)
+            public XPathEvaluationContext(bool concurrent = false, CancellationToken cancellationToken = default)
+            {
+                CancellationToken = cancellationToken;
+                if (concurrent)
+                {
+                    _cache = new ConcurrentDictionary<EvaluationCacheKey, string>();
+                    _elementCache = new ConcurrentDictionary<(XElement Data, string XPath), XElement[]>();
+                }
+                else
+                {
+                    _cache = new Dictionary<EvaluationCacheKey, string>();
+                    _elementCache = new Dictionary<(XElement Data, string XPath), XElement[]>();
+                }
+            }
+
+            private long _hits;
+            private long _misses;
+
+            // The OpenXml package is not thread-safe; parts that add image parts to it serialize on this object.
+            public object PackageSync { get; } = new object();
+
+            // Checked between parts and between the items of a Repeat or Table (AssembleDocumentAsync).
+            public CancellationToken CancellationToken { get; }
+
+            // lookups of both caches, reported by AssemblyDiagnostics
+            public long Hits => Interlocked.Read(ref _hits);
+            public long Misses => Interlocked.Read(ref _misses);
+
+            public bool TryGet(EvaluationCacheKey key, out string value) => Count(_cache.TryGetValue(key, out value));
 
             public void Store(EvaluationCacheKey key, string value) => _cache[key] = value;
 
             public bool TryGetElements(XElement data, string xpath, out XElement[] elements) =>
-                _elementCache.TryGetValue((data, xpath), out elements);
+                Count(_elementCache.TryGetValue((data, xpath), out elements));
 
             public void StoreElements(XElement data, string xpath, XElement[] elements) =>
                 _elementCache[(data, xpath)] = elements;
+
+            private bool Count(bool hit)
+            {
+                Interlocked.Increment(ref hit ? ref _hits : ref _misses);
+                return hit;
+            }
         }
 
         private sealed class ParagraphRunTemplate
@@ -807,22 +1104,31 @@ namespace DocumentAssembler.Core
             }
 
             object xPathSelectResult;
-            try
+            var simplePath = GetSimpleXPath(xPath);
+            if (simplePath != null)
             {
-                var navigator = element.CreateNavigator();
-                var baseExpression = s_XPathExpressionCache.GetOrAdd(xPath, key => XPathExpression.Compile(key));
-                var expression = baseExpression.Clone();
-                expression.SetContext(navigator);
-                xPathSelectResult = navigator.Evaluate(expression);
+                // two nodes are enough to tell a single result from several
+                xPathSelectResult = simplePath.Select(element).Take(2);
             }
-            catch (XPathException e)
+            else
             {
-                // Collect XPath syntax errors instead of throwing
-                var errorMsg = "XPathException: " + e.Message;
-                templateError.AddError(errorMsg);
-                var invalidResult = "[ERROR: Invalid XPath]";
-                evaluationContext.Store(cacheKey, invalidResult);
-                return invalidResult;
+                try
+                {
+                    var navigator = element.CreateNavigator();
+                    var baseExpression = s_XPathExpressionCache.GetOrAdd(xPath, key => XPathExpression.Compile(key));
+                    var expression = baseExpression.Clone();
+                    expression.SetContext(navigator);
+                    xPathSelectResult = navigator.Evaluate(expression);
+                }
+                catch (XPathException e)
+                {
+                    // Collect XPath syntax errors instead of throwing
+                    var errorMsg = "XPathException: " + e.Message;
+                    templateError.AddError(errorMsg);
+                    var invalidResult = "[ERROR: Invalid XPath]";
+                    evaluationContext.Store(cacheKey, invalidResult);
+                    return invalidResult;
+                }
             }
 
             string result;
@@ -889,6 +1195,16 @@ namespace DocumentAssembler.Core
                 return cached;
             }
 
+            var simplePath = GetSimpleXPath(xPath);
+            if (simplePath != null)
+            {
+                var selected = simplePath.Attribute == null
+                    ? simplePath.SelectElements(element).ToArray()
+                    : Array.Empty<XElement>();
+                evaluationContext.StoreElements(element, xPath, selected);
+                return selected;
+            }
+
             var navigator = element.CreateNavigator();
             var baseExpression = s_XPathExpressionCache.GetOrAdd(xPath, key => XPathExpression.Compile(key));
             var expression = baseExpression.Clone();
@@ -909,6 +1225,68 @@ namespace DocumentAssembler.Core
             return result;
         }
 
+        // The parts of a Table tag's w:tbl that do not depend on the rows' data: the header row is copied, the footer
+        // rows are bound to the Table's own data, and the prototype row (the second row) yields one row per data item.
+        private sealed class TableLayout
+        {
+            public List<XElement> PrefixNodes { get; }
+            public XElement? HeaderRow { get; }
+            public List<object?> FooterRows { get; }
+            public XElement ProtoRow { get; }
+            public List<TableCellTemplate> CellTemplates { get; }
+
+            public TableLayout(List<XElement> prefixNodes, XElement? headerRow, List<object?> footerRows, XElement protoRow, List<TableCellTemplate> cellTemplates)
+            {
+                PrefixNodes = prefixNodes;
+                HeaderRow = headerRow;
+                FooterRows = footerRows;
+                ProtoRow = protoRow;
+                CellTemplates = cellTemplates;
+            }
+
+            public XElement BuildRow(XElement data, TemplateError templateError, XPathEvaluationContext evaluationContext) =>
+                CreateTableRow(ProtoRow, CellTemplates.Select(ct => BuildTableCell(ct, data, templateError, evaluationContext)));
+        }
+
+        private static XElement CreateTableRow(XElement protoRow, IEnumerable<XElement> cells) =>
+            new XElement(W.tr,
+                protoRow.Elements().Where(r => r.Name != W.tc),
+                cells);
+
+        private static bool TryCreateTableLayout(XElement element, XElement data, TemplateError templateError, OpenXmlPart owningPart,
+            XPathEvaluationContext evaluationContext, out TableLayout? layout, out object? error)
+        {
+            layout = null;
+            var table = element.Element(W.tbl);
+            if (table == null)
+            {
+                error = CreateContextErrorMessage(element, "Table: Unable to find table element", templateError);
+                return false;
+            }
+
+            var protoRow = table.Elements(W.tr).Skip(1).FirstOrDefault();
+            var footerRowsBeforeTransform = table
+                .Elements(W.tr)
+                .Skip(2)
+                .ToList();
+            var footerRows = footerRowsBeforeTransform
+                .Select(x => ContentReplacementTransform(x, data, templateError, owningPart, evaluationContext))
+                .ToList();
+            if (protoRow == null)
+            {
+                error = CreateContextErrorMessage(element, string.Format("Table does not contain a prototype row"), templateError);
+                return false;
+            }
+
+            var tablePrefixNodes = table.Elements().Where(e => e.Name != W.tr).ToList();
+            var cellTemplates = protoRow.Elements(W.tc)
+                .Select(tc => CreateTableCellTemplate(tc, templateError))
+                .ToList();
+            layout = new TableLayout(tablePrefixNodes, table.Elements(W.tr).FirstOrDefault(), footerRows, protoRow, cellTemplates);
+            error = null;
+            return true;
+        }
+
         private sealed record TableCellTemplate(
             XElement[] NonParagraphNodes,
             XElement? ParagraphProperties,
@@ -941,11 +1319,16 @@ namespace DocumentAssembler.Core
             }
 
             var newValue = EvaluateXPathToString(data, template.XPath, false, templateError, evaluationContext);
+            return CreateTableCell(template, newValue);
+        }
+
+        private static XElement CreateTableCell(TableCellTemplate template, string value)
+        {
             var paragraphProps = template.ParagraphProperties != null ? new XElement(template.ParagraphProperties) : null;
             var runProps = template.RunProperties != null ? new XElement(template.RunProperties) : new XElement(W.rPr);
             var run = new XElement(W.r,
                 runProps,
-                new XElement(W.t, newValue));
+                new XElement(W.t, value));
             var paragraphElement = new XElement(W.p,
                 paragraphProps,
                 run);
@@ -981,8 +1364,10 @@ namespace DocumentAssembler.Core
             public static readonly XName PageHint = "PageHint";
         }
 
-        private class TemplateError
+        internal sealed class TemplateError
         {
+            private const string MissingFieldPrefix = "Missing field: ";
+
             public bool HasError;
             public List<string> MissingFields { get; } = new List<string>();
             public List<string> AllErrors { get; } = new List<string>();
@@ -993,7 +1378,7 @@ namespace DocumentAssembler.Core
                 if (!MissingFields.Contains(xpath))
                 {
                     MissingFields.Add(xpath);
-                    AllErrors.Add($"Missing field: {xpath}");
+                    AllErrors.Add(MissingFieldPrefix + xpath);
                 }
             }
 
@@ -1006,6 +1391,34 @@ namespace DocumentAssembler.Core
                 }
             }
 
+            // Appends the errors of other as if they had been reported here, in the same order.
+            public void MergeFrom(TemplateError other)
+            {
+                HasError |= other.HasError;
+                foreach (var error in other.AllErrors)
+                {
+                    var missingField = error.StartsWith(MissingFieldPrefix, StringComparison.Ordinal)
+                        ? error.Substring(MissingFieldPrefix.Length)
+                        : null;
+                    if (missingField != null && other.MissingFields.Contains(missingField))
+                    {
+                        AddMissingField(missingField);
+                    }
+                    else
+                    {
+                        AddError(error);
+                    }
+                }
+            }
+
+            public TemplateError Clone()
+            {
+                var clone = new TemplateError { HasError = HasError };
+                clone.MissingFields.AddRange(MissingFields);
+                clone.AllErrors.AddRange(AllErrors);
+                return clone;
+            }
+
             public string GetErrorSummary()
             {
                 if (!HasError || AllErrors.Count == 0)
@@ -0,0 +1,30 @@
+using System;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// Optional settings for <see cref="DocumentAssembler"/> and <see cref="CompiledTemplate"/>.
+    /// </summary>
+    public sealed class DocumentAssemblerOptions
+    {
+        /// <summary>
+        /// Process the content parts (main document, headers, footers, footnotes, endnotes) of a document
+        /// concurrently. The package is still read and written on the calling thread; only the template
+        /// transformation of each part runs in parallel. Worth enabling for documents with many headers and footers.
+        /// </summary>
+        public bool ProcessPartsInParallel { get; set; }
+
+        /// <summary>
+        /// Maximum number of parts processed at once when <see cref="ProcessPartsInParallel"/> is set;
+        /// 0 or less leaves the choice to the thread pool.
+        /// </summary>
+        public int MaxDegreeOfParallelism { get; set; }
+
+        /// <summary>
+        /// Called once per assembled document with the duration and allocations of each phase of each content part,
+        /// the template tag counts and the XPath cache hit ratio. Measuring is skipped entirely when this is null.
+        /// The callback runs on the assembling thread after the package has been saved.
+        /// </summary>
+        public Action<AssemblyDiagnostics>? Diagnostics { get; set; }
+    }
+}
@@ -0,0 +1,78 @@
+using System;
+using System.Collections.Generic;
+using System.Xml;
+using System.Xml.Linq;
+
+namespace DocumentAssembler.Core
+{
+    /// <summary>
+    /// The items of one top-level Repeat or Table of a template, pulled one at a time while the document is written
+    /// (see <see cref="DocumentAssembler.AssembleDocument(System.IO.Stream, XElement, StreamedCollection, System.IO.Stream)"/>).
+    /// </summary>
+    /// <remarks>
+    /// Each item is bound on its own, detached from the rest of the data: selects inside the Repeat or Table are
+    /// evaluated against the item and cannot reach its parent or siblings. The items are enumerated exactly once.
+    /// </remarks>
+    public sealed class StreamedCollection
+    {
+        /// <param name="select">The Select attribute of the Repeat or Table tag, exactly as it is written in the template.</param>
+        /// <param name="items">The items, enumerated lazily.</param>
+        public StreamedCollection(string select, IEnumerable<XElement> items)
+        {
+            Select = select ?? throw new ArgumentNullException(nameof(select));
+            Items = items ?? throw new ArgumentNullException(nameof(items));
+        }
+
+        /// <param name="select">The Select attribute of the Repeat or Table tag, exactly as it is written in the template.</param>
+        /// <param name="items">The items, enumerated lazily; only the asynchronous assembly accepts them.</param>
+        public StreamedCollection(string select, IAsyncEnumerable<XElement> items)
+        {
+            Select = select ?? throw new ArgumentNullException(nameof(select));
+            AsyncItems = items ?? throw new ArgumentNullException(nameof(items));
+        }
+
+        /// <summary>
+        /// The Select attribute of the Repeat or Table tag the items are bound to
+        /// </summary>
+        public string Select { get; }
+
+        internal IEnumerable<XElement>? Items { get; }
+
+        internal IAsyncEnumerable<XElement>? AsyncItems { get; }
+
+        /// <summary>
+        /// Streams the elements named <paramref name="itemName"/> from <paramref name="reader"/>, e.g. the Order elements
+        /// of a Report/Orders/Order data file. Only the current item is held in memory; content between items is skipped.
+        /// </summary>
+        public static StreamedCollection FromXmlReader(string select, XmlReader reader, XName itemName)
+        {
+            if (reader == null)
+            {
+                throw new ArgumentNullException(nameof(reader));
+            }
+            if (itemName == null)
+            {
+                throw new ArgumentNullException(nameof(itemName));
+            }
+
+            return new StreamedCollection(select, ReadElements(reader, itemName));
+        }
+
+        private static IEnumerable<XElement> ReadElements(XmlReader reader, XName itemName)
+        {
+            reader.MoveToContent();
+            while (!reader.EOF)
+            {
+                if (reader.NodeType == XmlNodeType.Element && reader.LocalName == itemName.LocalName && reader.NamespaceURI == itemName.NamespaceName)
+                {
+                    // ReadFrom leaves the reader on the node after the item
+                    yield return (XElement)XNode.ReadFrom(reader);
+                }
+                else
+                {
+                    reader.Read();
+                }
+            }
+        }
+    }
+}
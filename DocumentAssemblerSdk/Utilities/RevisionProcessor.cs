@@ -2,7 +2,9 @@ using DocumentAssembler.Core.Exceptions;
 using DocumentFormat.OpenXml.Packaging;
 using System;
 using System.Collections.Generic;
+using System.IO;
 using System.Linq;
+using System.Xml;
 using System.Xml.Linq;
 
 namespace DocumentAssembler.Core
@@ -155,11 +157,36 @@ namespace DocumentAssembler.Core
             W.trPrChange,
         };
 
+        private static readonly HashSet<XName> s_TrackedRevisionsElementSet = new HashSet<XName>(TrackedRevisionsElements);
+
+        // A part that is already loaded is searched in memory. Any other part is scanned with a forward-only reader
+        // that stops at the first revision, so checking a document does not build trees nobody is going to use.
         public static bool PartHasTrackedRevisions(OpenXmlPart part)
         {
-            return part.GetXDocument()
-                .Descendants()
-                .Any(e => TrackedRevisionsElements.Contains(e.Name));
+            var partXDocument = part.Annotation<XDocument>();
+            if (partXDocument != null)
+            {
+                return partXDocument
+                    .Descendants()
+                    .Any(e => s_TrackedRevisionsElementSet.Contains(e.Name));
+            }
+
+            using var partStream = part.GetStream(FileMode.Open, FileAccess.Read);
+            if (partStream.Length == 0)
+            {
+                return false;
+            }
+
+            using var partXmlReader = XmlReader.Create(partStream);
+            while (partXmlReader.Read())
+            {
+                if (partXmlReader.NodeType == XmlNodeType.Element &&
+                    s_TrackedRevisionsElementSet.Contains(XName.Get(partXmlReader.LocalName, partXmlReader.NamespaceURI)))
+                {
+                    return true;
+                }
+            }
+            return false;
         }
 
         public static bool HasTrackedRevisions(WmlDocument document)
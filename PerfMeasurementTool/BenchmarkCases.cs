@@ -0,0 +1,274 @@
+using DocumentAssembler.Core;
+using DocumentFormat.OpenXml.Packaging;
+using DocumentFormat.OpenXml.Wordprocessing;
+using SkiaSharp;
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
+using System.Text.RegularExpressions;
+using System.Xml.Linq;
+
+namespace PerfMeasurementTool
+{
+    /// <summary>
+    /// The measured operations. Documents that are derived from the templates (the tracked-revision document, the image
+    /// template) are built on first use, so a filtered run only pays for the cases it selects.
+    /// </summary>
+    internal static class BenchmarkCases
+    {
+        private static readonly string TemplateDirectory = Path.GetFullPath(
+            Path.Combine(AppDomain.CurrentDomain.BaseDirectory, "..", "..", ".."));
+
+        private const string TinyPngBase64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGNgYAAAAAMAASsJTYQAAAAASUVORK5CYII=";
+
+        private const int ImageCount = 20;
+
+        private static readonly Regex s_DigitsRegex = new Regex(@"\d+", RegexOptions.Compiled);
+
+        private static readonly Scenario SimpleScenario = new Scenario(
+            "Simple",
+            ResolveTemplatePath("SimpleTemplate.docx"),
+            new XElement("Customer",
+                new XElement("CustomerId", "C123"),
+                new XElement("Name", "Jane Doe"),
+                new XElement("Email", "jane.doe@example.com"),
+                new XElement("Phone", "555-0100"),
+                new XElement("Photo", TinyPngBase64)));
+
+        private static readonly Scenario ComplexScenario = new Scenario(
+            "Complex",
+            ResolveTemplatePath("ComplexTemplate.docx"),
+            new XElement("Company",
+                new XElement("Name", "Contoso Ltd."),
+                new XElement("Address",
+                    new XElement("Street", "1 Infinite Loop"),
+                    new XElement("City", "Cupertino"),
+                    new XElement("PostalCode", "95014")),
+                new XElement("HasPremium", "true"),
+                new XElement("PremiumCode", "PRM-001"),
+                new XElement("Orders",
+                    new XElement("Order",
+                        new XElement("OrderId", "1001"),
+                        new XElement("Product", "UltraWidget"),
+                        new XElement("Quantity", "3"),
+                        new XElement("HasDiscount", "true"),
+                        new XElement("Discount", "5%"),
+                        new XElement("Signature", TinyPngBase64),
+                        new XElement("LineItems",
+                            new XElement("Item",
+                                new XElement("Description", "Main widget"),
+                                new XElement("Amount", "199")),
+                            new XElement("Item",
+                                new XElement("Description", "Add-on"),
+                                new XElement("Amount", "49")))),
+                    new XElement("Order",
+                        new XElement("OrderId", "1002"),
+                        new XElement("Product", "MegaWidget"),
+                        new XElement("Quantity", "2"),
+                        new XElement("HasDiscount", "false"),
+                        new XElement("Signature", TinyPngBase64),
+                        new XElement("LineItems",
+                            new XElement("Item",
+                                new XElement("Description", "Core module"),
+                                new XElement("Amount", "249")),
+                            new XElement("Item",
+                                new XElement("Description", "Support"),
+                                new XElement("Amount", "79"))))),
+                new XElement("Partners",
+                    new XElement("Partner",
+                        new XElement("Name", "Partner A"),
+                        new XElement("Role", "Reseller")),
+                    new XElement("Partner",
+                        new XElement("Name", "Partner B"),
+                        new XElement("Role", "Distributor"))),
+                new XElement("Inventory",
+                    new XElement("Item",
+                        new XElement("Name", "WidgetA"),
+                        new XElement("Stock", "257")),
+                    new XElement("Item",
+                        new XElement("Name", "WidgetB"),
+                        new XElement("Stock", "143")))));
+
+        private static readonly Lazy<CompiledTemplate> s_CompiledComplexTemplate = new Lazy<CompiledTemplate>(() =>
+            DocumentAssembler.Core.DocumentAssembler.CompileTemplate(ComplexScenario.Template.Value));
+
+        private static readonly Lazy<WmlDocument> s_TrackedRevisionsDocument = new Lazy<WmlDocument>(CreateTrackedRevisionsDocument);
+
+        private static readonly Lazy<XDocument> s_AssembledComplexMainPart = new Lazy<XDocument>(() =>
+            GetMainDocumentPart(AssembleComplex()));
+
+        private static readonly Lazy<Scenario> s_ImageScenario = new Lazy<Scenario>(CreateImageScenario);
+
+        private static readonly ConcurrentDictionary<string, bool> s_ReportedTemplateErrors = new ConcurrentDictionary<string, bool>();
+
+        public static IReadOnlyList<BenchmarkCase> All { get; } = new[]
+        {
+            CreateAssemblyCase(SimpleScenario),
+            CreateAssemblyCase(ComplexScenario),
+            BenchmarkCase.Create(
+                "AssembleCompiled/Complex",
+                () => new XElement(ComplexScenario.Data),
+                data => s_CompiledComplexTemplate.Value.Assemble(data, out _)),
+            BenchmarkCase.Create(
+                "SchemaExtraction/Complex",
+                () => ComplexScenario.Template.Value,
+                template => TemplateSchemaExtractor.ExtractXmlSchema(template)),
+            BenchmarkCase.Create(
+                "Revisions/Accept",
+                () => s_TrackedRevisionsDocument.Value,
+                document => RevisionAccepter.AcceptRevisions(document)),
+            BenchmarkCase.Create(
+                "Revisions/Reject",
+                () => s_TrackedRevisionsDocument.Value,
+                document => RevisionProcessor.RejectRevisions(document)),
+            // Replace rewrites the paragraphs in place, so every invocation gets its own copy of the main part
+            BenchmarkCase.Create(
+                "OpenXmlRegex/Replace",
+                () => new XDocument(s_AssembledComplexMainPart.Value),
+                mainPart => OpenXmlRegex.Replace(mainPart.Descendants(W.p), s_DigitsRegex, "#", (_, _) => true)),
+            BenchmarkCase.Create(
+                "Images/Embed",
+                () => new XElement(s_ImageScenario.Value.Data),
+                data => Assemble(s_ImageScenario.Value, data)),
+        };
+
+        public static IReadOnlyList<ThroughputCase> Throughput { get; } = new[]
+        {
+            CreateThroughputCase(SimpleScenario),
+            CreateThroughputCase(ComplexScenario),
+        };
+
+        private static BenchmarkCase CreateAssemblyCase(Scenario scenario) =>
+            BenchmarkCase.Create(
+                "Assemble/" + scenario.Name,
+                () => new XElement(scenario.Data),
+                data => Assemble(scenario, data));
+
+        private static ThroughputCase CreateThroughputCase(Scenario scenario) =>
+            new ThroughputCase(
+                "Assemble/" + scenario.Name,
+                () => new XElement(scenario.Data),
+                data => Assemble(scenario, data),
+                GetContentFingerprint);
+
+        private static WmlDocument Assemble(Scenario scenario, XElement data)
+        {
+            var assembled = DocumentAssembler.Core.DocumentAssembler.AssembleDocument(scenario.Template.Value, data, out var templateError);
+            // the bundled templates are intentionally minimal; say so once instead of once per invocation. ContainsKey
+            // does not lock, so throughput workers do not contend here.
+            if (templateError && !s_ReportedTemplateErrors.ContainsKey(scenario.Name) && s_ReportedTemplateErrors.TryAdd(scenario.Name, true))
+            {
+                Console.WriteLine($"Warning: template reported errors during the {scenario.Name} scenario");
+            }
+            return assembled;
+        }
+
+        private static WmlDocument AssembleComplex() => Assemble(ComplexScenario, new XElement(ComplexScenario.Data));
+
+        // An assembled Complex document in which every number has been replaced with tracked revisions, giving both
+        // w:ins and w:del markup to accept or reject.
+        private static WmlDocument CreateTrackedRevisionsDocument()
+        {
+            using var streamDoc = new OpenXmlMemoryStreamDocument(AssembleComplex());
+            using (var wDoc = streamDoc.GetWordprocessingDocument())
+            {
+                var mainPart = wDoc.MainDocumentPart!;
+                var xDoc = mainPart.GetXDocument();
+                OpenXmlRegex.Replace(xDoc.Descendants(W.p), s_DigitsRegex, "#", (_, _) => true, true, "PerfMeasurementTool");
+                mainPart.PutXDocument();
+            }
+            return streamDoc.GetModifiedWmlDocument();
+        }
+
+        private static XDocument GetMainDocumentPart(WmlDocument document)
+        {
+            using var ms = new MemoryStream(document.DocumentByteArray, false);
+            using var wDoc = WordprocessingDocument.Open(ms, false);
+            return wDoc.MainDocumentPart!.GetXDocument();
+        }
+
+        // The text and the number of drawings of the main part, headers and footers. Part and relationship ids are
+        // left out, as they are not guaranteed to be the same for two assemblies of the same data.
+        private static string GetContentFingerprint(WmlDocument document)
+        {
+            using var ms = new MemoryStream(document.DocumentByteArray, false);
+            using var wDoc = WordprocessingDocument.Open(ms, false);
+            var mainPart = wDoc.MainDocumentPart!;
+            var parts = new OpenXmlPart[] { mainPart }.Concat(mainPart.HeaderParts).Concat(mainPart.FooterParts);
+            return string.Join("\n", parts.Select(part =>
+            {
+                var xDoc = part.GetXDocument();
+                return string.Concat(xDoc.Descendants(W.t).Select(t => (string)t)) + "|" + xDoc.Descendants(W.drawing).Count();
+            }));
+        }
+
+        // A generated template repeating an image over distinct PNGs, so that every image is decoded, measured and
+        // stored in its own ImagePart.
+        private static Scenario CreateImageScenario()
+        {
+            using var ms = new MemoryStream();
+            using (var wDoc = WordprocessingDocument.Create(ms, DocumentFormat.OpenXml.WordprocessingDocumentType.Document))
+            {
+                var mainPart = wDoc.AddMainDocumentPart();
+                var body = new Body(new[]
+                {
+                    "<# <Repeat Select=\"Product\" /> #>",
+                    "<# <Content Select=\"Name\" /> #>",
+                    "<# <Image Select=\"Photo\" /> #>",
+                    "<# <EndRepeat /> #>",
+                }.Select(text =>
+                    new Paragraph(
+                        new Run(
+                            new Text(text) { Space = DocumentFormat.OpenXml.SpaceProcessingModeValues.Preserve }))));
+                mainPart.Document = new Document(body);
+                mainPart.Document.Save();
+            }
+
+            var data = new XElement("Products",
+                Enumerable.Range(0, ImageCount).Select(i =>
+                    new XElement("Product",
+                        new XElement("Name", $"Product {i + 1}"),
+                        new XElement("Photo", GenerateImageBase64(i)))));
+            return new Scenario("Images", new WmlDocument("ImageTemplate.docx", ms.ToArray()), data);
+        }
+
+        private static string GenerateImageBase64(int index)
+        {
+            using var bitmap = new SKBitmap(64, 48);
+            using (var canvas = new SKCanvas(bitmap))
+            {
+                canvas.Clear(new SKColor((byte)(index * 37), (byte)(index * 11), (byte)(index * 73)));
+            }
+
+            using var image = SKImage.FromBitmap(bitmap);
+            using var data = image.Encode(SKEncodedImageFormat.Png, 100);
+            return Convert.ToBase64String(data.ToArray());
+        }
+
+        private static string ResolveTemplatePath(string fileName) =>
+            Path.Combine(TemplateDirectory, fileName);
+
+        private sealed class Scenario
+        {
+            public Scenario(string name, string templatePath, XElement data)
+            {
+                Name = name;
+                Template = new Lazy<WmlDocument>(() => new WmlDocument(templatePath));
+                Data = data;
+            }
+
+            public Scenario(string name, WmlDocument template, XElement data)
+            {
+                Name = name;
+                Template = new Lazy<WmlDocument>(template);
+                Data = data;
+            }
+
+            public string Name { get; }
+            public Lazy<WmlDocument> Template { get; }
+            public XElement Data { get; }
+        }
+    }
+}
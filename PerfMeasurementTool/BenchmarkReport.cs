@@ -0,0 +1,135 @@
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+using System.Linq;
+using System.Runtime.InteropServices;
+using System.Text;
+using System.Text.Json;
+
+namespace PerfMeasurementTool
+{
+    /// <summary>
+    /// The results of one run together with the environment they were measured in, as written to and read from
+    /// the JSON export.
+    /// </summary>
+    internal sealed record BenchmarkReport(
+        DateTimeOffset CreatedAt,
+        string Runtime,
+        string OperatingSystem,
+        int ProcessorCount,
+        BenchmarkSettings Settings,
+        IReadOnlyList<BenchmarkResult> Results)
+    {
+        internal static readonly JsonSerializerOptions JsonOptions = new JsonSerializerOptions
+        {
+            PropertyNamingPolicy = JsonNamingPolicy.CamelCase,
+            WriteIndented = true,
+        };
+
+        private static readonly string[] CsvColumns =
+        {
+            "name", "samples", "invocationsPerSample", "meanMs", "stdDevMs", "minMs", "p50Ms", "p95Ms", "p99Ms", "maxMs",
+            "allocatedBytesPerOp", "gen0Per1000Ops", "gen1Per1000Ops", "gen2Per1000Ops",
+        };
+
+        public static BenchmarkReport Create(BenchmarkSettings settings, IReadOnlyList<BenchmarkResult> results) =>
+            new BenchmarkReport(
+                DateTimeOffset.UtcNow,
+                RuntimeInformation.FrameworkDescription,
+                RuntimeInformation.OSDescription,
+                Environment.ProcessorCount,
+                settings,
+                results);
+
+        public static BenchmarkReport Load(string path) =>
+            JsonSerializer.Deserialize<BenchmarkReport>(File.ReadAllText(path), JsonOptions)
+            ?? throw new InvalidDataException($"{path} does not contain a benchmark report.");
+
+        public void WriteJson(string path) =>
+            File.WriteAllText(path, JsonSerializer.Serialize(this, JsonOptions));
+
+        public void WriteCsv(string path)
+        {
+            var csv = new StringBuilder();
+            csv.AppendLine(string.Join(",", CsvColumns));
+            foreach (var r in Results)
+            {
+                csv.AppendLine(string.Join(",",
+                    Quote(r.Name),
+                    Format(r.Samples),
+                    Format(r.InvocationsPerSample),
+                    Format(r.MeanMs),
+                    Format(r.StdDevMs),
+                    Format(r.MinMs),
+                    Format(r.P50Ms),
+                    Format(r.P95Ms),
+                    Format(r.P99Ms),
+                    Format(r.MaxMs),
+                    Format(r.AllocatedBytesPerOp),
+                    Format(r.Gen0Per1000Ops),
+                    Format(r.Gen1Per1000Ops),
+                    Format(r.Gen2Per1000Ops)));
+            }
+            File.WriteAllText(path, csv.ToString());
+        }
+
+        public void WriteTable(TextWriter writer)
+        {
+            writer.WriteLine($"{"Case",-26} {"Mean",9} {"StdDev",9} {"p50",9} {"p95",9} {"p99",9} {"Alloc/op",12} {"Gen0",7} {"Gen1",7} {"Gen2",7}");
+            foreach (var r in Results)
+            {
+                writer.WriteLine(string.Create(CultureInfo.InvariantCulture,
+                    $"{r.Name,-26} {r.MeanMs,9:F3} {r.StdDevMs,9:F3} {r.P50Ms,9:F3} {r.P95Ms,9:F3} {r.P99Ms,9:F3} {FormatBytes(r.AllocatedBytesPerOp),12} {r.Gen0Per1000Ops,7:F1} {r.Gen1Per1000Ops,7:F1} {r.Gen2Per1000Ops,7:F1}"));
+            }
+            writer.WriteLine("Timings in milliseconds per operation; GC counts per 1000 operations.");
+        }
+
+        /// <summary>
+        /// Compares the median time and the allocations of every case with the same case in <paramref name="baseline"/>
+        /// and returns a line for each that grew by more than <paramref name="maxRegressionPercent"/>. Cases missing
+        /// from either report are not compared.
+        /// </summary>
+        public IReadOnlyList<string> FindRegressions(BenchmarkReport baseline, double maxRegressionPercent)
+        {
+            var regressions = new List<string>();
+            var baselineResults = baseline.Results.ToDictionary(r => r.Name, StringComparer.Ordinal);
+            foreach (var current in Results)
+            {
+                if (!baselineResults.TryGetValue(current.Name, out var previous))
+                {
+                    continue;
+                }
+
+                var timeChange = PercentChange(previous.P50Ms, current.P50Ms);
+                if (timeChange > maxRegressionPercent)
+                {
+                    regressions.Add(string.Create(CultureInfo.InvariantCulture,
+                        $"{current.Name}: p50 {previous.P50Ms:F3} ms -> {current.P50Ms:F3} ms (+{timeChange:F1}%)"));
+                }
+
+                var allocationChange = PercentChange(previous.AllocatedBytesPerOp, current.AllocatedBytesPerOp);
+                if (allocationChange > maxRegressionPercent)
+                {
+                    regressions.Add(string.Create(CultureInfo.InvariantCulture,
+                        $"{current.Name}: allocated {FormatBytes(previous.AllocatedBytesPerOp)} -> {FormatBytes(current.AllocatedBytesPerOp)} per op (+{allocationChange:F1}%)"));
+                }
+            }
+            return regressions;
+        }
+
+        private static double PercentChange(double previous, double current) =>
+            previous > 0 ? (current - previous) / previous * 100 : 0;
+
+        internal static string FormatBytes(long bytes) =>
+            bytes >= 1024 * 1024
+                ? string.Create(CultureInfo.InvariantCulture, $"{bytes / (1024.0 * 1024.0):F2} MB")
+                : string.Create(CultureInfo.InvariantCulture, $"{bytes / 1024.0:F1} KB");
+
+        internal static string Format(IFormattable value) =>
+            value.ToString(null, CultureInfo.InvariantCulture);
+
+        internal static string Quote(string value) =>
+            "\"" + value.Replace("\"", "\"\"") + "\"";
+    }
+}
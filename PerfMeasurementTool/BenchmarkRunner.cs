@@ -0,0 +1,131 @@
+using System;
+using System.Diagnostics;
+using System.Linq;
+
+namespace PerfMeasurementTool
+{
+    /// <summary>
+    /// How a benchmark is run: warm-up invocations that are not recorded, then a number of samples, each timing
+    /// one or more invocations of the operation.
+    /// </summary>
+    internal sealed record BenchmarkSettings(int WarmupCount, int SampleCount, int InvocationsPerSample);
+
+    /// <summary>
+    /// One measured operation. The input is created before the clock starts, so operations that modify their input
+    /// (revision accept/reject, regex replace) get a fresh one per invocation without timing the copy.
+    /// </summary>
+    internal sealed class BenchmarkCase
+    {
+        private BenchmarkCase(string name, Func<object> createInput, Action<object> run)
+        {
+            Name = name;
+            CreateInput = createInput;
+            Run = run;
+        }
+
+        public string Name { get; }
+        public Func<object> CreateInput { get; }
+        public Action<object> Run { get; }
+
+        public static BenchmarkCase Create<TInput>(string name, Func<TInput> createInput, Action<TInput> run)
+            where TInput : notnull =>
+            new BenchmarkCase(name, () => createInput(), input => run((TInput)input));
+    }
+
+    internal sealed record BenchmarkResult(
+        string Name,
+        int Samples,
+        int InvocationsPerSample,
+        double MeanMs,
+        double StdDevMs,
+        double MinMs,
+        double P50Ms,
+        double P95Ms,
+        double P99Ms,
+        double MaxMs,
+        long AllocatedBytesPerOp,
+        double Gen0Per1000Ops,
+        double Gen1Per1000Ops,
+        double Gen2Per1000Ops);
+
+    internal static class BenchmarkRunner
+    {
+        public static BenchmarkResult Run(BenchmarkCase benchmark, BenchmarkSettings settings)
+        {
+            for (var i = 0; i < settings.WarmupCount; i++)
+            {
+                benchmark.Run(benchmark.CreateInput());
+            }
+
+            // start from a settled heap, so that a collection owed by the warm-up does not land in the first sample
+            GC.Collect();
+            GC.WaitForPendingFinalizers();
+            GC.Collect();
+
+            var samples = new double[settings.SampleCount];
+            var inputs = new object[settings.InvocationsPerSample];
+            long allocatedBytes = 0;
+            var collections = new int[3];
+            for (var sample = 0; sample < settings.SampleCount; sample++)
+            {
+                for (var i = 0; i < inputs.Length; i++)
+                {
+                    inputs[i] = benchmark.CreateInput();
+                }
+
+                var gen0 = GC.CollectionCount(0);
+                var gen1 = GC.CollectionCount(1);
+                var gen2 = GC.CollectionCount(2);
+                // precise: operations may allocate on other threads (parallel part processing, schema extraction)
+                var allocatedBefore = GC.GetTotalAllocatedBytes(precise: true);
+                var start = Stopwatch.GetTimestamp();
+                foreach (var input in inputs)
+                {
+                    benchmark.Run(input);
+                }
+                var elapsed = Stopwatch.GetElapsedTime(start);
+                allocatedBytes += GC.GetTotalAllocatedBytes(precise: true) - allocatedBefore;
+                collections[0] += GC.CollectionCount(0) - gen0;
+                collections[1] += GC.CollectionCount(1) - gen1;
+                collections[2] += GC.CollectionCount(2) - gen2;
+
+                samples[sample] = elapsed.TotalMilliseconds / inputs.Length;
+                Array.Clear(inputs);
+            }
+
+            var operations = (double)settings.SampleCount * settings.InvocationsPerSample;
+            var sorted = samples.OrderBy(s => s).ToArray();
+            var mean = samples.Average();
+            var variance = samples.Length > 1 ? samples.Sum(s => (s - mean) * (s - mean)) / (samples.Length - 1) : 0;
+            return new BenchmarkResult(
+                benchmark.Name,
+                settings.SampleCount,
+                settings.InvocationsPerSample,
+                mean,
+                Math.Sqrt(variance),
+                sorted[0],
+                Percentile(sorted, 50),
+                Percentile(sorted, 95),
+                Percentile(sorted, 99),
+                sorted[^1],
+                (long)(allocatedBytes / operations),
+                collections[0] * 1000 / operations,
+                collections[1] * 1000 / operations,
+                collections[2] * 1000 / operations);
+        }
+
+        // Linear interpolation between the closest ranks, so p99 of a small sample is not simply its maximum.
+        internal static double Percentile(double[] sorted, double percentile)
+        {
+            if (sorted.Length == 1)
+            {
+                return sorted[0];
+            }
+
+            var rank = percentile / 100 * (sorted.Length - 1);
+            var lower = (int)Math.Floor(rank);
+            var upper = Math.Min(lower + 1, sorted.Length - 1);
+            return sorted[lower] + (sorted[upper] - sorted[lower]) * (rank - lower);
+        }
+    }
+}
@@ -1,139 +1,292 @@
-using DocumentAssembler.Core;
 using System;
-using System.Diagnostics;
+using System.Collections.Generic;
 using System.Globalization;
 using System.IO;
 using System.Linq;
-using System.Xml.Linq;
+using System.Runtime;
 
 namespace PerfMeasurementTool
 {
     internal static class Program
     {
-        private static readonly int MeasurementRuns = 10;
-
-        private static readonly string TemplateDirectory = Path.GetFullPath(
-            Path.Combine(AppDomain.CurrentDomain.BaseDirectory, "..", "..", ".."));
-
-        private const string TinyPngBase64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR4nGNgYAAAAAMAASsJTYQAAAAASUVORK5CYII=";
-
-        private static readonly Scenario SimpleScenario = new Scenario(
-            "Simple",
-            ResolveTemplatePath("SimpleTemplate.docx"),
-            new XElement("Customer",
-                new XElement("CustomerId", "C123"),
-                new XElement("Name", "Jane Doe"),
-                new XElement("Email", "jane.doe@example.com"),
-                new XElement("Phone", "555-0100"),
-                new XElement("Photo", TinyPngBase64)));
-
-        private static readonly Scenario ComplexScenario = new Scenario(
-            "Complex",
-            ResolveTemplatePath("ComplexTemplate.docx"),
-            new XElement("Company",
-                new XElement("Name", "Contoso Ltd."),
-                new XElement("Address",
-                    new XElement("Street", "1 Infinite Loop"),
-                    new XElement("City", "Cupertino"),
-                    new XElement("PostalCode", "95014")),
-                new XElement("HasPremium", "true"),
-                new XElement("PremiumCode", "PRM-001"),
-                new XElement("Orders",
-                    new XElement("Order",
-                        new XElement("OrderId", "1001"),
-                        new XElement("Product", "UltraWidget"),
-                        new XElement("Quantity", "3"),
-                        new XElement("HasDiscount", "true"),
-                        new XElement("Discount", "5%"),
-                        new XElement("Signature", TinyPngBase64),
-                        new XElement("LineItems",
-                            new XElement("Item",
-                                new XElement("Description", "Main widget"),
-                                new XElement("Amount", "199")),
-                            new XElement("Item",
-                                new XElement("Description", "Add-on"),
-                                new XElement("Amount", "49")))),
-                    new XElement("Order",
-                        new XElement("OrderId", "1002"),
-                        new XElement("Product", "MegaWidget"),
-                        new XElement("Quantity", "2"),
-                        new XElement("HasDiscount", "false"),
-                        new XElement("Signature", TinyPngBase64),
-                        new XElement("LineItems",
-                            new XElement("Item",
-                                new XElement("Description", "Core module"),
-                                new XElement("Amount", "249")),
-                            new XElement("Item",
-                                new XElement("Description", "Support"),
-                                new XElement("Amount", "79"))))),
-                new XElement("Partners",
-                    new XElement("Partner",
-                        new XElement("Name", "Partner A"),
-                        new XElement("Role", "Reseller")),
-                    new XElement("Partner",
-                        new XElement("Name", "Partner B"),
-                        new XElement("Role", "Distributor"))),
-                new XElement("Inventory",
-                    new XElement("Item",
-                        new XElement("Name", "WidgetA"),
-                        new XElement("Stock", "257")),
-                    new XElement("Item",
-                        new XElement("Name", "WidgetB"),
-                        new XElement("Stock", "143")))));
-
-
-        private static int Main()
+        private const int Success = 0;
+        private const int RegressionDetected = 1;
+        private const int InvalidArguments = 2;
+        private const int ConcurrencyFailure = 3;
+
+        private const string Usage =
+@"Usage: PerfMeasurementTool [options]
+  --list                      List the benchmark cases and exit.
+  --filter <text>             Run only cases whose name contains <text> (repeatable).
+  --warmup <n>                Unrecorded invocations before measuring (default 5).
+  --samples <n>               Recorded samples per case (default 30).
+  --invocations <n>           Invocations timed together in one sample (default 1).
+  --json <path>               Write the results as JSON.
+  --csv <path>                Write the results as CSV.
+  --baseline <path>           Compare with a JSON report written by --json.
+  --max-regression <percent>  Allowed growth of p50 time and allocations over the baseline (default 10).
+  --throughput                Measure documents/second with concurrent workers instead of latency.
+  --threads <n,n,...>         Worker counts for --throughput (default 1, 2, 4, ... up to the processor count).
+  --duration <seconds>        Measured time per worker count for --throughput (default 5).
+Exit codes: 0 success, 1 regression over the baseline, 2 invalid arguments,
+            3 a worker failed or produced a different document under --throughput.";
+
+        private static int Main(string[] args)
         {
-            Console.WriteLine("PerfMeasurementTool - DocumentAssembler baseline profiling");
-            Console.WriteLine($"{MeasurementRuns} runs per scenario (first run discarded). Timings in milliseconds.\n");
+            Options options;
+            try
+            {
+                options = Options.Parse(args);
+            }
+            catch (ArgumentException e)
+            {
+                Console.Error.WriteLine(e.Message);
+                Console.Error.WriteLine(Usage);
+                return InvalidArguments;
+            }
+
+            if (options.Throughput)
+            {
+                return RunThroughput(options);
+            }
+
+            var cases = BenchmarkCases.All.Where(c => options.Matches(c.Name)).ToList();
+            if (options.List)
+            {
+                cases.ForEach(c => Console.WriteLine(c.Name));
+                return Success;
+            }
+            if (cases.Count == 0)
+            {
+                Console.Error.WriteLine("No benchmark case matches the filter.");
+                return InvalidArguments;
+            }
+
+            Console.WriteLine("PerfMeasurementTool - DocumentAssembler benchmarks");
+            Console.WriteLine($"{options.Settings.WarmupCount} warm-up invocations, {options.Settings.SampleCount} samples of {options.Settings.InvocationsPerSample} invocation(s) per case.\n");
+
+            var results = new List<BenchmarkResult>();
+            foreach (var benchmark in cases)
+            {
+                Console.WriteLine($"Running {benchmark.Name}...");
+                results.Add(BenchmarkRunner.Run(benchmark, options.Settings));
+            }
+
+            var report = BenchmarkReport.Create(options.Settings, results);
+            Console.WriteLine();
+            report.WriteTable(Console.Out);
 
-            RunScenario(SimpleScenario);
-            RunScenario(ComplexScenario);
+            if (options.JsonPath != null)
+            {
+                report.WriteJson(options.JsonPath);
+                Console.WriteLine($"JSON written to {options.JsonPath}");
+            }
+            if (options.CsvPath != null)
+            {
+                report.WriteCsv(options.CsvPath);
+                Console.WriteLine($"CSV written to {options.CsvPath}");
+            }
+
+            if (options.BaselinePath != null)
+            {
+                var regressions = report.FindRegressions(BenchmarkReport.Load(options.BaselinePath), options.MaxRegressionPercent);
+                if (regressions.Count > 0)
+                {
+                    Console.WriteLine($"\nRegressions over {options.BaselinePath} (threshold {options.MaxRegressionPercent.ToString(CultureInfo.InvariantCulture)}%):");
+                    foreach (var regression in regressions)
+                    {
+                        Console.WriteLine("  " + regression);
+                    }
+                    return RegressionDetected;
+                }
+                Console.WriteLine($"\nNo regression over {options.BaselinePath}.");
+            }
 
-            return 0;
+            return Success;
         }
 
-        private static void RunScenario(Scenario scenario)
+        private static int RunThroughput(Options options)
         {
-            Console.WriteLine($"Scenario: {scenario.Name}");
-            var measurements = MeasureScenario(scenario);
-            Console.WriteLine($"Raw timings: {string.Join(", ", measurements.Select(m => m.ToString("F1", CultureInfo.InvariantCulture)))}");
+            var cases = BenchmarkCases.Throughput.Where(c => options.Matches(c.Name)).ToList();
+            if (options.List)
+            {
+                cases.ForEach(c => Console.WriteLine(c.Name));
+                return Success;
+            }
+            if (cases.Count == 0)
+            {
+                Console.Error.WriteLine("No throughput case matches the filter.");
+                return InvalidArguments;
+            }
 
-            var trimmed = measurements.Skip(1).ToArray();
-            var average = trimmed.Average();
-            Console.WriteLine($"Average (drop first): {average.ToString("F1", CultureInfo.InvariantCulture)} ms\n");
+            Console.WriteLine("PerfMeasurementTool - DocumentAssembler throughput");
+            Console.WriteLine($"{string.Join(", ", options.ThreadCounts)} worker(s), {options.Duration.TotalSeconds.ToString(CultureInfo.InvariantCulture)} s each after {options.Settings.WarmupCount} warm-up invocations per worker; {Environment.ProcessorCount} processors, {(GCSettings.IsServerGC ? "server" : "workstation")} GC.\n");
+
+            var results = new List<ThroughputResult>();
+            var failures = new List<string>();
+            foreach (var benchmark in cases)
+            {
+                Console.WriteLine($"Running {benchmark.Name}...");
+                results.AddRange(ThroughputRunner.Run(benchmark, options.ThreadCounts, options.Duration, options.Settings.WarmupCount, failures));
+            }
+
+            var report = ThroughputReport.Create(options.Duration, results);
+            Console.WriteLine();
+            report.WriteTable(Console.Out);
+
+            if (options.JsonPath != null)
+            {
+                report.WriteJson(options.JsonPath);
+                Console.WriteLine($"JSON written to {options.JsonPath}");
+            }
+            if (options.CsvPath != null)
+            {
+                report.WriteCsv(options.CsvPath);
+                Console.WriteLine($"CSV written to {options.CsvPath}");
+            }
+
+            if (failures.Count > 0)
+            {
+                Console.WriteLine("\nFailures under concurrent load:");
+                foreach (var failure in failures)
+                {
+                    Console.WriteLine("  " + failure);
+                }
+                return ConcurrencyFailure;
+            }
+
+            return Success;
         }
 
-        private static double[] MeasureScenario(Scenario scenario)
+        private sealed class Options
         {
-            var results = new double[MeasurementRuns];
-            for (var i = 0; i < MeasurementRuns; i++)
-            {
-                var template = scenario.CreateTemplate();
-                var dataCopy = new XElement(scenario.Data);
+            public BenchmarkSettings Settings { get; private set; } = new BenchmarkSettings(WarmupCount: 5, SampleCount: 30, InvocationsPerSample: 1);
+            public List<string> Filters { get; } = new List<string>();
+            public bool List { get; private set; }
+            public string? JsonPath { get; private set; }
+            public string? CsvPath { get; private set; }
+            public string? BaselinePath { get; private set; }
+            public double MaxRegressionPercent { get; private set; } = 10;
+            public bool Throughput { get; private set; }
+            public IReadOnlyList<int> ThreadCounts { get; private set; } = DefaultThreadCounts();
+            public TimeSpan Duration { get; private set; } = TimeSpan.FromSeconds(5);
 
-                var sw = Stopwatch.StartNew();
-                DocumentAssembler.Core.DocumentAssembler.AssembleDocument(template, dataCopy, out var templateError);
-                sw.Stop();
+            public bool Matches(string name) =>
+                Filters.Count == 0 || Filters.Any(f => name.Contains(f, StringComparison.OrdinalIgnoreCase));
 
-                if (templateError)
+            public static Options Parse(string[] args)
+            {
+                var options = new Options();
+                for (var i = 0; i < args.Length; i++)
                 {
-                    Console.WriteLine($"Warning: template reported errors during {scenario.Name} run {i + 1}");
+                    switch (args[i])
+                    {
+                        case "--list":
+                            options.List = true;
+                            break;
+                        case "--filter":
+                            options.Filters.Add(Value(args, ref i));
+                            break;
+                        case "--warmup":
+                            options.Settings = options.Settings with { WarmupCount = Count(args, ref i, minimum: 0) };
+                            break;
+                        case "--samples":
+                            options.Settings = options.Settings with { SampleCount = Count(args, ref i, minimum: 1) };
+                            break;
+                        case "--invocations":
+                            options.Settings = options.Settings with { InvocationsPerSample = Count(args, ref i, minimum: 1) };
+                            break;
+                        case "--json":
+                            options.JsonPath = Value(args, ref i);
+                            break;
+                        case "--csv":
+                            options.CsvPath = Value(args, ref i);
+                            break;
+                        case "--baseline":
+                            options.BaselinePath = Value(args, ref i);
+                            break;
+                        case "--max-regression":
+                            var name = args[i];
+                            if (!double.TryParse(Value(args, ref i), NumberStyles.Float, CultureInfo.InvariantCulture, out var percent) || percent < 0)
+                            {
+                                throw new ArgumentException($"{name} expects a non-negative number.");
+                            }
+                            options.MaxRegressionPercent = percent;
+                            break;
+                        case "--throughput":
+                            options.Throughput = true;
+                            break;
+                        case "--threads":
+                            options.ThreadCounts = ThreadCountList(args, ref i);
+                            break;
+                        case "--duration":
+                            options.Duration = TimeSpan.FromSeconds(Count(args, ref i, minimum: 1));
+                            break;
+                        default:
+                            throw new ArgumentException($"Unknown option {args[i]}.");
+                    }
                 }
 
-                results[i] = sw.Elapsed.TotalMilliseconds;
+                if (options.BaselinePath != null && !File.Exists(options.BaselinePath))
+                {
+                    throw new ArgumentException($"Baseline {options.BaselinePath} does not exist.");
+                }
+                if (options.Throughput && options.BaselinePath != null)
+                {
+                    throw new ArgumentException("--baseline compares latency reports and cannot be combined with --throughput.");
+                }
+                return options;
             }
 
-            return results;
-        }
+            private static string Value(string[] args, ref int i)
+            {
+                if (i + 1 >= args.Length)
+                {
+                    throw new ArgumentException($"{args[i]} expects a value.");
+                }
+                return args[++i];
+            }
 
-        private static string ResolveTemplatePath(string fileName) =>
-            Path.Combine(TemplateDirectory, fileName);
+            // 1, 2, 4, ... and the processor count itself when it is not a power of two
+            private static IReadOnlyList<int> DefaultThreadCounts()
+            {
+                var counts = new List<int>();
+                for (var threads = 1; threads < Environment.ProcessorCount; threads *= 2)
+                {
+                    counts.Add(threads);
+                }
+                counts.Add(Environment.ProcessorCount);
+                return counts;
+            }
 
-        private sealed record Scenario(string Name, string TemplatePath, XElement Data)
-        {
-            public WmlDocument CreateTemplate() => new WmlDocument(TemplatePath);
-        }
+            private static IReadOnlyList<int> ThreadCountList(string[] args, ref int i)
+            {
+                var name = args[i];
+                var counts = new List<int>();
+                foreach (var item in Value(args, ref i).Split(',', StringSplitOptions.TrimEntries | StringSplitOptions.RemoveEmptyEntries))
+                {
+                    if (!int.TryParse(item, NumberStyles.Integer, CultureInfo.InvariantCulture, out var count) || count < 1)
+                    {
+                        throw new ArgumentException($"{name} expects a comma-separated list of worker counts of at least 1.");
+                    }
+                    counts.Add(count);
+                }
+                if (counts.Count == 0)
+                {
+                    throw new ArgumentException($"{name} expects at least one worker count.");
+                }
+                return counts;
+            }
 
+            private static int Count(string[] args, ref int i, int minimum)
+            {
+                var name = args[i];
+                if (!int.TryParse(Value(args, ref i), NumberStyles.Integer, CultureInfo.InvariantCulture, out var count) || count < minimum)
+                {
+                    throw new ArgumentException($"{name} expects a whole number of at least {minimum}.");
+                }
+                return count;
+            }
+        }
     }
 }
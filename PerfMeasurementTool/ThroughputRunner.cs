@@ -0,0 +1,286 @@
+using DocumentAssembler.Core;
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.Globalization;
+using System.IO;
+using System.Linq;
+using System.Runtime;
+using System.Runtime.InteropServices;
+using System.Text;
+using System.Text.Json;
+using System.Threading;
+using System.Xml.Linq;
+
+namespace PerfMeasurementTool
+{
+    /// <summary>
+    /// An assembly run by many workers at once. <see cref="Fingerprint"/> reduces an assembled document to its
+    /// visible content, so documents produced under load can be compared with the one produced by a single thread.
+    /// </summary>
+    internal sealed class ThroughputCase
+    {
+        public ThroughputCase(string name, Func<XElement> createInput, Func<XElement, WmlDocument> run, Func<WmlDocument, string> fingerprint)
+        {
+            Name = name;
+            CreateInput = createInput;
+            Run = run;
+            Fingerprint = fingerprint;
+        }
+
+        public string Name { get; }
+        public Func<XElement> CreateInput { get; }
+        public Func<XElement, WmlDocument> Run { get; }
+        public Func<WmlDocument, string> Fingerprint { get; }
+    }
+
+    internal sealed record ThroughputResult(
+        string Name,
+        int Threads,
+        double Seconds,
+        long Documents,
+        double DocumentsPerSecond,
+        double Speedup,
+        double ScalingEfficiency,
+        double P50Ms,
+        double P99Ms,
+        long AllocatedBytesPerDocument,
+        long LockContentions,
+        double LockContentionsPer1000Documents,
+        double GcPausePercent,
+        int Gen2Collections,
+        int Failures);
+
+    internal static class ThroughputRunner
+    {
+        // Workers check their first document and every VerifyInterval-th after it; fingerprinting every document would
+        // make reading packages, not assembling them, the measured work.
+        private const int VerifyInterval = 16;
+
+        private const int MaxReportedFailures = 10;
+
+        /// <summary>
+        /// Runs <paramref name="benchmark"/> once per entry of <paramref name="threadCounts"/>. Speedup and scaling
+        /// efficiency are relative to the first entry, so the list normally starts with 1.
+        /// </summary>
+        public static IReadOnlyList<ThroughputResult> Run(ThroughputCase benchmark, IReadOnlyList<int> threadCounts, TimeSpan duration,
+            int warmupCount, ICollection<string> failureMessages)
+        {
+            var expected = benchmark.Fingerprint(benchmark.Run(benchmark.CreateInput()));
+            var results = new List<ThroughputResult>();
+            foreach (var threads in threadCounts)
+            {
+                results.Add(RunWorkers(benchmark, expected, threads, duration, warmupCount, results.FirstOrDefault(), failureMessages));
+            }
+            return results;
+        }
+
+        private static ThroughputResult RunWorkers(ThroughputCase benchmark, string expected, int threads, TimeSpan duration,
+            int warmupCount, ThroughputResult? reference, ICollection<string> failureMessages)
+        {
+            var run = new WorkerRun(benchmark, expected, threads, warmupCount);
+            var workers = Enumerable.Range(0, threads)
+                .Select(i => new Thread(run.Work) { IsBackground = true, Name = $"{benchmark.Name} worker {i + 1}" })
+                .ToList();
+            workers.ForEach(w => w.Start());
+
+            // first phase: every worker has warmed up; settle the heap before the second phase releases them
+            run.Barrier.SignalAndWait();
+            GC.Collect();
+            GC.WaitForPendingFinalizers();
+            GC.Collect();
+
+            var contentions = Monitor.LockContentionCount;
+            var pause = GC.GetTotalPauseDuration();
+            var allocated = GC.GetTotalAllocatedBytes(precise: true);
+            var gen2 = GC.CollectionCount(2);
+            var start = Stopwatch.GetTimestamp();
+            run.Barrier.SignalAndWait();
+            Thread.Sleep(duration);
+            run.RequestStop();
+            workers.ForEach(w => w.Join());
+            var elapsed = Stopwatch.GetElapsedTime(start);
+            contentions = Monitor.LockContentionCount - contentions;
+            pause = GC.GetTotalPauseDuration() - pause;
+            allocated = GC.GetTotalAllocatedBytes(precise: true) - allocated;
+            gen2 = GC.CollectionCount(2) - gen2;
+            run.Barrier.Dispose();
+
+            foreach (var message in run.FailureMessages)
+            {
+                failureMessages.Add($"{benchmark.Name} on {threads} thread(s): {message}");
+            }
+
+            var latencies = run.Latencies.SelectMany(l => l).OrderBy(l => l).ToArray();
+            var documents = latencies.LongLength;
+            var documentsPerSecond = documents / elapsed.TotalSeconds;
+            var speedup = reference == null ? 1 : documentsPerSecond / reference.DocumentsPerSecond;
+            return new ThroughputResult(
+                benchmark.Name,
+                threads,
+                elapsed.TotalSeconds,
+                documents,
+                documentsPerSecond,
+                speedup,
+                speedup / threads * (reference?.Threads ?? threads),
+                documents > 0 ? BenchmarkRunner.Percentile(latencies, 50) : 0,
+                documents > 0 ? BenchmarkRunner.Percentile(latencies, 99) : 0,
+                documents > 0 ? allocated / documents : 0,
+                contentions,
+                documents > 0 ? contentions * 1000.0 / documents : 0,
+                pause / elapsed * 100,
+                gen2,
+                run.FailureCount);
+        }
+
+        // The state shared by the workers of one thread count. Workers only touch their own latency list, so the
+        // harness itself adds no lock contention to what is measured.
+        private sealed class WorkerRun
+        {
+            private readonly ThroughputCase _benchmark;
+            private readonly string _expected;
+            private readonly int _warmupCount;
+            private int _nextWorker = -1;
+            private int _failureCount;
+            private volatile bool _stop;
+
+            public WorkerRun(ThroughputCase benchmark, string expected, int threads, int warmupCount)
+            {
+                _benchmark = benchmark;
+                _expected = expected;
+                _warmupCount = warmupCount;
+                Barrier = new Barrier(threads + 1);
+                Latencies = Enumerable.Range(0, threads).Select(_ => new List<double>()).ToArray();
+            }
+
+            public Barrier Barrier { get; }
+            public List<double>[] Latencies { get; }
+            public ConcurrentQueue<string> FailureMessages { get; } = new ConcurrentQueue<string>();
+            public int FailureCount => Volatile.Read(ref _failureCount);
+
+            public void RequestStop() => _stop = true;
+
+            public void Work()
+            {
+                var latencies = Latencies[Interlocked.Increment(ref _nextWorker)];
+                for (var i = 0; i < _warmupCount; i++)
+                {
+                    RunOnce(verify: false);
+                }
+
+                Barrier.SignalAndWait();
+                Barrier.SignalAndWait();
+                for (var count = 0; !_stop; count++)
+                {
+                    var elapsed = RunOnce(verify: count % VerifyInterval == 0);
+                    if (elapsed != null)
+                    {
+                        latencies.Add(elapsed.Value.TotalMilliseconds);
+                    }
+                }
+            }
+
+            private TimeSpan? RunOnce(bool verify)
+            {
+                var input = _benchmark.CreateInput();
+                var start = Stopwatch.GetTimestamp();
+                WmlDocument document;
+                try
+                {
+                    document = _benchmark.Run(input);
+                }
+                catch (Exception e)
+                {
+                    Fail($"{e.GetType().Name}: {e.Message}");
+                    return null;
+                }
+                var elapsed = Stopwatch.GetElapsedTime(start);
+
+                if (verify && _benchmark.Fingerprint(document) != _expected)
+                {
+                    Fail("the assembled document differs from the single-threaded one");
+                }
+                return elapsed;
+            }
+
+            private void Fail(string message)
+            {
+                if (Interlocked.Increment(ref _failureCount) <= MaxReportedFailures)
+                {
+                    FailureMessages.Enqueue(message);
+                }
+            }
+        }
+    }
+
+    /// <summary>
+    /// The results of a throughput run, as written to the JSON and CSV exports.
+    /// </summary>
+    internal sealed record ThroughputReport(
+        DateTimeOffset CreatedAt,
+        string Runtime,
+        string OperatingSystem,
+        int ProcessorCount,
+        bool ServerGc,
+        double DurationSeconds,
+        IReadOnlyList<ThroughputResult> Results)
+    {
+        private static readonly string[] CsvColumns =
+        {
+            "name", "threads", "seconds", "documents", "documentsPerSecond", "speedup", "scalingEfficiency", "p50Ms", "p99Ms",
+            "allocatedBytesPerDocument", "lockContentions", "lockContentionsPer1000Documents", "gcPausePercent", "gen2Collections", "failures",
+        };
+
+        public static ThroughputReport Create(TimeSpan duration, IReadOnlyList<ThroughputResult> results) =>
+            new ThroughputReport(
+                DateTimeOffset.UtcNow,
+                RuntimeInformation.FrameworkDescription,
+                RuntimeInformation.OSDescription,
+                Environment.ProcessorCount,
+                GCSettings.IsServerGC,
+                duration.TotalSeconds,
+                results);
+
+        public void WriteJson(string path) =>
+            File.WriteAllText(path, JsonSerializer.Serialize(this, BenchmarkReport.JsonOptions));
+
+        public void WriteCsv(string path)
+        {
+            var csv = new StringBuilder();
+            csv.AppendLine(string.Join(",", CsvColumns));
+            foreach (var r in Results)
+            {
+                csv.AppendLine(string.Join(",",
+                    BenchmarkReport.Quote(r.Name),
+                    BenchmarkReport.Format(r.Threads),
+                    BenchmarkReport.Format(r.Seconds),
+                    BenchmarkReport.Format(r.Documents),
+                    BenchmarkReport.Format(r.DocumentsPerSecond),
+                    BenchmarkReport.Format(r.Speedup),
+                    BenchmarkReport.Format(r.ScalingEfficiency),
+                    BenchmarkReport.Format(r.P50Ms),
+                    BenchmarkReport.Format(r.P99Ms),
+                    BenchmarkReport.Format(r.AllocatedBytesPerDocument),
+                    BenchmarkReport.Format(r.LockContentions),
+                    BenchmarkReport.Format(r.LockContentionsPer1000Documents),
+                    BenchmarkReport.Format(r.GcPausePercent),
+                    BenchmarkReport.Format(r.Gen2Collections),
+                    BenchmarkReport.Format(r.Failures)));
+            }
+            File.WriteAllText(path, csv.ToString());
+        }
+
+        public void WriteTable(TextWriter writer)
+        {
+            writer.WriteLine($"{"Case",-18} {"Threads",7} {"Docs/s",10} {"Speedup",8} {"Scaling",8} {"p50",8} {"p99",8} {"Alloc/doc",11} {"Locks/1k",9} {"GC pause",9} {"Failures",8}");
+            foreach (var r in Results)
+            {
+                writer.WriteLine(string.Create(CultureInfo.InvariantCulture,
+                    $"{r.Name,-18} {r.Threads,7} {r.DocumentsPerSecond,10:F1} {r.Speedup,7:F2}x {r.ScalingEfficiency * 100,7:F0}% {r.P50Ms,8:F3} {r.P99Ms,8:F3} {BenchmarkReport.FormatBytes(r.AllocatedBytesPerDocument),11} {r.LockContentionsPer1000Documents,9:F1} {r.GcPausePercent,8:F1}% {r.Failures,8}"));
+            }
+            writer.WriteLine("Latencies in milliseconds per document; speedup and scaling relative to the first thread count;");
+            writer.WriteLine("Locks/1k is Monitor lock contentions per 1000 documents; GC pause is the share of wall time spent paused.");
+        }
+    }
+}
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Benchmark the template generators and track regressions.
+=========================================================
+
+USAGE:
+------
+    # Measure and compare against the saved baseline (if any)
+    python3 bench_generators.py
+
+    # Record the current numbers as the new baseline
+    python3 bench_generators.py --save
+
+    # Only the stress stages, 10 timed runs each, fail above +15%
+    python3 bench_generators.py 'stress/*' --repeat 10 --threshold 0.15
+
+WHAT IS MEASURED:
+-----------------
+For the small/medium/huge presets of ``create_stress_template.py``:
+
+- ``stress/<preset>/assemble``  building the XML parts as strings
+- ``stress/<preset>/package``   writing the package from prebuilt parts
+- ``stress/<preset>/emit``      end to end: template and data set on disk
+
+and ``templates/<name>`` for every definition discovered by
+``template_registry`` (the example scripts and ``generate_test_docx.py``),
+built end to end into a temporary directory.
+
+Each case is warmed up, timed ``--repeat`` times (the median is reported) and
+run once more under ``tracemalloc`` to record its peak Python allocation. The
+process peak RSS from ``resource`` is recorded alongside, where available.
+
+A case regresses when its median time or its peak allocation exceeds the
+baseline by more than ``--threshold``; the script then exits with status 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+import create_stress_template as stress
+import template_registry
+from docx_package import replace_parts
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE_PATH = template_registry.SCRIPT_DIR / '.bench-generators.json'
+BASELINE_VERSION = 1
+
+
+@dataclass
+class Measurement:
+    median_ms: float
+    min_ms: float
+    peak_kib: float
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    run: Callable[[], object]
+
+
+def _peak_rss_kib() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere.
+    return peak / 1024 if sys.platform == 'darwin' else float(peak)
+
+
+def measure(run: Callable[[], object], repeat: int, warmup: int = 1) -> Measurement:
+    for _ in range(warmup):
+        run()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Traced separately: tracemalloc slows allocation-heavy code considerably.
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        median_ms=round(statistics.median(timings), 3),
+        min_ms=round(min(timings), 3),
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def _stress_cases(workdir: Path) -> Iterator[Case]:
+    for preset, spec in stress.PRESETS.items():
+        parts = stress.build_parts(spec)
+        template = workdir / f'stress-{preset}.docx'
+        data = workdir / f'stress-{preset}.xml'
+
+        def emit(spec=spec, template=template, data=data) -> None:
+            stress.create_stress_template(template, spec)
+            stress.write_data_xml(data, spec)
+
+        yield Case(f'stress/{preset}/assemble', lambda spec=spec: stress.build_parts(spec))
+        yield Case(f'stress/{preset}/package',
+                   lambda parts=parts, template=template: replace_parts(stress.BASE_TEMPLATE, template, parts))
+        yield Case(f'stress/{preset}/emit', emit)
+
+
+def _template_cases(workdir: Path) -> Iterator[Case]:
+    for template in template_registry.discover():
+        definition = template.definition
+        output = workdir / 'templates' / f'{definition.name.replace("/", "_")}.docx'
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        def build(definition=definition, output=output) -> None:
+            # The generator functions print progress lines meant for standalone runs.
+            with contextlib.redirect_stdout(io.StringIO()):
+                definition.build(output)
+
+        yield Case(f'templates/{definition.name}', build)
+
+
+def _load_baseline(path: Path) -> dict[str, dict[str, float]]:
+    try:
+        document = json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+    if document.get('version') != BASELINE_VERSION:
+        print(f'Ignoring baseline {path}: unsupported version {document.get("version")!r}', file=sys.stderr)
+        return {}
+    return document.get('results', {})
+
+
+def _save_results(path: Path, results: dict[str, Measurement]) -> None:
+    document = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'peak_rss_kib': _peak_rss_kib(),
+        'results': {name: asdict(m) for name, m in sorted(results.items())},
+    }
+    path.write_text(json.dumps(document, indent=2) + '\n', encoding='utf-8')
+
+
+def _regressions(current: Measurement, baseline: dict[str, float] | None, threshold: float) -> list[str]:
+    if not baseline:
+        return []
+    found = []
+    for metric in ('median_ms', 'peak_kib'):
+        previous = baseline.get(metric)
+        if previous and getattr(current, metric) > previous * (1 + threshold):
+            change = getattr(current, metric) / previous - 1
+            found.append(f'{metric} +{change:.0%}')
+    return found
+
+
+def _delta(current: float, previous: float | None) -> str:
+    if not previous:
+        return ''
+    return f'{current / previous - 1:+7.1%}'
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the template generators.')
+    parser.add_argument('patterns', nargs='*', help='Glob patterns selecting case names (default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case (default: 5)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative slowdown or allocation growth (default: 0.25)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='Baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--output', type=Path, help='Also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    baseline = _load_baseline(args.baseline)
+    results: dict[str, Measurement] = {}
+    failures: list[str] = []
+
+    with tempfile.TemporaryDirectory(prefix='bench-generators-') as tmp:
+        workdir = Path(tmp)
+        cases = [*_stress_cases(workdir), *_template_cases(workdir)]
+        if args.patterns:
+            cases = [c for c in cases if any(fnmatch.fnmatchcase(c.name, p) for p in args.patterns)]
+        if not cases:
+            print('No benchmark cases matched.', file=sys.stderr)
+            return 1
+
+        print(f'{"case":<58} {"median ms":>10} {"min ms":>9} {"peak KiB":>10} {"Δ time":>8} {"Δ peak":>8}')
+        for case in cases:
+            result = measure(case.run, args.repeat)
+            results[case.name] = result
+            previous = baseline.get(case.name, {})
+            regressions = _regressions(result, previous, args.threshold)
+            marker = f'  REGRESSED ({", ".join(regressions)})' if regressions else ''
+            print(f'{case.name:<58} {result.median_ms:10.2f} {result.min_ms:9.2f} {result.peak_kib:10.1f} '
+                  f'{_delta(result.median_ms, previous.get("median_ms")):>8} '
+                  f'{_delta(result.peak_kib, previous.get("peak_kib")):>8}{marker}')
+            if regressions:
+                failures.append(case.name)
+
+    rss = _peak_rss_kib()
+    if rss is not None:
+        print(f'\nProcess peak RSS: {rss / 1024:.1f} MiB')
+
+    if args.output:
+        _save_results(args.output, results)
+    if args.save:
+        _save_results(args.baseline, {**{k: Measurement(**v) for k, v in baseline.items()}, **results})
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if failures:
+        print(f'\n{len(failures)} case(s) regressed beyond {args.threshold:.0%}: {", ".join(failures)}',
+              file=sys.stderr)
+        return 1
+    if not baseline:
+        print(f'\nNo baseline at {args.baseline}; run with --save to record one.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
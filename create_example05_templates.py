@@ -3,18 +3,20 @@
 Create template documents for Example05_ConditionalElse
 """
 
-import zipfile
-import os
-import shutil
+from pathlib import Path
 
-def create_template_document():
-    """Create TemplateDocument.docx for basic Conditional with Else"""
+from docx_package import replace_parts
+from template_registry import TemplateDefinition
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+EXAMPLES_DIR = SCRIPT_DIR / "DocumentAssemblerSdk.Examples"
+BASE_TEMPLATE = EXAMPLES_DIR / "Example01_Basic" / "TemplateDocument.docx"
+OUTPUT_DIR = EXAMPLES_DIR / "Example05_ConditionalElse"
 
-    template_path = "DocumentAssemblerSdk.Examples/Example01_Basic/TemplateDocument.docx"
-    output_path = "DocumentAssemblerSdk.Examples/Example05_ConditionalElse/TemplateDocument.docx"
+def create_template_document(output_path=OUTPUT_DIR / "TemplateDocument.docx"):
+    """Create TemplateDocument.docx for basic Conditional with Else"""
 
-    # Copy template structure
-    shutil.copy(template_path, output_path)
+    template_path = BASE_TEMPLATE
 
     document_xml = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
@@ -239,38 +241,15 @@ def create_template_document():
     </w:body>
 </w:document>'''
 
-    # Update document.xml in the docx
-    # Read the existing docx, replace document.xml, and write to new file
-    import tempfile
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Extract all files
-        with zipfile.ZipFile(output_path, 'r') as zip_ref:
-            zip_ref.extractall(tmpdir)
-
-        # Write new document.xml
-        with open(os.path.join(tmpdir, 'word', 'document.xml'), 'w', encoding='utf-8') as f:
-            f.write(document_xml)
-
-        # Create new docx
-        os.remove(output_path)
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as docx:
-            for root, dirs, files in os.walk(tmpdir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, tmpdir)
-                    docx.write(file_path, arcname)
+    # Stream the base package into the output, replacing only document.xml
+    replace_parts(template_path, output_path, {'word/document.xml': document_xml})
 
     print(f"✓ Created {output_path}")
 
-def create_notmatch_document():
+def create_notmatch_document(output_path=OUTPUT_DIR / "TemplateNotMatchDocument.docx"):
     """Create TemplateNotMatchDocument.docx for NotMatch with Else"""
 
-    template_path = "DocumentAssemblerSdk.Examples/Example01_Basic/TemplateDocument.docx"
-    output_path = "DocumentAssemblerSdk.Examples/Example05_ConditionalElse/TemplateNotMatchDocument.docx"
-
-    # Copy template structure
-    shutil.copy(template_path, output_path)
+    template_path = BASE_TEMPLATE
 
     document_xml = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
@@ -481,30 +460,26 @@ def create_notmatch_document():
     </w:body>
 </w:document>'''
 
-    # Update document.xml in the docx
-    # Read the existing docx, replace document.xml, and write to new file
-    import tempfile
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Extract all files
-        with zipfile.ZipFile(output_path, 'r') as zip_ref:
-            zip_ref.extractall(tmpdir)
-
-        # Write new document.xml
-        with open(os.path.join(tmpdir, 'word', 'document.xml'), 'w', encoding='utf-8') as f:
-            f.write(document_xml)
-
-        # Create new docx
-        os.remove(output_path)
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as docx:
-            for root, dirs, files in os.walk(tmpdir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, tmpdir)
-                    docx.write(file_path, arcname)
+    # Stream the base package into the output, replacing only document.xml
+    replace_parts(template_path, output_path, {'word/document.xml': document_xml})
 
     print(f"✓ Created {output_path}")
 
+TEMPLATES = [
+    TemplateDefinition(
+        "Example05/TemplateDocument",
+        OUTPUT_DIR / "TemplateDocument.docx",
+        create_template_document,
+        (BASE_TEMPLATE,),
+    ),
+    TemplateDefinition(
+        "Example05/TemplateNotMatchDocument",
+        OUTPUT_DIR / "TemplateNotMatchDocument.docx",
+        create_notmatch_document,
+        (BASE_TEMPLATE,),
+    ),
+]
+
 
 def main():
     print("Creating Example05_ConditionalElse template documents...")
@@ -4,20 +4,19 @@ Create template documents for Example08_Signature
 """
 
 from pathlib import Path
-import zipfile
-import shutil
-import tempfile
+
+from docx_package import replace_parts
+from template_registry import TemplateDefinition
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 EXAMPLES_DIR = SCRIPT_DIR / "DocumentAssemblerSdk.Examples"
+BASE_TEMPLATE = EXAMPLES_DIR / "Example01_Basic" / "TemplateDocument.docx"
+OUTPUT_PATH = EXAMPLES_DIR / "Example08_Signature" / "TemplateSignatureDocument.docx"
 
-def create_signature_template():
-    source = EXAMPLES_DIR / "Example01_Basic" / "TemplateDocument.docx"
-    target_dir = EXAMPLES_DIR / "Example08_Signature"
-    target_dir.mkdir(parents=True, exist_ok=True)
-    target = target_dir / "TemplateSignatureDocument.docx"
-
-    shutil.copy(source, target)
+def create_signature_template(target=OUTPUT_PATH):
+    source = BASE_TEMPLATE
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
 
     document_xml = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
@@ -92,21 +91,19 @@ def create_signature_template():
   </w:body>
 </w:document>'''
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        with zipfile.ZipFile(target, 'r') as zip_ref:
-            zip_ref.extractall(tmpdir)
-
-        document_path = Path(tmpdir) / "word" / "document.xml"
-        document_path.write_text(document_xml, encoding="utf-8")
-
-        target.unlink()
-        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as docx:
-            for path in Path(tmpdir).rglob("*"):
-                if path.is_file():
-                    docx.write(path, path.relative_to(tmpdir))
+    replace_parts(source, target, {"word/document.xml": document_xml})
 
     print(f"✓ Created {target}")
 
+TEMPLATES = [
+    TemplateDefinition(
+        "Example08/TemplateSignatureDocument",
+        OUTPUT_PATH,
+        create_signature_template,
+        (BASE_TEMPLATE,),
+    ),
+]
+
 def main():
     print("Creating Example08_Signature template document...")
     create_signature_template()
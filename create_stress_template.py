@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Generate parameterized stress templates and matching data sets.
+================================================================
+
+The example templates and ``PerfMeasurementTool``'s Simple/Complex scenarios
+are a couple of pages long. This script emits templates of arbitrary size so
+``DocumentAssembler.AssembleDocument`` can be measured against documents the
+size of real contracts.
+
+USAGE:
+------
+    # Write Stress-medium.docx and Stress-medium.xml to the default directory
+    python3 create_stress_template.py --preset medium
+
+    # Override individual dimensions of a preset
+    python3 create_stress_template.py --preset huge --table-rows 20000 --repeat-depth 4
+
+    # List the presets
+    python3 create_stress_template.py --list
+
+TEMPLATE LAYOUT:
+----------------
+- header1.xml / footer1.xml with Content tags for the title and document id
+- N Content tags                  Stress/Fields/F1 .. FN
+- K Conditional/Else blocks       Stress/Flags/Flag1 .. FlagK (Match="yes")
+- Repeat nested D levels deep     Stress/Groups/Group, then ./Groups/Group
+- One Table with C columns        Stress/Rows/Row, cells ./C1 .. ./CC
+
+The data set sizes the Repeat levels (items per level) and the Table (rows)
+independently of the template, so the same template can be assembled against
+data of growing cardinality.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import itertools
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from docx_package import PartData, load_base, replace_parts
+from sdt_builder import (
+    conditional_tag,
+    content_tag,
+    else_tag,
+    end_conditional_tag,
+    end_repeat_tag,
+    repeat_tag,
+    sdt,
+    table_tag,
+)
+from wml_writer import document, encode, paragraph, part
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BASE_TEMPLATE = SCRIPT_DIR / 'DocumentAssemblerSdk.Examples' / 'Example01_Basic' / 'TemplateDocument.docx'
+OUTPUT_DIR = SCRIPT_DIR / 'PerfMeasurementTool' / 'StressTemplates'
+
+REL_TYPE_HEADER = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/header'
+REL_TYPE_FOOTER = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer'
+CT_HEADER = 'application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml'
+CT_FOOTER = 'application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml'
+
+HEADER_REL_ID = 'rIdStressHeader1'
+FOOTER_REL_ID = 'rIdStressFooter1'
+
+
+@dataclass(frozen=True)
+class StressSpec:
+    """Dimensions of a stress template and its data set.
+
+    Attributes:
+        content_tags: Number of top-level Content tags (N).
+        conditionals: Number of Conditional/Else/EndConditional blocks (K).
+        repeat_depth: Nesting depth of the Repeat block (D); 0 omits it.
+        table_columns: Columns of the Table prototype row.
+        repeat_items: Data cardinality: Group elements per Repeat level.
+        table_rows: Data cardinality: Row elements bound to the Table (R).
+    """
+
+    content_tags: int = 50
+    conditionals: int = 10
+    repeat_depth: int = 2
+    table_columns: int = 4
+    repeat_items: int = 3
+    table_rows: int = 25
+
+    def repeat_instances(self) -> int:
+        """Total number of Group elements in the data set."""
+        return sum(self.repeat_items ** level for level in range(1, self.repeat_depth + 1))
+
+
+PRESETS = {
+    'small': StressSpec(content_tags=20, conditionals=4, repeat_depth=1, table_columns=3,
+                        repeat_items=3, table_rows=10),
+    'medium': StressSpec(content_tags=200, conditionals=40, repeat_depth=2, table_columns=5,
+                         repeat_items=8, table_rows=250),
+    # Roughly the size of a 300 page contract once assembled.
+    'huge': StressSpec(content_tags=2000, conditionals=400, repeat_depth=3, table_columns=6,
+                       repeat_items=12, table_rows=5000),
+}
+
+
+def _cell(text: str, bold: bool = False) -> str:
+    rpr = '<w:rPr><w:b/></w:rPr>' if bold else ''
+    return f'        <w:tc><w:p><w:r>{rpr}<w:t>{text}</w:t></w:r></w:p></w:tc>\n'
+
+
+def _repeat_block(ids: Iterator[int], spec: StressSpec, level: int) -> Iterator[str]:
+    select = 'Stress/Groups/Group' if level == 1 else './Groups/Group'
+    yield sdt(repeat_tag(select), next(ids))
+    yield paragraph(f'Group level {level}:', bold=True)
+    yield sdt(content_tag('./Name'), next(ids))
+    yield sdt(content_tag('./Amount'), next(ids))
+    if level < spec.repeat_depth:
+        yield from _repeat_block(ids, spec, level + 1)
+    yield sdt(end_repeat_tag(), next(ids))
+
+
+def _body(spec: StressSpec) -> Iterator[str]:
+    ids = itertools.count(1000)
+
+    yield paragraph('Fields', bold=True)
+    for i in range(1, spec.content_tags + 1):
+        yield paragraph(f'Field {i}: ')
+        yield sdt(content_tag(f'Stress/Fields/F{i}'), next(ids))
+
+    yield paragraph('Clauses', bold=True)
+    for k in range(1, spec.conditionals + 1):
+        yield sdt(conditional_tag(f'Stress/Flags/Flag{k}', match='yes'), next(ids))
+        yield paragraph(f'Clause {k} applies to this agreement.')
+        yield sdt(else_tag(), next(ids))
+        yield paragraph(f'Clause {k} does not apply.')
+        yield sdt(end_conditional_tag(), next(ids))
+
+    if spec.repeat_depth > 0:
+        yield paragraph('Groups', bold=True)
+        yield from _repeat_block(ids, spec, 1)
+
+    if spec.table_columns > 0:
+        yield paragraph('Schedule', bold=True)
+        yield sdt(table_tag('Stress/Rows/Row'), next(ids))
+        yield '    <w:tbl>\n'
+        yield ('      <w:tblPr><w:tblW w:w="0" w:type="auto"/><w:tblBorders>'
+               '<w:insideH w:val="single" w:sz="4" w:color="D0D7E8"/></w:tblBorders></w:tblPr>\n')
+        width = 9000 // spec.table_columns
+        grid = ''.join(f'<w:gridCol w:w="{width}"/>' for _ in range(spec.table_columns))
+        yield f'      <w:tblGrid>{grid}</w:tblGrid>\n'
+        yield '      <w:tr>\n'
+        yield from (_cell(f'Column {j}', bold=True) for j in range(1, spec.table_columns + 1))
+        yield '      </w:tr>\n'
+        yield '      <w:tr>\n'
+        yield from (_cell(f'./C{j}') for j in range(1, spec.table_columns + 1))
+        yield '      </w:tr>\n'
+        yield '    </w:tbl>\n'
+
+    yield '    <w:sectPr>\n'
+    yield f'      <w:headerReference w:type="default" r:id="{HEADER_REL_ID}"/>\n'
+    yield f'      <w:footerReference w:type="default" r:id="{FOOTER_REL_ID}"/>\n'
+    yield '      <w:pgSz w:w="12240" w:h="15840"/>\n'
+    yield ('      <w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440"'
+           ' w:header="720" w:footer="720" w:gutter="0"/>\n')
+    yield '    </w:sectPr>\n'
+
+
+def iter_document_xml(spec: StressSpec) -> Iterator[str]:
+    """Yield ``word/document.xml`` for ``spec`` fragment by fragment."""
+    return document(_body(spec))
+
+
+def build_document_xml(spec: StressSpec) -> str:
+    """Return ``word/document.xml`` for ``spec`` as one string."""
+    return ''.join(iter_document_xml(spec))
+
+
+def _header_footer_xml(root: str, label: str, select: str, placeholder_id: int) -> str:
+    return ''.join(part(root, [
+        paragraph(label, indent=2),
+        sdt(content_tag(select), placeholder_id, indent=2),
+    ]))
+
+
+def build_header_xml() -> str:
+    return _header_footer_xml('hdr', 'Agreement', 'Stress/Title', 1)
+
+
+def build_footer_xml() -> str:
+    return _header_footer_xml('ftr', 'Document id', 'Stress/DocumentId', 2)
+
+
+def _add_header_footer(base: Path) -> dict[str, str]:
+    """Content types and relationships registering header1.xml and footer1.xml."""
+    package = load_base(base)
+    content_types = package.read('[Content_Types].xml').decode('utf-8')
+    rels = package.read('word/_rels/document.xml.rels').decode('utf-8')
+
+    overrides = (
+        f'<Override PartName="/word/header1.xml" ContentType="{CT_HEADER}"/>'
+        f'<Override PartName="/word/footer1.xml" ContentType="{CT_FOOTER}"/>'
+    )
+    relationships = (
+        f'<Relationship Id="{HEADER_REL_ID}" Type="{REL_TYPE_HEADER}" Target="header1.xml"/>'
+        f'<Relationship Id="{FOOTER_REL_ID}" Type="{REL_TYPE_FOOTER}" Target="footer1.xml"/>'
+    )
+    return {
+        '[Content_Types].xml': content_types.replace('</Types>', overrides + '</Types>'),
+        'word/_rels/document.xml.rels': rels.replace('</Relationships>', relationships + '</Relationships>'),
+    }
+
+
+def build_parts(spec: StressSpec, base: Path = BASE_TEMPLATE, stream: bool = False) -> dict[str, PartData]:
+    """Every part that differs from ``base`` for a stress template.
+
+    With ``stream`` the document part is an iterator of encoded chunks that
+    is produced while the package is written, instead of one string.
+    """
+    parts: dict[str, PartData] = dict(_add_header_footer(base))
+    parts['word/document.xml'] = encode(iter_document_xml(spec)) if stream else build_document_xml(spec)
+    parts['word/header1.xml'] = build_header_xml()
+    parts['word/footer1.xml'] = build_footer_xml()
+    return parts
+
+
+def create_stress_template(target: Path, spec: StressSpec) -> Path:
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return replace_parts(BASE_TEMPLATE, target, build_parts(spec, stream=True))
+
+
+# --- Data -------------------------------------------------------------------
+
+
+def _groups(spec: StressSpec, level: int, prefix: str) -> Iterator[str]:
+    pad = '  ' * (2 * level)
+    for item in range(1, spec.repeat_items + 1):
+        name = f'{prefix}{item}'
+        yield f'{pad}<Group>\n'
+        yield f'{pad}  <Name>Group {name}</Name>\n'
+        yield f'{pad}  <Amount>{item * 100 + level}</Amount>\n'
+        if level < spec.repeat_depth:
+            yield f'{pad}  <Groups>\n'
+            yield from _groups(spec, level + 1, f'{name}.')
+            yield f'{pad}  </Groups>\n'
+        yield f'{pad}</Group>\n'
+
+
+def iter_data_xml(spec: StressSpec) -> Iterator[str]:
+    """Yield the data set for ``spec`` in chunks so huge sets never sit in memory."""
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<Stress>\n'
+    yield '  <Title>Master Services Agreement</Title>\n'
+    yield '  <DocumentId>STRESS-0001</DocumentId>\n'
+
+    yield '  <Fields>\n'
+    for i in range(1, spec.content_tags + 1):
+        yield f'    <F{i}>Value {i}</F{i}>\n'
+    yield '  </Fields>\n'
+
+    yield '  <Flags>\n'
+    for k in range(1, spec.conditionals + 1):
+        yield f'    <Flag{k}>{"yes" if k % 2 else "no"}</Flag{k}>\n'
+    yield '  </Flags>\n'
+
+    if spec.repeat_depth > 0:
+        yield '  <Groups>\n'
+        yield from _groups(spec, 1, '')
+        yield '  </Groups>\n'
+
+    yield '  <Rows>\n'
+    for row in range(1, spec.table_rows + 1):
+        cells = ''.join(f'<C{j}>R{row}C{j}</C{j}>' for j in range(1, spec.table_columns + 1))
+        yield f'    <Row>{cells}</Row>\n'
+    yield '  </Rows>\n'
+    yield '</Stress>\n'
+
+
+def write_data_xml(target: Path, spec: StressSpec) -> Path:
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as handle:
+        handle.writelines(iter_data_xml(spec))
+    return target
+
+
+# --- CLI --------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate a DocumentAssembler stress template and data set.')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='medium')
+    parser.add_argument('--name', help='Output base name (default: Stress-<preset>)')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--list', action='store_true', help='List the presets and exit')
+    for spec_field in dataclasses.fields(StressSpec):
+        parser.add_argument(f'--{spec_field.name.replace("_", "-")}', type=int, dest=spec_field.name,
+                            help=f'Override the preset {spec_field.name}')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, preset in PRESETS.items():
+            print(f'{name:<8} {preset}')
+        return 0
+
+    overrides = {f.name: getattr(args, f.name) for f in dataclasses.fields(StressSpec)
+                 if getattr(args, f.name) is not None}
+    spec = dataclasses.replace(PRESETS[args.preset], **overrides)
+    name = args.name or f'Stress-{args.preset}'
+
+    template = create_stress_template(args.output_dir / f'{name}.docx', spec)
+    data = write_data_xml(args.output_dir / f'{name}.xml', spec)
+    print(f'✓ Created {template} ({template.stat().st_size:,} bytes)')
+    print(f'✓ Created {data} ({data.stat().st_size:,} bytes, '
+          f'{spec.repeat_instances():,} groups, {spec.table_rows:,} rows)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
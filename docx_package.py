@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Shared DOCX packaging helpers for the template generator scripts.
+
+Every generated template is the Example01_Basic package with a handful of
+parts replaced (usually ``word/document.xml``). Rather than extracting the
+base package to a temporary directory, the base package is read once into
+memory and unchanged entries are copied into the output as raw compressed
+bytes; only the replaced parts are deflated. Payloads are located through the
+public :class:`zipfile.ZipInfo` offsets and sizes, and the output archive is
+written by a small writer of its own, so no :mod:`zipfile` internals are
+touched.
+
+:class:`BasePackage` keeps a parsed base in memory, as the compressed
+payload of every entry, so many packages can be derived from it, either as
+files or as ``bytes`` without any disk I/O or re-deflating.
+:func:`load_base` caches parsed bases per process, so a batch of generators
+deriving from the same template reads it only once.
+
+Packages are written reproducibly by default: canonical entry order, fixed
+timestamps and attributes and a fixed deflate level, so the same parts always
+give byte-identical output and packages can be cached by content hash.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import zipfile
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterable, Mapping, Union
+
+PathLike = Union[str, 'os.PathLike[str]']
+# Iterables of chunks are deflated as they are produced; only the compressed
+# entry is held in memory.
+PartData = Union[str, bytes, Iterable[Union[str, bytes]]]
+
+# Reproducible mode: every entry gets this timestamp, MS-DOS attributes and,
+# unless told otherwise, this deflate level, so equal inputs give equal bytes.
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+REPRODUCIBLE_COMPRESSLEVEL = 6
+
+# Record layouts from the ZIP specification (APPNOTE.TXT, 4.3.7, 4.3.12 and
+# 4.3.16), without signatures, which are packed separately.
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4H3L5H2L')
+_END_OF_CENTRAL_DIRECTORY = struct.Struct('<4s4H2LH')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+_CENTRAL_HEADER_SIGNATURE = b'PK\x01\x02'
+_END_OF_CENTRAL_DIRECTORY_SIGNATURE = b'PK\x05\x06'
+
+# General purpose flags: CRC and sizes in a trailing data descriptor, and a
+# UTF-8 encoded name.
+_DATA_DESCRIPTOR_FLAG = 0x08
+_UTF8_FLAG = 0x800
+
+# Version 2.0 is needed to extract deflated entries; zipfile writes the same.
+_DEFAULT_VERSION = 20
+
+# Packages are small; the writer produces no ZIP64 records.
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+CONTENT_TYPES_PART = '[Content_Types].xml'
+
+
+def _is_omitted(name: str, omit: Iterable[str]) -> bool:
+    """Entries in ``omit`` ending with ``/`` are treated as folder prefixes."""
+    for pattern in omit:
+        if name == pattern or (pattern.endswith('/') and name.startswith(pattern)):
+            return True
+    return False
+
+
+def _canonical_key(name: str) -> tuple[bool, str]:
+    """Content types first, as Office writes them, then by part name."""
+    return name != CONTENT_TYPES_PART, name
+
+
+def _normalize(info: zipfile.ZipInfo) -> None:
+    info.date_time = REPRODUCIBLE_DATE_TIME
+    info.create_system = 0
+    info.external_attr = 0
+
+
+def _read_raw_payload(data: bytes, info: zipfile.ZipInfo) -> bytes:
+    """Return the still compressed bytes of ``info`` from the archive ``data``."""
+    offset = info.header_offset
+    header = _LOCAL_HEADER.unpack_from(data, offset)
+    if header[0] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f'Bad local file header for {info.filename}')
+    start = offset + _LOCAL_HEADER.size + header[9] + header[10]
+    payload = data[start:start + info.compress_size]
+    if len(payload) != info.compress_size:
+        raise zipfile.BadZipFile(f'Truncated data for {info.filename}')
+    return payload
+
+
+def _dos_date_time(date_time: tuple[int, int, int, int, int, int]) -> tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+class _ZipWriter:
+    """Writes entries whose CRC and sizes are known up front, then the central directory.
+
+    Each entry keeps the compression method, CRC and sizes of its
+    :class:`zipfile.ZipInfo`, so already compressed payloads are copied as is.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._central_directory: list[bytes] = []
+
+    def write_raw(self, info: zipfile.ZipInfo, payload: bytes) -> None:
+        offset = self._stream.tell()
+        if max(offset, info.compress_size, info.file_size) > _ZIP32_LIMIT:
+            raise ValueError(f'{info.filename} needs ZIP64, which packages are not written with')
+        try:
+            name = info.filename.encode('ascii')
+            flags = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG
+        except UnicodeEncodeError:
+            name = info.filename.encode('utf-8')
+            flags = info.flag_bits & ~_DATA_DESCRIPTOR_FLAG | _UTF8_FLAG
+        dos_date, dos_time = _dos_date_time(info.date_time)
+        extract_version = max(info.extract_version, _DEFAULT_VERSION)
+        fields = (info.compress_type, dos_time, dos_date, info.CRC, info.compress_size, info.file_size,
+                  len(name))
+        self._stream.write(_LOCAL_HEADER.pack(_LOCAL_HEADER_SIGNATURE, extract_version, flags, *fields, 0))
+        self._stream.write(name)
+        self._stream.write(payload)
+        comment = info.comment
+        self._central_directory.append(_CENTRAL_HEADER.pack(
+            _CENTRAL_HEADER_SIGNATURE, max(info.create_version, extract_version), info.create_system,
+            extract_version, 0, flags, *fields, 0, len(comment), 0, info.internal_attr, info.external_attr,
+            offset) + name + comment)
+
+    def write(self, info: zipfile.ZipInfo, chunks: Iterable[bytes], compresslevel: int | None) -> None:
+        """Deflate ``chunks`` into a new entry described by ``info``."""
+        level = zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = []
+        crc = size = 0
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            compressed.append(compressor.compress(chunk))
+        compressed.append(compressor.flush())
+        payload = b''.join(compressed)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.CRC = crc
+        info.file_size = size
+        info.compress_size = len(payload)
+        self.write_raw(info, payload)
+
+    def close(self) -> None:
+        offset = self._stream.tell()
+        for record in self._central_directory:
+            self._stream.write(record)
+        size = self._stream.tell() - offset
+        count = len(self._central_directory)
+        self._stream.write(_END_OF_CENTRAL_DIRECTORY.pack(
+            _END_OF_CENTRAL_DIRECTORY_SIGNATURE, 0, 0, count, count, size, offset, 0))
+
+
+def _copy_entry(writer: _ZipWriter, info: zipfile.ZipInfo, payload: bytes, reproducible: bool) -> None:
+    """Copy an unchanged base entry: same payload, method, CRC and sizes."""
+    clone = zipfile.ZipInfo(info.filename, info.date_time)
+    clone.compress_type = info.compress_type
+    clone.extract_version = info.extract_version
+    clone.flag_bits = info.flag_bits
+    clone.create_system = info.create_system
+    clone.external_attr = info.external_attr
+    clone.comment = info.comment
+    clone.CRC = info.CRC
+    clone.compress_size = info.compress_size
+    clone.file_size = info.file_size
+    if reproducible:
+        _normalize(clone)
+    writer.write_raw(clone, payload)
+
+
+def _write_part(writer: _ZipWriter, name: str, data: PartData, template: zipfile.ZipInfo | None,
+                compresslevel: int | None, reproducible: bool) -> None:
+    info = zipfile.ZipInfo(name, template.date_time if template else REPRODUCIBLE_DATE_TIME)
+    if template is not None:
+        info.external_attr = template.external_attr
+    if reproducible:
+        _normalize(info)
+    if isinstance(data, (str, bytes)):
+        data = (data,)
+    chunks = (chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in data)
+    writer.write(info, chunks, compresslevel)
+
+
+class BasePackage:
+    """A base .docx package whose entries are read once and reused.
+
+    The central directory is parsed and the compressed payload of every entry
+    is cached when the instance is created; each build then deflates the
+    overridden parts and copies the cached payloads of the rest, without
+    inflating them or touching the source again.
+
+    Args:
+        source: Path of the base package, or its content as bytes.
+    """
+
+    def __init__(self, source: PathLike | bytes | bytearray | memoryview):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.path = None
+            data = bytes(source)
+        else:
+            self.path = Path(source)
+            data = self.path.read_bytes()
+        with zipfile.ZipFile(io.BytesIO(data), 'r') as base:
+            self.entries: tuple[tuple[zipfile.ZipInfo, bytes], ...] = tuple(
+                (info, _read_raw_payload(data, info)) for info in base.infolist())
+        self._by_name = {info.filename: (info, payload) for info, payload in self.entries}
+
+    def namelist(self) -> list[str]:
+        return [info.filename for info, _ in self.entries]
+
+    def read(self, name: str) -> bytes:
+        """Return the uncompressed content of entry ``name``."""
+        info, payload = self._by_name[name]
+        buffer = io.BytesIO()
+        writer = _ZipWriter(buffer)
+        _copy_entry(writer, info, payload, reproducible=False)
+        writer.close()
+        with zipfile.ZipFile(buffer, 'r') as entry:
+            return entry.read(name)
+
+    def write_into(
+        self,
+        output: BinaryIO,
+        parts: Mapping[str, PartData],
+        omit: Iterable[str] = (),
+        compresslevel: int | None = None,
+        reproducible: bool = True,
+    ) -> None:
+        """Write the package with ``parts`` replaced to the binary ``output``.
+
+        In reproducible mode (the default) entries are written in canonical
+        order with fixed timestamps and attributes, and new parts are
+        deflated at :data:`REPRODUCIBLE_COMPRESSLEVEL` unless
+        ``compresslevel`` is given. Otherwise the base order and metadata are
+        kept and new parts are appended. Unchanged entries are always copied
+        as they are compressed in the base.
+        """
+        omit = tuple(omit)
+        pending = dict(parts)
+        # (name, base entry or None, cached base payload or None, new content or None)
+        entries: list[tuple[str, zipfile.ZipInfo | None, bytes | None, PartData | None]] = []
+        for info, payload in self.entries:
+            if info.filename in pending:
+                entries.append((info.filename, info, None, pending.pop(info.filename)))
+            elif not _is_omitted(info.filename, omit):
+                entries.append((info.filename, info, payload, None))
+        entries.extend((name, None, None, data) for name, data in pending.items())
+
+        if reproducible:
+            entries.sort(key=lambda entry: _canonical_key(entry[0]))
+            if compresslevel is None:
+                compresslevel = REPRODUCIBLE_COMPRESSLEVEL
+
+        writer = _ZipWriter(output)
+        for name, info, payload, data in entries:
+            if data is None:
+                _copy_entry(writer, info, payload, reproducible)
+            else:
+                _write_part(writer, name, data, info, compresslevel, reproducible)
+        writer.close()
+
+    def _build(self, parts: Mapping[str, PartData], omit: Iterable[str], compresslevel: int | None,
+               reproducible: bool) -> io.BytesIO:
+        buffer = io.BytesIO()
+        self.write_into(buffer, parts, omit, compresslevel, reproducible)
+        return buffer
+
+    def build(
+        self,
+        parts: Mapping[str, PartData],
+        omit: Iterable[str] = (),
+        compresslevel: int | None = None,
+        reproducible: bool = True,
+    ) -> bytes:
+        """Return the derived package as bytes, built entirely in memory."""
+        return self._build(parts, omit, compresslevel, reproducible).getvalue()
+
+    def build_view(
+        self,
+        parts: Mapping[str, PartData],
+        omit: Iterable[str] = (),
+        compresslevel: int | None = None,
+        reproducible: bool = True,
+    ) -> memoryview:
+        """Like :meth:`build` but returns a view of the buffer instead of copying it."""
+        return self._build(parts, omit, compresslevel, reproducible).getbuffer()
+
+    def save(
+        self,
+        target: PathLike,
+        parts: Mapping[str, PartData],
+        omit: Iterable[str] = (),
+        compresslevel: int | None = None,
+        reproducible: bool = True,
+    ) -> Path:
+        """Write the derived package to ``target``."""
+        target_path = Path(target)
+        if self.path is not None and self.path.resolve() == target_path.resolve():
+            raise ValueError(f'Source and target must differ: {self.path}')
+        with target_path.open('wb') as output:
+            self.write_into(output, parts, omit, compresslevel, reproducible)
+        return target_path
+
+
+# Distinct base packages kept parsed per process by load_base().
+BASE_CACHE_SIZE = 8
+
+
+@lru_cache(maxsize=BASE_CACHE_SIZE)
+def _load_base(path: Path, mtime_ns: int, size: int) -> BasePackage:
+    return BasePackage(path)
+
+
+def load_base(source: PathLike) -> BasePackage:
+    """Return the parsed :class:`BasePackage` for ``source``, reading it at most once.
+
+    The cached package holds the base's compressed payloads, so every
+    derived template copies them instead of deflating the shared parts
+    (styles, theme, fonts, settings) again. Entries are keyed by resolved
+    path, modification time and size, so a rewritten base package is picked
+    up on the next call. The least recently used entries are evicted beyond
+    :data:`BASE_CACHE_SIZE` packages.
+    """
+    path = Path(source).resolve()
+    stat = path.stat()
+    return _load_base(path, stat.st_mtime_ns, stat.st_size)
+
+
+def clear_base_cache() -> None:
+    _load_base.cache_clear()
+
+
+def build_package(
+    base: PathLike | bytes | BasePackage,
+    parts: Mapping[str, PartData],
+    omit: Iterable[str] = (),
+    compresslevel: int | None = None,
+    reproducible: bool = True,
+) -> bytes:
+    """Return ``base`` with ``parts`` replaced as an in-memory package.
+
+    Pass a :class:`BasePackage` to reuse the parsed base across many builds.
+    """
+    if isinstance(base, (bytes, bytearray, memoryview)):
+        base = BasePackage(base)
+    elif not isinstance(base, BasePackage):
+        base = load_base(base)
+    return base.build(parts, omit, compresslevel, reproducible)
+
+
+def replace_parts(
+    source: PathLike,
+    target: PathLike,
+    parts: Mapping[str, PartData],
+    omit: Iterable[str] = (),
+    compresslevel: int | None = None,
+    reproducible: bool = True,
+) -> Path:
+    """Write ``target`` as a copy of ``source`` with ``parts`` replaced.
+
+    Args:
+        source: Base .docx package to derive from.
+        target: Output path; must differ from ``source``.
+        parts: Part name -> new content, either complete or as an iterable
+            of chunks streamed into the entry. Names missing from the base
+            package are appended after the copied entries.
+        omit: Part names (or folder prefixes ending with ``/``) to drop.
+        compresslevel: Deflate level for the written entries.
+        reproducible: Canonical entry order, fixed timestamps and a stable
+            deflate level, so identical inputs produce identical bytes.
+
+    Returns:
+        The path of the written package.
+    """
+    source_path = Path(source)
+    if source_path.resolve() == Path(target).resolve():
+        raise ValueError(f'Source and target must differ: {source_path}')
+    return load_base(source_path).save(target, parts, omit, compresslevel, reproducible)
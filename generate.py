@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Generate every example and test template from one entry point.
+===============================================================
+
+USAGE:
+------
+    # Build all templates whose inputs changed since the last run
+    python3 generate.py
+
+    # Only templates matching the given glob patterns
+    python3 generate.py 'Example09/*' 'TestFiles/DA27*'
+
+    # Rebuild everything, using 4 worker processes
+    python3 generate.py --force --jobs 4
+
+    # Show the discovered template definitions
+    python3 generate.py --list
+
+HOW IT WORKS:
+-------------
+Template definitions are discovered from the ``TEMPLATES`` lists exposed by
+``create_example*.py`` and ``generate_test_docx.py`` (see
+``template_registry.py``). Each definition is hashed over its generator
+script, the shared packaging helpers and its declared inputs; definitions
+whose input hash matches ``.generate-manifest.json`` and whose output still
+has the recorded SHA-256 are skipped. The remaining ones are built
+concurrently on a process pool and the wall time of each build is reported.
+
+Packages are written reproducibly (see ``docx_package.py``), so a rebuild
+that yields the same bytes as the existing output leaves that file, and its
+modification time, untouched and is reported as ``unchanged``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+import template_registry
+from template_registry import DiscoveredTemplate
+
+MANIFEST_PATH = template_registry.SCRIPT_DIR / '.generate-manifest.json'
+
+
+def _load_manifest() -> dict[str, dict[str, str]]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_manifest(manifest: dict[str, dict[str, str]]) -> None:
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+class BuildResult(NamedTuple):
+    seconds: float
+    sha256: str
+    changed: bool
+
+
+def file_sha256(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def build_template(module_name: str, template_name: str) -> BuildResult:
+    """Build one template in the current process.
+
+    The package is written next to its output first and only moved into place
+    when its content differs from the existing file.
+    """
+    definition = template_registry.find(module_name, template_name)
+    output = Path(definition.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    staging = output.with_name(f'.{output.stem}.{os.getpid()}.tmp{output.suffix}')
+    start = time.perf_counter()
+    try:
+        # The generator functions print progress lines meant for standalone runs.
+        with contextlib.redirect_stdout(io.StringIO()):
+            definition.build(staging)
+        seconds = time.perf_counter() - start
+        digest = file_sha256(staging)
+        changed = digest != file_sha256(output)
+        if changed:
+            os.replace(staging, output)
+    finally:
+        staging.unlink(missing_ok=True)
+    return BuildResult(seconds, digest, changed)
+
+
+def _is_up_to_date(template: DiscoveredTemplate, input_hash: str, manifest: dict[str, dict[str, str]]) -> bool:
+    entry = manifest.get(template.name)
+    return (
+        entry is not None
+        and entry.get('inputs') == input_hash
+        and entry.get('sha256') is not None
+        and entry.get('sha256') == file_sha256(Path(template.definition.output))
+    )
+
+
+def _select(templates: list[DiscoveredTemplate], patterns: list[str]) -> list[DiscoveredTemplate]:
+    if not patterns:
+        return templates
+    return [t for t in templates if any(fnmatch.fnmatchcase(t.name, p) for p in patterns)]
+
+
+def _relative(path: Path) -> str:
+    try:
+        return str(Path(path).resolve().relative_to(template_registry.SCRIPT_DIR))
+    except ValueError:
+        return str(path)
+
+
+def _run(pending: dict[str, tuple[DiscoveredTemplate, str]], jobs: int) -> Iterator[tuple[str, BuildResult | Exception]]:
+    """Build the pending templates, yielding ``(name, result or exception)`` as they finish."""
+    if jobs == 1:
+        for name, (template, _) in pending.items():
+            try:
+                yield name, build_template(template.module, template.name)
+            except Exception as exc:
+                yield name, exc
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(build_template, template.module, template.name): name
+            for name, (template, _) in pending.items()
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as exc:
+                yield futures[future], exc
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate the example and test template packages.')
+    parser.add_argument('patterns', nargs='*', help='Glob patterns selecting template names (default: all)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes (default: CPU count)')
+    parser.add_argument('-f', '--force', action='store_true', help='Rebuild even when inputs are unchanged')
+    parser.add_argument('--list', action='store_true', help='List template definitions and exit')
+    args = parser.parse_args(argv)
+
+    templates = _select(list(template_registry.discover()), args.patterns)
+    if not templates:
+        print('No template definitions matched.', file=sys.stderr)
+        return 1
+
+    if args.list:
+        for template in templates:
+            print(f'{template.name:<50} {template.module:<28} {_relative(template.definition.output)}')
+        return 0
+
+    manifest = _load_manifest()
+    pending: dict[str, tuple[DiscoveredTemplate, str]] = {}
+    for template in templates:
+        input_hash = template.input_hash()
+        if not args.force and _is_up_to_date(template, input_hash, manifest):
+            print(f'  skipped  {template.name}')
+            continue
+        pending[template.name] = (template, input_hash)
+
+    started = time.perf_counter()
+    failures = 0
+    unchanged = 0
+
+    jobs = max(1, min(args.jobs, len(pending)))
+    for name, outcome in _run(pending, jobs):
+        template, input_hash = pending[name]
+        if isinstance(outcome, BaseException):
+            failures += 1
+            print(f'  FAILED   {template.name}: {outcome}', file=sys.stderr)
+            continue
+        manifest[template.name] = {
+            'inputs': input_hash,
+            'output': _relative(template.definition.output),
+            'sha256': outcome.sha256,
+        }
+        status = 'built    ' if outcome.changed else 'unchanged'
+        unchanged += not outcome.changed
+        print(f'  {status} {template.name:<50} {outcome.seconds * 1000:8.1f} ms')
+
+    _save_manifest(manifest)
+    total = time.perf_counter() - started
+    built = len(pending) - failures - unchanged
+    print(f'\n{built} built, {unchanged} unchanged, {len(templates) - len(pending)} up to date, '
+          f'{failures} failed in {total * 1000:.1f} ms ({jobs} worker{"s" if jobs != 1 else ""})')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
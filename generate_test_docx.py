@@ -42,11 +42,16 @@ Generated files are placed in: DocumentAssemblerSdk.Tests/TestFiles/
 (or custom directory if specified)
 """
 
-import zipfile
 import os
 import sys
 from xml.dom import minidom
 
+from docx_package import replace_parts
+from template_registry import SCRIPT_DIR, TemplateDefinition
+
+TEMPLATE_PATH = SCRIPT_DIR / "DocumentAssemblerSdk.Examples" / "Example01_Basic" / "TemplateDocument.docx"
+TEST_FILES_DIR = SCRIPT_DIR / "DocumentAssemblerSdk.Tests" / "TestFiles"
+
 def create_document_xml_with_else():
     """
     Create document.xml content with Conditional/Else structure.
@@ -460,27 +465,41 @@ def create_docx_from_template(output_path, template_path, document_xml_content):
         template_path: Path to the template .docx to copy from
         document_xml_content: XML string content for document.xml
     """
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as docx:
-        # Copy all files from template except document.xml, glossary, and rels
-        with zipfile.ZipFile(template_path, 'r') as template_zip:
-            for filename in template_zip.namelist():
-                # Skip files we'll replace or don't need
-                if (filename == 'word/document.xml' or
-                    filename.startswith('word/glossary/') or
-                    filename == 'word/_rels/document.xml.rels'):
-                    continue
-
-                content = template_zip.read(filename)
-                docx.writestr(filename, content)
-
-        # Write custom document.xml.rels
-        docx.writestr('word/_rels/document.xml.rels', create_simple_rels())
-
-        # Write custom document.xml
-        docx.writestr('word/document.xml', document_xml_content)
+    # Copy every template entry except document.xml, its rels and the glossary
+    replace_parts(
+        template_path,
+        output_path,
+        {
+            'word/_rels/document.xml.rels': create_simple_rels(),
+            'word/document.xml': document_xml_content,
+        },
+        omit=('word/glossary/',),
+    )
 
     print(f"✓ Created {output_path}")
 
+# (file name, document.xml factory) for every generated test document
+TEST_DOCUMENTS = [
+    ("DA270-ConditionalWithElse.docx", create_document_xml_with_else),
+    ("DA271-ConditionalWithElseNotMatch.docx", create_document_xml_with_else_notmatch),
+    ("DA272-NestedConditionalWithElse.docx", create_document_xml_nested_else),
+]
+
+def _test_document_builder(xml_factory):
+    def build(output_path):
+        create_docx_from_template(output_path, TEMPLATE_PATH, xml_factory())
+    return build
+
+TEMPLATES = [
+    TemplateDefinition(
+        "TestFiles/" + filename[:-len(".docx")],
+        TEST_FILES_DIR / filename,
+        _test_document_builder(xml_factory),
+        (TEMPLATE_PATH,),
+    )
+    for filename, xml_factory in TEST_DOCUMENTS
+]
+
 def main():
     """Main function to generate all test documents"""
 
@@ -509,15 +528,9 @@ def main():
     print(f"Creating test documents in: {output_dir}\n")
 
     # Generate test documents
-    test_files = [
-        ("DA270-ConditionalWithElse.docx", create_document_xml_with_else()),
-        ("DA271-ConditionalWithElseNotMatch.docx", create_document_xml_with_else_notmatch()),
-        ("DA272-NestedConditionalWithElse.docx", create_document_xml_nested_else()),
-    ]
-
-    for filename, xml_content in test_files:
+    for filename, xml_factory in TEST_DOCUMENTS:
         output_path = os.path.join(output_dir, filename)
-        create_docx_from_template(output_path, template_path, xml_content)
+        create_docx_from_template(output_path, template_path, xml_factory())
 
     print(f"\n✅ All test documents created successfully!")
     print(f"\nTo run tests:")
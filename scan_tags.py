@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Index the DocumentAssembler tags of .docx templates without .NET.
+=================================================================
+
+USAGE:
+------
+    # Print the JSON index of one template
+    python3 scan_tags.py DocumentAssemblerSdk.Examples/Example09_AllTags/TemplateAllTagsDocument.docx
+
+    # Scan every template below a folder on 4 processes, write the index and
+    # exit with status 1 if any template has malformed or unbalanced tags
+    python3 scan_tags.py templates/ --jobs 4 --output index.json --strict
+
+HOW IT WORKS:
+-------------
+``word/document.xml`` and every header and footer part are stream-parsed with
+``xml.etree.ElementTree.iterparse``; every finished element outside a
+paragraph or content control is detached from its parent, so the tree never
+holds more than the block being read and memory stays bounded however large
+the template is. Tags are recognized the way ``DocumentAssembler`` does: the
+whole text of a content control starting with ``<`` is one tag, and a
+paragraph that neither contains nor sits inside a content control contributes
+its ``<# ... #>`` tokens (smart quotes and HTML entities normalized).
+
+Each tag is reported with its kind, ``Select``, ``Optional``, its part,
+paragraph number and ordinal, its nesting depth and enclosing block tag, and
+the Select path resolved against the enclosing Repeat blocks. Tokens that do
+not parse and unbalanced Repeat/Conditional blocks are reported as errors.
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Iterable, Optional
+from xml.etree import ElementTree
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_P = f'{{{W_NS}}}p'
+W_T = f'{{{W_NS}}}t'
+W_SDT = f'{{{W_NS}}}sdt'
+
+# Parts scanned for tags, in the order they are reported.
+PART_PATTERN = re.compile(r'^word/(document|header\d*|footer\d*)\.xml$')
+
+SUPPORTED_TAGS = (
+    'Content', 'Image', 'Table', 'Repeat', 'EndRepeat',
+    'Conditional', 'Else', 'EndConditional', 'Signature',
+)
+_CANONICAL_NAMES = {name.lower(): name for name in SUPPORTED_TAGS}
+
+# Tags whose Select is required to locate data.
+SELECT_TAGS = frozenset({'Content', 'Image', 'Table', 'Repeat', 'Conditional'})
+
+# Tags embedded in paragraph text, matched like the engine's "<#.*?#>".
+_PARAGRAPH_TAG = re.compile(r'<#.*?#>')
+
+_QUOTES = str.maketrans({'“': '"', '”': '"', '‘': "'", '’': "'", '\r': ' ', '\n': ' '})
+
+
+@dataclass
+class TagEntry:
+    kind: str
+    part: str
+    index: int
+    paragraph: int
+    source: str
+    depth: int
+    parent: Optional[int]
+    select: Optional[str] = None
+    path: Optional[str] = None
+    optional: bool = False
+    attributes: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class ScanError:
+    part: str
+    paragraph: int
+    message: str
+    text: str = ''
+
+
+@dataclass
+class TemplateIndex:
+    file: str
+    parts: list[str] = field(default_factory=list)
+    tags: list[TagEntry] = field(default_factory=list)
+    errors: list[ScanError] = field(default_factory=list)
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
+
+# --- Tag text ---------------------------------------------------------------
+
+
+def _normalize_text(text: str) -> str:
+    return html.unescape(text.strip().translate(_QUOTES))
+
+
+def _normalize_markup(token: str) -> Optional[str]:
+    token = token.strip()
+    if not token.startswith('<#'):
+        return token
+    if not token.endswith('#>'):
+        return None
+    inner = token[2:-2].strip()
+    if not inner:
+        return None
+    if not inner.endswith('/>'):
+        inner = inner.rstrip('/') + ' />'
+    return '<' + inner.lstrip('<')
+
+
+def parse_tag(token: str) -> tuple[Optional[str], dict[str, str]]:
+    """Return ``(kind, attributes)``; ``kind`` is ``None`` for unsupported elements.
+
+    Raises:
+        ValueError: ``token`` is not well-formed tag markup.
+    """
+    markup = _normalize_markup(token)
+    if not markup:
+        raise ValueError('empty tag')
+    try:
+        element = ElementTree.fromstring(markup)
+    except ElementTree.ParseError as exc:
+        raise ValueError(str(exc)) from None
+    return _CANONICAL_NAMES.get(element.tag.lower()), dict(element.attrib)
+
+
+# --- Select paths -----------------------------------------------------------
+
+
+def _segments(path: str) -> list[str]:
+    return [segment for segment in path.split('/') if segment]
+
+
+def resolve_path(select: str, context: str) -> str:
+    """Resolve ``select`` against the enclosing Repeat path, like the schema extractor."""
+    select = select.strip()
+    if select.startswith('/'):
+        base: list[str] = []
+    elif select.startswith(('.', '@')):
+        base = _segments(context)
+    else:
+        base = []
+    combined = list(base)
+    for segment in _segments(select):
+        if segment == '.':
+            continue
+        if segment == '..':
+            if combined:
+                combined.pop()
+            continue
+        combined.append(segment)
+    return '/'.join(combined)
+
+
+# --- Scanning ---------------------------------------------------------------
+
+
+class _PartScanner:
+    """Turns the text blocks of one part into tag entries, tracking nesting."""
+
+    def __init__(self, index: TemplateIndex, part: str):
+        self.index = index
+        self.part = part
+        self.ordinal = 0
+        # (kind, tag index, resolved path) of the open Repeat/Conditional blocks.
+        self.blocks: list[tuple[str, int, str]] = []
+
+    def _context(self) -> str:
+        for kind, _, path in reversed(self.blocks):
+            if kind == 'Repeat':
+                return path
+        return ''
+
+    def _error(self, paragraph: int, message: str, text: str = '') -> None:
+        self.index.errors.append(ScanError(self.part, paragraph, message, text))
+
+    def block(self, text: str, paragraph: int, source: str) -> None:
+        text = _normalize_text(text)
+        if source == 'sdt':
+            tokens = [text] if text.startswith('<') else []
+        else:
+            tokens = _PARAGRAPH_TAG.findall(text)
+        for token in tokens:
+            try:
+                kind, attributes = parse_tag(token)
+            except ValueError as exc:
+                self._error(paragraph, f'Malformed tag: {exc}', token)
+                continue
+            if kind is not None:
+                self._add(kind, attributes, paragraph, source, token)
+
+    def _add(self, kind: str, attributes: dict[str, str], paragraph: int, source: str, token: str) -> None:
+        if kind in ('EndRepeat', 'EndConditional'):
+            opener = 'Repeat' if kind == 'EndRepeat' else 'Conditional'
+            if not self.blocks or self.blocks[-1][0] != opener:
+                self._error(paragraph, f'{kind} without a matching {opener}', token)
+            else:
+                self.blocks.pop()
+        elif kind == 'Else' and (not self.blocks or self.blocks[-1][0] != 'Conditional'):
+            self._error(paragraph, 'Else outside of a Conditional', token)
+
+        select = attributes.get('Select')
+        if kind in SELECT_TAGS and not select:
+            self._error(paragraph, f'{kind} is missing the Select attribute', token)
+
+        entry = TagEntry(
+            kind=kind,
+            part=self.part,
+            index=self.ordinal,
+            paragraph=paragraph,
+            source=source,
+            depth=len(self.blocks),
+            parent=self.blocks[-1][1] if self.blocks else None,
+            select=select,
+            path=resolve_path(select, self._context()) if select else None,
+            optional=attributes.get('Optional', '').strip().lower() == 'true',
+            attributes=attributes,
+        )
+        self.index.tags.append(entry)
+        self.ordinal += 1
+
+        if kind in ('Repeat', 'Conditional'):
+            self.blocks.append((kind, entry.index, entry.path or ''))
+
+    def finish(self, paragraph: int) -> None:
+        for kind, _, _ in reversed(self.blocks):
+            self._error(paragraph, f'{kind} is never closed')
+
+
+def _scan_part(stream: IO[bytes], index: TemplateIndex, part: str) -> None:
+    scanner = _PartScanner(index, part)
+    paragraph = 0
+    sdt_depth = 0
+    sdt_text: list[str] = []
+    # Text and "contains a content control" flag of the open paragraphs.
+    paragraphs: list[tuple[list[str], list[bool]]] = []
+    # The open elements, so finished ones can be removed from their parent.
+    open_elements: list[ElementTree.Element] = []
+
+    for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            open_elements.append(element)
+            if tag == W_P:
+                paragraph += 1
+                paragraphs.append(([], [False]))
+            elif tag == W_SDT:
+                sdt_depth += 1
+                for _, has_sdt in paragraphs:
+                    has_sdt[0] = True
+            continue
+
+        open_elements.pop()
+        if tag == W_T:
+            if sdt_depth:
+                sdt_text.append(element.text or '')
+            elif paragraphs:
+                paragraphs[-1][0].append(element.text or '')
+        elif tag == W_SDT:
+            sdt_depth -= 1
+            if sdt_depth == 0:
+                scanner.block(''.join(sdt_text), paragraph, 'sdt')
+                sdt_text.clear()
+        elif tag == W_P:
+            text, has_sdt = paragraphs.pop()
+            if not sdt_depth and not has_sdt[0]:
+                scanner.block(''.join(text), paragraph, 'paragraph')
+
+        # Content of an open paragraph or content control is still needed;
+        # everything else is done with once it ends.
+        if open_elements and not paragraphs and not sdt_depth:
+            open_elements[-1].remove(element)
+
+    scanner.finish(paragraph)
+
+
+def _part_order(name: str) -> tuple[int, str]:
+    kind = PART_PATTERN.match(name).group(1)
+    return (0 if kind == 'document' else 1 if kind.startswith('header') else 2, name)
+
+
+def scan(path: str | os.PathLike[str]) -> TemplateIndex:
+    """Build the tag index of one template."""
+    index = TemplateIndex(str(path))
+    try:
+        with zipfile.ZipFile(path) as package:
+            parts = sorted((n for n in package.namelist() if PART_PATTERN.match(n)), key=_part_order)
+            for part in parts:
+                index.parts.append(part)
+                with package.open(part) as stream:
+                    try:
+                        _scan_part(stream, index, part)
+                    except ElementTree.ParseError as exc:
+                        index.errors.append(ScanError(part, 0, f'Invalid XML: {exc}'))
+    except (OSError, zipfile.BadZipFile) as exc:
+        index.errors.append(ScanError('', 0, f'Cannot read package: {exc}'))
+    return index
+
+
+def _expand(paths: Iterable[Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*.docx') if not p.name.startswith('~$')))
+        else:
+            files.append(path)
+    return files
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Index the DocumentAssembler tags of .docx templates.')
+    parser.add_argument('paths', nargs='+', type=Path, help='Templates or folders to scan recursively')
+    parser.add_argument('-o', '--output', type=Path, help='Write the JSON index here instead of stdout')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--strict', action='store_true', help='Exit with status 1 if any template has errors')
+    args = parser.parse_args(argv)
+
+    files = _expand(args.paths)
+    if args.jobs > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            indexes = list(pool.map(scan, files, chunksize=16))
+    else:
+        indexes = [scan(f) for f in files]
+
+    document = [index.to_json() for index in indexes]
+    text = json.dumps(document if len(document) != 1 else document[0], indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+
+    failed = [index for index in indexes if index.errors]
+    for index in failed:
+        for error in index.errors:
+            print(f'{index.file}: {error.part}:{error.paragraph}: {error.message} {error.text}'.rstrip(),
+                  file=sys.stderr)
+    return 1 if args.strict and failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Content-control (w:sdt) builder shared by the template generator scripts.
+
+Every DocumentAssembler tag in a generated template is a block-level content
+control whose only run carries the escaped tag markup, e.g.
+``&lt;Content Select="Report/Customer/FullName"/&gt;``. Apart from the
+placeholder id, the optional run properties and the tag text, that markup is
+identical for a given control type and indentation, so the invariant
+fragments are compiled once per (control, indent) and each call only joins
+five strings.
+
+Usage:
+    from sdt_builder import content_tag, sdt
+
+    parts.append(sdt(content_tag('Report/Customer/FullName'), 101, indent=10))
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from xml.sax.saxutils import escape
+
+PLACEHOLDER_DOC_PART = 'DefaultPlaceholder_1081868574'
+
+CONTROL_TEXT = 'text'
+CONTROL_RICH_TEXT = 'richText'
+
+
+class SdtFragments(NamedTuple):
+    """Invariant markup surrounding the variable parts of a content control."""
+
+    head: str
+    """Everything up to the placeholder id value."""
+    body: str
+    """From the end of the id value up to (and including) the opening ``<w:r>``."""
+    text_open: str
+    """Indentation and opening ``<w:t>`` for the tag text."""
+    tail: str
+    """Closing ``</w:t>`` through ``</w:sdt>``."""
+    rpr_indent: str
+    """Indentation used for an optional ``<w:rPr>`` line."""
+
+
+@lru_cache(maxsize=None)
+def compile_fragments(control: str = CONTROL_TEXT, indent: int = 4) -> SdtFragments:
+    """Return the precomputed fragments for a control type at ``indent`` spaces."""
+    pad = ' ' * indent
+    pad2 = ' ' * (indent + 2)
+    pad3 = ' ' * (indent + 4)
+    pad4 = ' ' * (indent + 6)
+    return SdtFragments(
+        head=f'{pad}<w:sdt>\n{pad2}<w:sdtPr>\n{pad3}<w:id w:val="',
+        body=(
+            '"/>\n'
+            f'{pad3}<w:placeholder><w:docPart w:val="{PLACEHOLDER_DOC_PART}"/></w:placeholder>\n'
+            f'{pad3}<w:{control}/>\n'
+            f'{pad2}</w:sdtPr>\n'
+            f'{pad2}<w:sdtContent>\n'
+            f'{pad3}<w:p>\n'
+            f'{pad4}<w:r>\n'
+        ),
+        text_open=f'{pad4}  <w:t>',
+        tail=(
+            '</w:t>\n'
+            f'{pad4}</w:r>\n'
+            f'{pad3}</w:p>\n'
+            f'{pad2}</w:sdtContent>\n'
+            f'{pad}</w:sdt>\n'
+        ),
+        rpr_indent=f'{pad4}  ',
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_fragments_bytes(control: str = CONTROL_TEXT, indent: int = 4) -> tuple[bytes, bytes, bytes, bytes]:
+    """UTF-8 encoded ``(head, body, text_open, tail)`` for streaming writers."""
+    fragments = compile_fragments(control, indent)
+    return (
+        fragments.head.encode('utf-8'),
+        fragments.body.encode('utf-8'),
+        fragments.text_open.encode('utf-8'),
+        fragments.tail.encode('utf-8'),
+    )
+
+
+def sdt(
+    tag_text: str,
+    placeholder_id: int,
+    indent: int = 4,
+    control: str = CONTROL_TEXT,
+    rpr: Optional[str] = None,
+) -> str:
+    """Build a block-level content control around already escaped ``tag_text``.
+
+    Args:
+        tag_text: Escaped tag markup, typically produced by one of the ``*_tag`` helpers.
+        placeholder_id: Value for ``w:id``.
+        indent: Indentation of the ``<w:sdt>`` line.
+        control: ``text`` or ``richText``.
+        rpr: Optional ``<w:rPr>`` markup for the tag run.
+    """
+    f = compile_fragments(control, indent)
+    if rpr is None:
+        return f'{f.head}{placeholder_id}{f.body}{f.text_open}{tag_text}{f.tail}'
+    return f'{f.head}{placeholder_id}{f.body}{f.rpr_indent}{rpr}\n{f.text_open}{tag_text}{f.tail}'
+
+
+def sdt_bytes(tag_text: str, placeholder_id: int, indent: int = 4, control: str = CONTROL_TEXT) -> bytes:
+    """Encoded variant of :func:`sdt` built from the precompiled byte fragments."""
+    head, body, text_open, tail = compile_fragments_bytes(control, indent)
+    return b''.join((head, str(placeholder_id).encode('ascii'), body, text_open, tag_text.encode('utf-8'), tail))
+
+
+def table_cell(tag_text: str, placeholder_id: int, indent: int = 6) -> str:
+    """Wrap a content control in a ``w:tc`` (the control sits two levels deeper)."""
+    pad = ' ' * indent
+    return f'{pad}<w:tc>\n{sdt(tag_text, placeholder_id, indent=indent + 2)}{pad}</w:tc>\n'
+
+
+# --- Tag markup -------------------------------------------------------------
+
+
+_ATTRIBUTE_ENTITIES = {'"': '&quot;'}
+
+
+@lru_cache(maxsize=4096)
+def _tag_markup(name: str, attributes: tuple[tuple[str, str], ...]) -> str:
+    attrs = ''.join(f' {key}="{escape(value, _ATTRIBUTE_ENTITIES)}"' for key, value in attributes)
+    return escape(f'<{name}{attrs}/>')
+
+
+def tag(name: str, **attributes: object) -> str:
+    """Escaped ``<Name Attr="..."/>`` text; ``None`` attributes are omitted."""
+    items = tuple((key, _format_value(value)) for key, value in attributes.items() if value is not None)
+    return _tag_markup(name, items)
+
+
+def _format_value(value: object) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def content_tag(select: str, optional: Optional[bool] = None) -> str:
+    return tag('Content', Select=select, Optional=optional)
+
+
+def image_tag(
+    select: str,
+    width: Optional[str] = None,
+    height: Optional[str] = None,
+    max_width: Optional[str] = None,
+    max_height: Optional[str] = None,
+    align: Optional[str] = None,
+    optional: Optional[bool] = None,
+) -> str:
+    return tag('Image', Select=select, Optional=optional, Align=align, Width=width, Height=height,
+               MaxWidth=max_width, MaxHeight=max_height)
+
+
+def repeat_tag(select: str, optional: Optional[bool] = None) -> str:
+    return tag('Repeat', Select=select, Optional=optional)
+
+
+def end_repeat_tag() -> str:
+    return tag('EndRepeat')
+
+
+def table_tag(select: str) -> str:
+    return tag('Table', Select=select)
+
+
+def conditional_tag(select: str, match: Optional[str] = None, not_match: Optional[str] = None) -> str:
+    if (match is None) == (not_match is None):
+        raise ValueError('Conditional requires exactly one of match or not_match')
+    return tag('Conditional', Select=select, Match=match, NotMatch=not_match)
+
+
+def else_tag() -> str:
+    return tag('Else')
+
+
+def end_conditional_tag() -> str:
+    return tag('EndConditional')
+
+
+def signature_tag(
+    signature_id: str,
+    label: Optional[str] = None,
+    width: Optional[str] = None,
+    height: Optional[str] = None,
+    page_hint: Optional[int] = None,
+    optional: Optional[bool] = None,
+) -> str:
+    return tag('Signature', Id=signature_id, Label=label, Width=width, Height=height,
+               PageHint=page_hint, Optional=optional)
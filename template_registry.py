@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Discovery of the template definitions exposed by the generator scripts.
+
+A generator script opts in by defining a module-level ``TEMPLATES`` sequence
+of :class:`TemplateDefinition` objects. Each definition names one output
+package, the callable that writes it and the files its content depends on,
+so ``generate.py`` can build definitions concurrently and skip the ones
+whose inputs have not changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Modules scanned for TEMPLATES, relative to the repository root.
+GENERATOR_PATTERNS = ('create_example*.py', 'generate_test_docx.py')
+
+# Shared helpers every generated package depends on.
+SHARED_INPUTS = (
+    SCRIPT_DIR / 'docx_package.py',
+    SCRIPT_DIR / 'sdt_builder.py',
+    SCRIPT_DIR / 'wml_writer.py',
+)
+
+
+@dataclass(frozen=True)
+class TemplateDefinition:
+    """One generated package.
+
+    Attributes:
+        name: Unique, human readable identifier (``Example09/TemplateAllTagsDocument``).
+        output: Default output path.
+        build: Callable writing the package to the path it receives.
+        inputs: Files besides the defining script and shared helpers that affect the output.
+    """
+
+    name: str
+    output: Path
+    build: Callable[[Path], object]
+    inputs: Sequence[Path] = field(default_factory=tuple)
+
+
+@dataclass(frozen=True)
+class DiscoveredTemplate:
+    module: str
+    definition: TemplateDefinition
+
+    @property
+    def name(self) -> str:
+        return self.definition.name
+
+    def input_files(self) -> list[Path]:
+        module_file = SCRIPT_DIR / f'{self.module}.py'
+        return [module_file, *SHARED_INPUTS, *(Path(p) for p in self.definition.inputs)]
+
+    def input_hash(self) -> str:
+        """SHA-256 over the definition name and the content of every input file."""
+        digest = hashlib.sha256(self.name.encode('utf-8'))
+        for path in self.input_files():
+            digest.update(b'\0' + path.name.encode('utf-8'))
+            digest.update(b'\0' + path.read_bytes())
+        return digest.hexdigest()
+
+
+def generator_modules() -> list[str]:
+    names = {path.stem for pattern in GENERATOR_PATTERNS for path in SCRIPT_DIR.glob(pattern)}
+    return sorted(names)
+
+
+def discover() -> Iterator[DiscoveredTemplate]:
+    """Yield every template definition exposed by the generator modules."""
+    seen: dict[str, str] = {}
+    for module_name in generator_modules():
+        module = importlib.import_module(module_name)
+        for definition in getattr(module, 'TEMPLATES', ()):
+            if definition.name in seen:
+                raise ValueError(
+                    f'Template {definition.name!r} defined by both {seen[definition.name]} and {module_name}')
+            seen[definition.name] = module_name
+            yield DiscoveredTemplate(module_name, definition)
+
+
+def find(module_name: str, template_name: str) -> TemplateDefinition:
+    module = importlib.import_module(module_name)
+    for definition in getattr(module, 'TEMPLATES', ()):
+        if definition.name == template_name:
+            return definition
+    raise KeyError(f'{module_name} does not define template {template_name!r}')
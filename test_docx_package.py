@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for docx_package: raw copies of unchanged entries and replaced parts.
+
+Run with ``python -m unittest test_docx_package`` (or pytest) from the
+repository root.
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+import unittest
+import zipfile
+from pathlib import Path
+
+from docx_package import BasePackage, clear_base_cache, load_base
+
+BASE_TEMPLATE = (Path(__file__).resolve().parent / 'DocumentAssemblerSdk.Examples' / 'Example01_Basic'
+                 / 'TemplateDocument.docx')
+
+DOCUMENT_PART = 'word/document.xml'
+
+
+def _compressed_entries(data: bytes) -> dict[str, bytes]:
+    """Map every entry name to its payload as stored, read from the local headers."""
+    entries = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            name_length, extra_length = struct.unpack_from('<2H', data, info.header_offset + 26)
+            start = info.header_offset + 30 + name_length + extra_length
+            entries[info.filename] = data[start:start + info.compress_size]
+    return entries
+
+
+class BasePackageTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.base_bytes = BASE_TEMPLATE.read_bytes()
+        self.package = BasePackage(self.base_bytes)
+
+    def test_untouched_entries_are_copied_verbatim(self) -> None:
+        for reproducible in (True, False):
+            with self.subTest(reproducible=reproducible):
+                built = self.package.build({DOCUMENT_PART: '<w:document/>'}, compresslevel=1,
+                                           reproducible=reproducible)
+
+                base_entries = _compressed_entries(self.base_bytes)
+                built_entries = _compressed_entries(built)
+                self.assertEqual(set(base_entries), set(built_entries))
+                for name, payload in base_entries.items():
+                    if name != DOCUMENT_PART:
+                        self.assertEqual(payload, built_entries[name], name)
+
+                with zipfile.ZipFile(io.BytesIO(self.base_bytes)) as base, \
+                        zipfile.ZipFile(io.BytesIO(built)) as output:
+                    self.assertIsNone(output.testzip())
+                    for info in base.infolist():
+                        if info.filename != DOCUMENT_PART:
+                            copied = output.getinfo(info.filename)
+                            self.assertEqual(
+                                (info.CRC, info.compress_size, info.file_size, info.compress_type),
+                                (copied.CRC, copied.compress_size, copied.file_size, copied.compress_type))
+
+    def test_replaced_and_new_parts_are_deflated(self) -> None:
+        chunks = iter(['<w:document>', 'é'.encode('utf-8'), '</w:document>'])
+        built = self.package.build({DOCUMENT_PART: chunks, 'customXml/ünïcode.xml': '<x/>'},
+                                   omit=['word/glossary/'])
+
+        with zipfile.ZipFile(io.BytesIO(built)) as output:
+            self.assertIsNone(output.testzip())
+            self.assertEqual('<w:document>é</w:document>'.encode('utf-8'), output.read(DOCUMENT_PART))
+            self.assertEqual(b'<x/>', output.read('customXml/ünïcode.xml'))
+            self.assertEqual(zipfile.ZIP_DEFLATED, output.getinfo(DOCUMENT_PART).compress_type)
+            self.assertFalse(any(name.startswith('word/glossary/') for name in output.namelist()))
+
+    def test_builds_are_reproducible(self) -> None:
+        parts = {DOCUMENT_PART: '<w:document/>'}
+        self.assertEqual(self.package.build(parts), BasePackage(self.base_bytes).build(parts))
+
+    def test_cached_base_holds_compressed_payloads(self) -> None:
+        clear_base_cache()
+        package = load_base(BASE_TEMPLATE)
+
+        self.assertIs(package, load_base(BASE_TEMPLATE))
+        base_entries = _compressed_entries(self.base_bytes)
+        self.assertEqual(base_entries, {info.filename: payload for info, payload in package.entries})
+
+    def test_read_returns_uncompressed_content(self) -> None:
+        with zipfile.ZipFile(io.BytesIO(self.base_bytes)) as base:
+            self.assertEqual(base.read('word/styles.xml'), self.package.read('word/styles.xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
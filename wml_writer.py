@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Streaming WordprocessingML writer for the template generator scripts.
+
+Generators describe a part as an iterator of ``str`` fragments instead of
+appending to a list and joining it. :func:`encode` coalesces the fragments
+into UTF-8 chunks of roughly ``chunk_size`` bytes, which
+``docx_package.replace_parts`` writes straight into the ZIP entry stream, so
+emitting a multi-megabyte ``document.xml`` never holds more than one chunk in
+memory.
+
+Usage:
+    from wml_writer import document, encode
+
+    def body():
+        yield paragraph('Hello')
+        yield sdt(content_tag('Report/Title'), 1)
+
+    replace_parts(base, target, {'word/document.xml': encode(document(body()))})
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def encode(fragments: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Join ``fragments`` into UTF-8 chunks of about ``chunk_size`` bytes each.
+
+    Sizes are counted after encoding, so non-ASCII text does not make chunks
+    larger than requested; a chunk overshoots by at most its last fragment.
+    """
+    pending: list[bytes] = []
+    size = 0
+    for fragment in fragments:
+        data = fragment.encode('utf-8')
+        pending.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            yield b''.join(pending)
+            pending.clear()
+            size = 0
+    if pending:
+        yield b''.join(pending)
+
+
+def part(root: str, content: Iterable[str]) -> Iterator[str]:
+    """Wrap ``content`` in a ``w:<root>`` element declaring the w and r namespaces."""
+    yield XML_DECLARATION
+    yield f'<w:{root} xmlns:w="{W_NS}"\n'
+    yield f'{" " * (len(root) + 4)}xmlns:r="{R_NS}">\n'
+    yield from content
+    yield f'</w:{root}>\n'
+
+
+def document(body: Iterable[str]) -> Iterator[str]:
+    """A complete ``word/document.xml`` around the fragments of ``body``."""
+    def wrapped() -> Iterator[str]:
+        yield '  <w:body>\n'
+        yield from body
+        yield '  </w:body>\n'
+
+    return part('document', wrapped())
+
+
+def paragraph(text: str, indent: int = 4, bold: bool = False) -> str:
+    """A single-run paragraph; ``text`` must already be escaped."""
+    rpr = '<w:rPr><w:b/></w:rPr>' if bold else ''
+    return f'{" " * indent}<w:p><w:r>{rpr}<w:t xml:space="preserve">{text}</w:t></w:r></w:p>\n'